@@ -1,47 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from typing import List, Optional
+from datetime import date, timedelta
+from app.core.database import get_db, mark_recent_write, read_sessionmaker
+from app.core.pagination import PageParams, paginate
+from app.core.responses import json_rows, row_dicts, schema_columns, schema_fields
 from app.models.user import User, UserRole
-from app.models.hotel import Hotel
+from app.models.hotel import Hotel, Room
 from app.schemas.user import User as UserSchema, UserUpdate, UserCreate
-from app.schemas.hotel import Hotel as HotelSchema, HotelCreate, HotelBase, HotelUpdate
+from app.schemas.hotel import Hotel as HotelSchema, HotelCreate, HotelBase, HotelUpdate, Room as RoomSchema
 from app.controllers.auth import get_current_user
-from sqlalchemy import func
+from app.core.auth_cache import Principal, principal_cache
+from app.core.cache import response_cache, CATALOG, hotel_namespace
+from sqlalchemy import delete, func, select
 from app.models.booking import Booking
-from app.core.security import get_password_hash
+from app.models.inventory import RoomInventory
+from app.core.security import get_password_hash_async
+from app.services.search import get_search_backend
+from app.services.mailer import mail_dispatcher
+from app.services import bulk_import, exports, reporting, stats
+from app.services.reporting import ReportParams, report_exporter, serve_report
+from app.schemas.stats import DailyStats
+from app.schemas.report import MonthlyOccupancy, RoomTypePerformance
 
 router = APIRouter()
 
 # Dependency to check if user is admin
-def get_current_admin(current_user: User = Depends(get_current_user)):
+async def get_current_admin(current_user: Principal = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
+async def hotel_with_rooms(db: AsyncSession, hotel_id: int) -> Hotel:
+    # Responses include the room list; load it eagerly, lazy loads are not allowed under asyncio
+    return await db.scalar(
+        select(Hotel).options(selectinload(Hotel.rooms)).where(Hotel.id == hotel_id)
+        .execution_options(populate_existing=True)
+    )
+
 
 
 @router.get("/dashboard")
-def get_admin_dashboard(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    total_users = db.query(User).count()
-    total_hotels = db.query(Hotel).count()
-    total_bookings = db.query(Booking).count()
-    revenue = db.query(func.sum(Booking.total_price)).scalar() or 0
-    active_users = db.query(User).filter(User.is_active == True).count()
+async def get_admin_dashboard(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    # All headline numbers in a single round-trip; booking totals come from the daily stats table
+    booking_totals = stats.totals_select().subquery()
+    totals = await db.execute(select(
+        select(func.count(User.id)).scalar_subquery(),
+        select(func.count(User.id)).where(User.is_active == True).scalar_subquery(),
+        select(func.count(Hotel.id)).scalar_subquery(),
+        booking_totals.c.bookings,
+        booking_totals.c.revenue,
+    ))
+    total_users, active_users, total_hotels, total_bookings, revenue = totals.one()
     
-    # Get recent bookings with details
-    recent_bookings_query = db.query(Booking).order_by(Booking.id.desc()).limit(5).all()
+    # Recent bookings with room, hotel and guest joined in the same query
+    recent_bookings_query = await db.scalars(
+        select(Booking)
+        .options(joinedload(Booking.room).joinedload(Room.hotel), joinedload(Booking.user))
+        .order_by(Booking.id.desc())
+        .limit(5)
+    )
     recent_bookings = []
     for b in recent_bookings_query:
-        # Fetch related data manually if relationships aren't eager loaded or to format it
-        # Assuming relationships are set up in models, but let's be safe and query or access attributes
-        # We need: hotel name, guest name, checkIn, checkOut, amount, status
-        # Booking model has user_id and room_id. Room has hotel_id.
-        
-        # We need to join or access relationships. 
-        # Let's assume lazy loading works or do a join if needed.
-        # For simplicity, accessing attributes (which triggers lazy load)
-        
         hotel_name = "Unknown"
         guest_name = "Unknown"
         
@@ -70,52 +92,169 @@ def get_admin_dashboard(db: Session = Depends(get_db), current_user: User = Depe
         "recent_bookings": recent_bookings
     }
 
+@router.get("/stats/daily", response_model=List[DailyStats])
+async def get_admin_daily_stats(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    hotel_id: Optional[int] = Query(None, description="Only this hotel"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days > stats.MAX_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    hotel_ids = [hotel_id] if hotel_id is not None else None
+    return await db.run_sync(stats.daily_series, start, end, hotel_ids)
+
+@router.get("/reports/occupancy", response_model=List[MonthlyOccupancy])
+async def get_occupancy_report(
+    response: Response,
+    params: ReportParams = Depends(),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """Occupancy, ADR and RevPAR per hotel and month, from the latest reporting snapshot."""
+    return await serve_report(reporting.occupancy_by_month, params, None, response)
+
+@router.get("/reports/room-types", response_model=List[RoomTypePerformance])
+async def get_room_type_report(
+    response: Response,
+    params: ReportParams = Depends(),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """Occupancy, ADR and RevPAR per hotel and room type, from the latest reporting snapshot."""
+    return await serve_report(reporting.room_type_performance, params, None, response)
+
+@router.get("/reports/status")
+async def get_report_status(current_user: Principal = Depends(get_current_admin)):
+    """When the reporting snapshot was taken and how the last export in this process went."""
+    return await run_in_threadpool(report_exporter.status)
+
+@router.post("/reports/export")
+async def export_reports(current_user: Principal = Depends(get_current_admin)):
+    """Refresh the reporting snapshot now."""
+    if not reporting.available():
+        raise HTTPException(status_code=503, detail="Reporting requires the duckdb package")
+    return {"rows": await run_in_threadpool(report_exporter.export_now)}
+
+@router.post("/import/{kind}")
+async def bulk_import_records(
+    kind: str,
+    response: Response,
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines"),
+    format: Optional[str] = Query(None, description="csv or jsonl (default: from the file name)"),
+    dry_run: bool = Query(False, description="Validate only, write nothing"),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """Bulk-load hotels, rooms or bookings; answers with a per-row error report."""
+    if kind not in bulk_import.KINDS:
+        raise HTTPException(status_code=404, detail="Unknown import kind")
+    try:
+        fmt = bulk_import.detect_format(file.filename, format)
+        report = await run_in_threadpool(bulk_import.import_upload, kind, file.file, fmt, None, dry_run)
+    except bulk_import.ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if report.inserted:
+        if kind != "bookings":
+            await response_cache.invalidate(CATALOG, *map(hotel_namespace, report.hotel_ids))
+        mark_recent_write(response)
+    return report.as_dict()
+
+@router.get("/export/{kind}")
+async def export_records(
+    kind: str,
+    request: Request,
+    params: exports.ExportParams = Depends(),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """Stream every booking or user matching the filters, as NDJSON or CSV."""
+    if kind not in exports.KINDS:
+        raise HTTPException(status_code=404, detail="Unknown export kind")
+    hotel_ids = [params.hotel_id] if params.hotel_id is not None else None
+    return exports.export_response(kind, params, hotel_ids, read_sessionmaker(request))
+
 @router.get("/users", response_model=List[UserSchema])
-def get_all_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    return db.query(User).all()
+async def get_all_users(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    # Columns straight to JSON: no ORM objects or response_model validation on large pages
+    fields = schema_fields(UserSchema)
+    rows = await paginate(db, select(*schema_columns(UserSchema, User)), User.id, page, response)
+    return json_rows(rows, fields, response)
 
 @router.get("/hotels", response_model=List[HotelSchema])
-def get_all_hotels(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    return db.query(Hotel).all()
+async def get_all_hotels(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    fields = schema_fields(HotelSchema, exclude=("rooms",))
+    query = select(*schema_columns(HotelSchema, Hotel, exclude=("rooms",)))
+    hotels = row_dicts(await paginate(db, query, Hotel.id, page, response), fields)
+    # The page's rooms in one query, grouped here, as selectinload would without building ORM objects
+    by_hotel = {}
+    for hotel in hotels:
+        hotel["rooms"] = by_hotel[hotel["id"]] = []
+    if by_hotel:
+        rooms = await db.execute(
+            select(*schema_columns(RoomSchema, Room)).where(Room.hotel_id.in_(by_hotel)).order_by(Room.id)
+        )
+        for room in row_dicts(rooms, schema_fields(RoomSchema)):
+            by_hotel[room["hotel_id"]].append(room)
+    return json_rows(hotels, fields, response)
 
 @router.post("/hotels", response_model=HotelSchema)
-def create_hotel(hotel: HotelCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
+async def create_hotel(hotel: HotelCreate, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
     db_hotel = Hotel(**hotel.model_dump())
     db.add(db_hotel)
-    db.commit()
-    db.refresh(db_hotel)
-    return db_hotel
+    await db.flush()
+    await db.run_sync(get_search_backend(db).index_hotel, db_hotel)
+    await db.commit()
+    await response_cache.invalidate(CATALOG)
+    mark_recent_write(response)
+    return await hotel_with_rooms(db, db_hotel.id)
 
 @router.delete("/hotels/{hotel_id}")
-def delete_hotel(hotel_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+async def delete_hotel(hotel_id: int, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    hotel = await db.get(Hotel, hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    db.delete(hotel)
-    db.commit()
+    await db.run_sync(get_search_backend(db).remove_hotel, hotel.id)
+    await db.execute(delete(RoomInventory).where(
+        RoomInventory.room_id.in_(select(Room.id).where(Room.hotel_id == hotel_id))
+    ))
+    await db.delete(hotel)
+    await db.commit()
+    await response_cache.invalidate(CATALOG, hotel_namespace(hotel_id))
+    mark_recent_write(response)
     return {"message": "Hotel deleted"}
 
 @router.delete("/users/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    principal_cache.invalidate(user.email)
     return {"message": "User deleted"}
 
 
 
 @router.post("/users", response_model=UserSchema)
-def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -124,13 +263,13 @@ def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: U
         is_active=True
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 @router.put("/hotels/{hotel_id}", response_model=HotelSchema)
-def update_hotel(hotel_id: int, hotel_update: HotelUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+async def update_hotel(hotel_id: int, hotel_update: HotelUpdate, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    hotel = await db.get(Hotel, hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
     
@@ -138,23 +277,50 @@ def update_hotel(hotel_id: int, hotel_update: HotelUpdate, db: Session = Depends
     for key, value in update_data.items():
         setattr(hotel, key, value)
     
-    db.commit()
-    db.refresh(hotel)
-    return hotel
+    await db.run_sync(get_search_backend(db).index_hotel, hotel)
+    await db.commit()
+    await response_cache.invalidate(CATALOG, hotel_namespace(hotel.id))
+    mark_recent_write(response)
+    return await hotel_with_rooms(db, hotel.id)
 
 @router.put("/users/{user_id}", response_model=UserSchema)
-def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user(user_id: int, user_update: UserUpdate, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_email = user.email
     
     update_data = user_update.model_dump(exclude_unset=True)
     if "password" in update_data and update_data["password"]:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
         
     for key, value in update_data.items():
         setattr(user, key, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    principal_cache.invalidate(previous_email, user.email)
     return user
+
+@router.get("/auth-cache")
+async def get_auth_cache_stats(current_user: Principal = Depends(get_current_admin)):
+    """Hit/miss counters of the authenticated-user cache (this worker process only)."""
+    return principal_cache.stats()
+
+
+@router.get("/email-queue")
+async def get_email_queue_stats(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    """Outbox size by status and this process's dispatcher counters."""
+    return await db.run_sync(mail_dispatcher.stats)
+
+@router.post("/email-queue/requeue-dead")
+async def requeue_dead_emails(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_admin)):
+    requeued = await db.run_sync(mail_dispatcher.requeue_dead)
+    await db.commit()
+    mail_dispatcher.wake()
+    return {"requeued": requeued}
+
+@router.get("/response-cache")
+async def get_response_cache_stats(current_user: Principal = Depends(get_current_admin)):
+    """Hit/miss counters of the public catalog response cache (this worker process only)."""
+    return response_cache.stats()
@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import secrets
+from app.core import instrumentation
+from app.core.auth_cache import Principal, principal_cache
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema, ForgotPasswordRequest, ResetPasswordRequest
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import verify_and_update_password_async, get_password_hash_async, create_access_token
 from app.core.config import settings
+from app.services.mailer import mail_dispatcher, queue_welcome_email, queue_password_reset_email
 from jose import JWTError, jwt
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+def principal_claims(user) -> dict:
+    """Signed claims identifying the user; see settings.AUTH_TRUST_TOKEN_CLAIMS."""
+    return {"sub": user.email, "uid": user.id, "role": user.role, "name": user.full_name}
+
 # Dependency to get current user
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,18 +36,29 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    # Read-only requests may rely on the signed claims alone (opt-in)
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and request.method == "GET" and "uid" in payload and "role" in payload:
+        principal = Principal(id=payload["uid"], email=email, role=payload["role"], full_name=payload.get("name"))
+        instrumentation.tag_user(principal)
+        return principal
+    
+    principal = principal_cache.get(email)
+    if principal is None:
+        user = await db.scalar(select(User).where(User.email == email))
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.put(email, principal)
+    instrumentation.tag_user(principal)
+    return principal
 
 @router.post("/register", response_model=UserSchema)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -47,31 +66,42 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         role=user.role
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Queued in the same transaction; delivered by the mail dispatcher
+    queue_welcome_email(db, new_user.email, new_user.full_name)
+    await db.commit()
+    mail_dispatcher.wake()
+    await db.refresh(new_user)
     return new_user
 
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": user.email})
+    # Hash was made with older parameters or scheme: upgrade it transparently
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
+    access_token = create_access_token(data=principal_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserSchema)
-def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 @router.post("/forgot-password")
-def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+async def forgot_password(request: ForgotPasswordRequest, db: AsyncSession = Depends(get_db)):
     """Request a password reset."""
-    user = db.query(User).filter(User.email == request.email).first()
+    user = await db.scalar(select(User).where(User.email == request.email))
     
     # Always return success to prevent email enumeration
     if not user:
@@ -83,7 +113,9 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
     user.reset_token_expires = datetime.utcnow() + timedelta(
         minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES
     )
-    db.commit()
+    queue_password_reset_email(db, user.email, user.full_name, reset_token)
+    await db.commit()
+    mail_dispatcher.wake()
     
     # Return token directly (for development/testing - in production you'd send email)
     reset_link = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
@@ -93,9 +125,9 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
     }
 
 @router.post("/reset-password")
-def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: ResetPasswordRequest, db: AsyncSession = Depends(get_db)):
     """Reset password using the token from email."""
-    user = db.query(User).filter(User.reset_token == request.token).first()
+    user = await db.scalar(select(User).where(User.reset_token == request.token))
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
@@ -105,9 +137,10 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
         raise HTTPException(status_code=400, detail="Reset token has expired")
     
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await get_password_hash_async(request.new_password)
     user.reset_token = None
     user.reset_token_expires = None
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.email)
     
     return {"message": "Password has been reset successfully"}
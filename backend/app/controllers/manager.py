@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from typing import List, Optional
+from app.core.database import get_db, mark_recent_write, read_sessionmaker
+from app.core.pagination import PageParams, paginate
 from app.models.user import User, UserRole
 from app.models.hotel import Hotel, Room
 from app.schemas.hotel import Room as RoomSchema, RoomCreate, Hotel as HotelSchema, RoomUpdate
 from app.controllers.auth import get_current_user
-from sqlalchemy import func
-from datetime import date
+from app.core.auth_cache import Principal
+from app.core.cache import response_cache, CATALOG, hotel_namespace
+from sqlalchemy import and_, or_, delete, func, select
+from datetime import date, timedelta
 from app.models.booking import Booking
+from app.models.inventory import RoomInventory
+from app.services import bulk_import, exports, reporting, stats
+from app.services.reporting import ReportParams, serve_report
+from app.schemas.stats import DailyStats
+from app.schemas.report import MonthlyOccupancy, RoomTypePerformance
 
 router = APIRouter()
 
 # Dependency to check if user is manager
-def get_current_manager(current_user: User = Depends(get_current_user)):
+async def get_current_manager(current_user: Principal = Depends(get_current_user)):
     if current_user.role != UserRole.MANAGER and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
@@ -21,20 +31,25 @@ def get_current_manager(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/dashboard")
-def get_manager_dashboard(db: Session = Depends(get_db), current_user: User = Depends(get_current_manager)):
-    # Get hotels managed by this user
-    hotels = db.query(Hotel).filter(Hotel.manager_id == current_user.id).all()
-    hotel_ids = [h.id for h in hotels]
+async def get_manager_dashboard(db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_manager)):
+    # Hotels and rooms managed by this user, kept as subqueries (no id lists in Python)
+    hotel_ids = select(Hotel.id).where(Hotel.manager_id == current_user.id)
+    room_ids = select(Room.id).where(Room.hotel_id.in_(hotel_ids))
     
-    # Get rooms for these hotels
-    rooms = db.query(Room).filter(Room.hotel_id.in_(hotel_ids)).all()
-    room_ids = [r.id for r in rooms]
-    total_rooms = len(rooms)
+    # Booking totals and tonight's occupied rooms come from the daily stats table
+    booking_totals = stats.totals_select(hotel_ids).subquery()
+    totals = await db.execute(select(
+        select(func.count()).select_from(hotel_ids.subquery()).scalar_subquery(),
+        select(func.count()).select_from(room_ids.subquery()).scalar_subquery(),
+        booking_totals.c.bookings,
+        booking_totals.c.revenue,
+        stats.occupied_rooms_select(date.today(), hotel_ids).scalar_subquery(),
+    ))
+    total_hotels, total_rooms, total_bookings, revenue, occupied_rooms = totals.one()
     
-    # Calculate stats
-    if not room_ids:
+    if not total_rooms:
         return {
-            "total_hotels": len(hotels),
+            "total_hotels": total_hotels,
             "total_rooms": 0,
             "total_bookings": 0,
             "revenue": 0,
@@ -42,26 +57,16 @@ def get_manager_dashboard(db: Session = Depends(get_db), current_user: User = De
             "recent_bookings": []
         }
 
-    # Total Bookings for these rooms
-    total_bookings = db.query(Booking).filter(Booking.room_id.in_(room_ids)).count()
-    
-    # Revenue
-    revenue = db.query(func.sum(Booking.total_price)).filter(Booking.room_id.in_(room_ids)).scalar() or 0
-    
-    # Occupancy (Active bookings today / Total rooms)
-    today = date.today()
-    active_bookings = db.query(Booking).filter(
-        Booking.room_id.in_(room_ids),
-        Booking.check_in <= today,
-        Booking.check_out >= today
-    ).count()
-    
-    occupancy_rate = 0
-    if total_rooms > 0:
-        occupancy_rate = int((active_bookings / total_rooms) * 100)
+    occupancy_rate = int((occupied_rooms / total_rooms) * 100)
         
-    # Recent Bookings
-    recent_bookings_query = db.query(Booking).filter(Booking.room_id.in_(room_ids)).order_by(Booking.id.desc()).limit(5).all()
+    # Recent Bookings, with room, hotel and guest joined in the same query
+    recent_bookings_query = await db.scalars(
+        select(Booking)
+        .options(joinedload(Booking.room).joinedload(Room.hotel), joinedload(Booking.user))
+        .where(Booking.room_id.in_(room_ids))
+        .order_by(Booking.id.desc())
+        .limit(5)
+    )
     recent_bookings = []
     for b in recent_bookings_query:
         hotel_name = "Unknown"
@@ -86,7 +91,7 @@ def get_manager_dashboard(db: Session = Depends(get_db), current_user: User = De
         })
 
     return {
-        "total_hotels": len(hotels),
+        "total_hotels": total_hotels,
         "total_rooms": total_rooms,
         "total_bookings": total_bookings,
         "revenue": revenue,
@@ -94,22 +99,119 @@ def get_manager_dashboard(db: Session = Depends(get_db), current_user: User = De
         "recent_bookings": recent_bookings
     }
 
+@router.get("/stats/daily", response_model=List[DailyStats])
+async def get_manager_daily_stats(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    hotel_id: Optional[int] = Query(None, description="Only this hotel"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_manager)
+):
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days > stats.MAX_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    hotel_ids = select(Hotel.id).where(Hotel.manager_id == current_user.id)
+    if hotel_id is not None:
+        hotel_ids = hotel_ids.where(Hotel.id == hotel_id)
+    return await db.run_sync(stats.daily_series, start, end, hotel_ids)
+
+@router.get("/reports/occupancy", response_model=List[MonthlyOccupancy])
+async def get_manager_occupancy_report(
+    response: Response,
+    params: ReportParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_manager)
+):
+    """Occupancy, ADR and RevPAR per hotel and month, from the latest reporting snapshot."""
+    hotel_ids = list(await db.scalars(select(Hotel.id).where(Hotel.manager_id == current_user.id)))
+    return await serve_report(reporting.occupancy_by_month, params, hotel_ids, response)
+
+@router.get("/reports/room-types", response_model=List[RoomTypePerformance])
+async def get_manager_room_type_report(
+    response: Response,
+    params: ReportParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_manager)
+):
+    """Occupancy, ADR and RevPAR per hotel and room type, from the latest reporting snapshot."""
+    hotel_ids = list(await db.scalars(select(Hotel.id).where(Hotel.manager_id == current_user.id)))
+    return await serve_report(reporting.room_type_performance, params, hotel_ids, response)
+
+@router.get("/export/{kind}")
+async def export_manager_records(
+    kind: str,
+    request: Request,
+    params: exports.ExportParams = Depends(),
+    current_user: Principal = Depends(get_current_manager)
+):
+    """Stream the bookings of this manager's hotels, or the guests who stayed there, as NDJSON or CSV."""
+    if kind not in exports.KINDS:
+        raise HTTPException(status_code=404, detail="Unknown export kind")
+    hotel_ids = select(Hotel.id).where(Hotel.manager_id == current_user.id)
+    if params.hotel_id is not None:
+        hotel_ids = hotel_ids.where(Hotel.id == params.hotel_id)
+    return exports.export_response(kind, params, hotel_ids, read_sessionmaker(request))
+
+@router.post("/import/rooms")
+async def bulk_import_rooms(
+    response: Response,
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines"),
+    format: Optional[str] = Query(None, description="csv or jsonl (default: from the file name)"),
+    dry_run: bool = Query(False, description="Validate only, write nothing"),
+    current_user: Principal = Depends(get_current_manager)
+):
+    """Bulk-load rooms into this manager's hotels; answers with a per-row error report."""
+    try:
+        fmt = bulk_import.detect_format(file.filename, format)
+        owner_id = None if current_user.role == UserRole.ADMIN else current_user.id
+        report = await run_in_threadpool(bulk_import.import_upload, "rooms", file.file, fmt, owner_id, dry_run)
+    except bulk_import.ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if report.inserted:
+        await response_cache.invalidate(CATALOG, *map(hotel_namespace, report.hotel_ids))
+        mark_recent_write(response)
+    return report.as_dict()
+
 @router.get("/rooms")
-def get_manager_rooms(db: Session = Depends(get_db), current_user: User = Depends(get_current_manager)):
-    hotels = db.query(Hotel).filter(Hotel.manager_id == current_user.id).all()
-    hotel_ids = [h.id for h in hotels]
-    rooms = db.query(Room).filter(Room.hotel_id.in_(hotel_ids)).order_by(Room.id.desc()).all()
-    
+async def get_manager_rooms(
+    response: Response,
+    page: PageParams = Depends(),
+    hotel_id: Optional[int] = Query(None, description="Only rooms of this hotel"),
+    type: Optional[str] = Query(None, description="Filter by room type"),
+    available: Optional[bool] = Query(None, description="Only rooms with (true) or without (false) free slots"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_manager)
+):
     today = date.today()
-    result = []
-    for room in rooms:
-        # Count ALL confirmed bookings for this room (future and current)
-        current_bookings = db.query(Booking).filter(
-            Booking.room_id == room.id,
+    max_bookings = func.coalesce(Room.max_bookings, 1)
+    # Confirmed current and future bookings per room, counted in one grouped query
+    current_bookings = func.count(Booking.id)
+    query = (
+        select(Room, current_bookings)
+        .join(Hotel, Room.hotel_id == Hotel.id)
+        .outerjoin(Booking, and_(
+            Booking.room_id == Room.id,
             Booking.status == "confirmed",
-            Booking.check_out >= today  # Include current and future bookings
-        ).count()
-        
+            Booking.check_out >= today
+        ))
+        .where(Hotel.manager_id == current_user.id)
+        .group_by(Room.id)
+    )
+    
+    if hotel_id is not None:
+        query = query.where(Room.hotel_id == hotel_id)
+    if type:
+        query = query.where(func.lower(Room.type) == type.lower())
+    if available is True:
+        query = query.where(Room.is_available == True).having(current_bookings < max_bookings)
+    elif available is False:
+        query = query.having(or_(Room.is_available == False, current_bookings >= max_bookings))
+    
+    rows = await paginate(db, query, Room.id, page, response, descending=True, key_of=lambda row: row[0].id)
+    
+    result = []
+    for room, booked in rows:
         room_dict = {
             "id": room.id,
             "hotel_id": room.hotel_id,
@@ -120,62 +222,76 @@ def get_manager_rooms(db: Session = Depends(get_db), current_user: User = Depend
             "is_available": room.is_available,
             "description": room.description,
             "max_bookings": room.max_bookings or 1,
-            "current_bookings": current_bookings,
-            "available_slots": (room.max_bookings or 1) - current_bookings
+            "current_bookings": booked,
+            "available_slots": (room.max_bookings or 1) - booked
         }
         result.append(room_dict)
     
     return result
 
 @router.post("/rooms", response_model=RoomSchema)
-def create_room(room: RoomCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_manager)):
+async def create_room(room: RoomCreate, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_manager)):
     # Verify manager owns the hotel
-    hotel = db.query(Hotel).filter(Hotel.id == room.hotel_id, Hotel.manager_id == current_user.id).first()
+    hotel = await db.scalar(select(Hotel).where(Hotel.id == room.hotel_id, Hotel.manager_id == current_user.id))
     if not hotel and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=404, detail="Hotel not found or not authorized")
     
     db_room = Room(**room.model_dump())
     db.add(db_room)
-    db.commit()
-    db.refresh(db_room)
+    await db.commit()
+    await db.refresh(db_room)
+    await response_cache.invalidate(CATALOG, hotel_namespace(db_room.hotel_id))
+    mark_recent_write(response)
     return db_room
 
 @router.delete("/rooms/{room_id}")
-def delete_room(room_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_manager)):
-    room = db.query(Room).filter(Room.id == room_id).first()
+async def delete_room(room_id: int, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_manager)):
+    room = await db.get(Room, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     
     # Verify manager owns the hotel
-    hotel = db.query(Hotel).filter(Hotel.id == room.hotel_id).first()
+    hotel = await db.get(Hotel, room.hotel_id)
     if hotel.manager_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    db.delete(room)
-    db.commit()
+    await db.execute(delete(RoomInventory).where(RoomInventory.room_id == room.id))
+    await db.delete(room)
+    await db.commit()
+    await response_cache.invalidate(CATALOG, hotel_namespace(room.hotel_id))
+    mark_recent_write(response)
     return {"message": "Room deleted"}
 
 @router.get("/hotels", response_model=List[HotelSchema])
-def get_manager_hotels(db: Session = Depends(get_db), current_user: User = Depends(get_current_manager)):
-    return db.query(Hotel).filter(Hotel.manager_id == current_user.id).all()
+async def get_manager_hotels(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_manager)
+):
+    query = select(Hotel).options(selectinload(Hotel.rooms)).where(Hotel.manager_id == current_user.id)
+    return await paginate(db, query, Hotel.id, page, response)
 
 
 
 @router.put("/rooms/{room_id}", response_model=RoomSchema)
-def update_room(room_id: int, room_update: RoomUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_manager)):
-    room = db.query(Room).filter(Room.id == room_id).first()
+async def update_room(room_id: int, room_update: RoomUpdate, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_manager)):
+    room = await db.get(Room, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     
     # Verify manager owns the hotel
-    hotel = db.query(Hotel).filter(Hotel.id == room.hotel_id).first()
+    hotel = await db.get(Hotel, room.hotel_id)
     if hotel.manager_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    previous_hotel_id = room.hotel_id
     update_data = room_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(room, key, value)
     
-    db.commit()
-    db.refresh(room)
+    await db.commit()
+    await db.refresh(room)
+    await response_cache.invalidate(CATALOG, *{hotel_namespace(previous_hotel_id), hotel_namespace(room.hotel_id)})
+    mark_recent_write(response)
     return room
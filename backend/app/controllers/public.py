@@ -1,85 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, or_, select, update
 from typing import List, Optional
 from datetime import date
-from app.core.database import get_db
+from app.core import metrics
+from app.core.cache import response_cache, CATALOG, hotel_namespace
+from app.core.database import get_db, get_read_db, mark_recent_write, wants_primary
+from app.core.pagination import PageParams, paginate
+from app.core.responses import json_rows, schema_columns, schema_fields
 from app.models.hotel import Hotel, Room
 from app.models.booking import Booking
-from app.models.user import User
-from app.schemas.hotel import Hotel as HotelSchema, Room as RoomSchema
+from app.models.user import User, UserRole
+from app.schemas.hotel import (
+    Hotel as HotelSchema, HotelSummary as HotelSummarySchema, HotelAvailability as HotelAvailabilitySchema,
+    Room as RoomSchema,
+)
 from app.schemas.booking import BookingCreate, Booking as BookingSchema
 from app.controllers.auth import get_current_user
+from app.core.auth_cache import Principal
+from app.services.availability import (
+    is_room_available, find_available_rooms, available_room_slots,
+    hotel_availability_select, room_type_availability_select,
+)
+from app.services import inventory, stats
+from app.services.catalog import hotel_summaries_select
+from app.services.search import get_search_backend
+from app.core.config import settings
 
 router = APIRouter()
 
-@router.get("/hotels", response_model=List[HotelSchema])
-def get_hotels(
-    skip: int = 0, 
-    limit: int = 100, 
+# The cached catalog endpoints below read the primary (get_db), see ResponseCache.serve
+@router.get("/hotels", response_model=List[HotelSummarySchema])
+async def get_hotels(
+    request: Request,
+    page: PageParams = Depends(),
     location: Optional[str] = Query(None, description="Filter hotels by location"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Hotel)
+    async def build(response):
+        # Summaries only; the full room list is served by the detail endpoint
+        query = hotel_summaries_select()
+        
+        # Filter by location if provided (word-prefix match through the search index)
+        if location:
+            matches = get_search_backend(db).matches(location, columns=["location"])
+            if matches is None:
+                return []  # nothing searchable in the filter, so nothing matches it
+            query = query.join(matches, matches.c.hotel_id == Hotel.id)
+        
+        return await paginate(db, query, Hotel.id, page, response)
     
-    # Filter by location if provided (case-insensitive partial match)
-    if location:
-        query = query.filter(Hotel.location.ilike(f"%{location}%"))
-    
-    hotels = query.offset(skip).limit(limit).all()
-    return hotels
+    return await response_cache.serve(
+        request, [CATALOG], build, List[HotelSummarySchema], use_cache=not wants_primary(request)
+    )
+
+@router.get("/hotels/search", response_model=List[HotelSummarySchema])
+async def search_hotels(
+    q: str = Query(..., min_length=1, description="Words to match in hotel name, location or description"),
+    limit: int = Query(20, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text hotel search, best matches first."""
+    matches = get_search_backend(db).matches(q)
+    if matches is None:
+        return []
+    query = hotel_summaries_select().join(matches, matches.c.hotel_id == Hotel.id)
+    result = await db.execute(query.order_by(matches.c.rank, Hotel.id).limit(limit))
+    return result.all()
 
 @router.get("/hotels/{hotel_id}", response_model=HotelSchema)
-def get_hotel(hotel_id: int, db: Session = Depends(get_db)):
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if hotel is None:
-        raise HTTPException(status_code=404, detail="Hotel not found")
-    return hotel
+async def get_hotel(request: Request, hotel_id: int, db: AsyncSession = Depends(get_db)):
+    async def build(response):
+        hotel = await db.scalar(select(Hotel).options(selectinload(Hotel.rooms)).where(Hotel.id == hotel_id))
+        if hotel is None:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        return hotel
+    
+    return await response_cache.serve(
+        request, [hotel_namespace(hotel_id)], build, HotelSchema, use_cache=not wants_primary(request)
+    )
 
 @router.get("/hotels/{hotel_id}/rooms", response_model=List[RoomSchema])
-def get_hotel_rooms(hotel_id: int, db: Session = Depends(get_db)):
-    rooms = db.query(Room).filter(Room.hotel_id == hotel_id).all()
-    return rooms
-
-# Helper function to check if a room is available for given dates
-def is_room_available(db: Session, room_id: int, check_in: date, check_out: date) -> bool:
-    """Check if a room is available for the given date range based on max_bookings limit."""
-    # Get the room to check max_bookings
-    room = db.query(Room).filter(Room.id == room_id).first()
-    if not room:
-        return False
-    
-    max_bookings = room.max_bookings or 1
+async def get_hotel_rooms(request: Request, hotel_id: int, db: AsyncSession = Depends(get_db)):
+    async def build(response):
+        rooms = await db.scalars(select(Room).where(Room.hotel_id == hotel_id))
+        return rooms.all()
     
-    # Count overlapping confirmed bookings
-    overlapping_count = db.query(Booking).filter(
-        Booking.room_id == room_id,
-        Booking.status == "confirmed",
-        # Check for date overlap: booking overlaps if it starts before new ends AND ends after new starts
-        Booking.check_in < check_out,
-        Booking.check_out > check_in
-    ).count()
-    
-    # Available if current bookings are less than max allowed
-    return overlapping_count < max_bookings
+    return await response_cache.serve(
+        request, [hotel_namespace(hotel_id)], build, List[RoomSchema], use_cache=not wants_primary(request)
+    )
 
 @router.get("/rooms/{room_id}/availability")
-def check_room_availability(
+async def check_room_availability(
     room_id: int,
     check_in: date = Query(..., description="Check-in date"),
     check_out: date = Query(..., description="Check-out date"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Check if a specific room is available for the given dates."""
     # Verify room exists
-    room = db.query(Room).filter(Room.id == room_id).first()
+    room = await db.get(Room, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     
     if check_in >= check_out:
         raise HTTPException(status_code=400, detail="Check-out must be after check-in")
     
-    available = is_room_available(db, room_id, check_in, check_out)
+    available = await db.run_sync(is_room_available, room_id, check_in, check_out)
     
     return {
         "room_id": room_id,
@@ -90,36 +118,81 @@ def check_room_availability(
     }
 
 @router.get("/hotels/{hotel_id}/available-rooms", response_model=List[RoomSchema])
-def get_available_rooms(
+async def get_available_rooms(
     hotel_id: int,
     check_in: date = Query(..., description="Check-in date"),
     check_out: date = Query(..., description="Check-out date"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all available rooms for a hotel for the given date range."""
     # Verify hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+    hotel = await db.get(Hotel, hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
     
     if check_in >= check_out:
         raise HTTPException(status_code=400, detail="Check-out must be after check-in")
     
-    # Get all rooms for the hotel
-    all_rooms = db.query(Room).filter(Room.hotel_id == hotel_id).all()
+    # Listed rooms with a free slot, resolved in one grouped query
+    return await db.run_sync(find_available_rooms, check_in, check_out, hotel_id=hotel_id, listed_only=True)
+
+@router.get("/search", response_model=List[HotelAvailabilitySchema])
+async def search_available_hotels(
+    response: Response,
+    check_in: date = Query(..., description="Check-in date"),
+    check_out: date = Query(..., description="Check-out date"),
+    guests: int = Query(1, ge=1, description="Guests staying in one room"),
+    location: Optional[str] = Query(None, description="Filter hotels by location"),
+    q: Optional[str] = Query(None, description="Words to match in hotel name, location or description"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Hotels with rooms free for the whole stay, with bookable room types and prices."""
+    if check_in >= check_out:
+        raise HTTPException(status_code=400, detail="Check-out must be after check-in")
     
-    # Filter to only available rooms
-    available_rooms = [
-        room for room in all_rooms 
-        if room.is_available and is_room_available(db, room.id, check_in, check_out)
-    ]
+    # Restrict the rooms considered to matching hotels before aggregating
+    backend = get_search_backend(db)
+    hotel_ids = None
+    for text_query, columns in ((location, ["location"]), (q, None)):
+        if not text_query:
+            continue
+        matches = backend.matches(text_query, columns)
+        if matches is None:
+            return []  # nothing searchable in the filter, so nothing matches it (as in get_hotels)
+        matching = select(matches.c.hotel_id)
+        hotel_ids = matching if hotel_ids is None else matching.where(matches.c.hotel_id.in_(hotel_ids))
+    
+    slots = available_room_slots(check_in, check_out, guests, hotel_ids)
+    hotels = await paginate(db, hotel_availability_select(slots), Hotel.id, page, response)
+    if not hotels:
+        return []
+    
+    # Room type breakdown for just this page of hotels
+    page_slots = available_room_slots(check_in, check_out, guests, [h.id for h in hotels])
+    room_types = {}
+    for row in await db.execute(room_type_availability_select(page_slots)):
+        room_types.setdefault(row.hotel_id, []).append(row)
     
-    return available_rooms
+    return [
+        HotelAvailabilitySchema(
+            **{key: getattr(h, key) for key in (
+                "id", "name", "location", "description", "image_url", "manager_id",
+                "min_price", "available_rooms", "remaining_capacity",
+            )},
+            room_types=[
+                {"type": t.type, "min_price": t.min_price, "available_rooms": t.available_rooms,
+                 "remaining_capacity": t.remaining_capacity}
+                for t in room_types.get(h.id, [])
+            ],
+        )
+        for h in hotels
+    ]
 
 @router.post("/bookings", response_model=BookingSchema)
-def create_booking(booking: BookingCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_booking(booking: BookingCreate, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     # Verify room exists
-    room = db.query(Room).filter(Room.id == booking.room_id).first()
+    room = await db.get(Room, booking.room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     
@@ -132,8 +205,10 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
     if days <= 0:
         raise HTTPException(status_code=400, detail="Invalid dates")
     
-    # Check if room is available for the requested dates
-    if not is_room_available(db, booking.room_id, booking.check_in, booking.check_out):
+    # Claim every night of the stay in the same transaction as the insert
+    if not await db.run_sync(inventory.reserve_nights, room, booking.check_in, booking.check_out):
+        await db.rollback()
+        metrics.booking_conflicts.inc()
         raise HTTPException(status_code=400, detail="Room is already booked for these dates")
     
     total_price = room.price * days
@@ -141,18 +216,62 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
     db_booking = Booking(
         user_id=current_user.id,
         room_id=booking.room_id,
+        hotel_id=room.hotel_id,
         check_in=booking.check_in,
         check_out=booking.check_out,
         total_price=total_price,
         status="confirmed"
     )
     db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+    await db.run_sync(stats.record_booking, room.hotel_id, booking.check_in, booking.check_out, total_price)
+    await db.commit()
+    await db.refresh(db_booking)
+    # Replicas may not have the booking yet; this client reads from the primary for a while
+    mark_recent_write(response)
     return db_booking
 
 @router.get("/bookings", response_model=List[BookingSchema])
-def get_user_bookings(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    bookings = db.query(Booking).filter(Booking.user_id == current_user.id).all()
-    return bookings
+async def get_user_bookings(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    query = select(*schema_columns(BookingSchema, Booking)).where(Booking.user_id == current_user.id)
+    rows = await paginate(db, query, Booking.id, page, response)
+    return json_rows(rows, schema_fields(BookingSchema), response)
 
+
+@router.post("/bookings/{booking_id}/cancel", response_model=BookingSchema)
+async def cancel_booking(booking_id: int, response: Response, db: AsyncSession = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    booking = await db.get(Booking, booking_id)
+    if not booking or (booking.user_id != current_user.id and current_user.role != UserRole.ADMIN):
+        raise HTTPException(status_code=404, detail="Booking not found")
+    
+    if booking.status == "cancelled":
+        raise HTTPException(status_code=400, detail="Booking is already cancelled")
+    
+    # Claim the transition first: of concurrent cancels only one sees its status unchanged,
+    # so the nights and the stats are released once
+    previous = booking.status
+    claimed = await db.execute(
+        update(Booking).where(Booking.id == booking.id, Booking.status == previous)
+        .values(status="cancelled").execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Booking is already cancelled")
+    
+    # Only confirmed bookings hold nights in the inventory ledger
+    if previous == "confirmed":
+        await db.run_sync(inventory.release_nights, booking.room_id, booking.check_in, booking.check_out)
+    # The hotel the booking was counted under (see app/services/stats.py)
+    hotel_id = booking.hotel_id
+    if hotel_id is None:
+        hotel_id = await db.scalar(select(Room.hotel_id).where(Room.id == booking.room_id))
+    if hotel_id is not None:
+        await db.run_sync(stats.record_cancellation, hotel_id, booking.check_in, booking.check_out, booking.total_price)
+    await db.commit()
+    await db.refresh(booking)
+    mark_recent_write(response)
+    return booking
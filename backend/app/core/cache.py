@@ -0,0 +1,247 @@
+"""
+Response cache for public catalog endpoints.
+
+Cached entries hold the serialized JSON body plus the headers the handler
+set (e.g. X-Next-Cursor). Every response carries a strong ETag, and
+If-None-Match is answered with 304 even on a cache miss.
+
+Invalidation is by namespace generation. Each cache key embeds the
+current generation of every namespace the response depends on, and a
+write bumps those generations. Stale entries are never addressed again
+and age out through TTL/LRU, so one increment invalidates any number of
+keys without tracking them.
+
+Entries are filled from the primary, never from a read replica: a replica
+that has not yet replayed the write behind an invalidation would otherwise
+put the old data under the new generation, served for the whole TTL.
+
+Backends (settings.RESPONSE_CACHE_BACKEND):
+  - "memory": per-process LRU with TTL; invalidation only reaches this worker
+  - "redis": shared by all workers; needs the `redis` package, and any
+    client with the redis.asyncio API (e.g. fakeredis) can be passed in
+  - "none": caching off, ETags and 304s still apply
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.core import instrumentation
+from app.core.config import settings
+
+# Namespaces: the catalog as a whole, and one hotel (its detail and room list)
+CATALOG = "catalog"
+
+def hotel_namespace(hotel_id: int) -> str:
+    return f"hotel:{hotel_id}"
+
+
+class CacheBackend:
+    """Interface implemented by the cache backends."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def generations(self, namespaces: List[str]) -> List[int]:
+        raise NotImplementedError
+
+    async def bump(self, namespace: str) -> None:
+        raise NotImplementedError
+
+
+class NullCacheBackend(CacheBackend):
+    async def get(self, key):
+        return None
+
+    async def set(self, key, value, ttl):
+        pass
+
+    async def generations(self, namespaces):
+        return [0] * len(namespaces)
+
+    async def bump(self, namespace):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._generations: Dict[str, int] = {}
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def generations(self, namespaces):
+        return [self._generations.get(ns, 0) for ns in namespaces]
+
+    async def bump(self, namespace):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    PREFIX = "hms:"
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        import redis.asyncio  # optional dependency, only needed for this backend
+        return cls(redis.asyncio.from_url(url))
+
+    async def get(self, key):
+        return await self.client.get(self.PREFIX + key)
+
+    async def set(self, key, value, ttl):
+        await self.client.set(self.PREFIX + key, value, px=max(1, int(ttl * 1000)))
+
+    async def generations(self, namespaces):
+        values = await self.client.mget([f"{self.PREFIX}gen:{ns}" for ns in namespaces])
+        return [int(v) if v is not None else 0 for v in values]
+
+    async def bump(self, namespace):
+        await self.client.incr(f"{self.PREFIX}gen:{namespace}")
+
+
+def _pack(body: bytes, headers: Dict[str, str]) -> bytes:
+    return json.dumps(headers).encode() + b"\n" + body
+
+
+def _unpack(value: bytes) -> Tuple[bytes, Dict[str, str]]:
+    header_line, body = value.split(b"\n", 1)
+    return body, json.loads(header_line)
+
+
+class ResponseCache:
+    # Handler-set headers worth keeping with a cached body
+    KEPT_HEADERS = ("x-next-cursor",)
+
+    def __init__(self, backend: CacheBackend, ttl: float, client_max_age: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.client_max_age = client_max_age
+        self._adapters = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.bypassed = 0
+        self.invalidations = 0
+
+    def _adapter(self, model) -> TypeAdapter:
+        adapter = self._adapters.get(model)
+        if adapter is None:
+            adapter = self._adapters[model] = TypeAdapter(model)
+        return adapter
+
+    def _cache_control(self) -> str:
+        if self.client_max_age > 0:
+            return f"public, max-age={self.client_max_age}"
+        # Browsers may store the response but must revalidate (cheap with the ETag)
+        return "public, no-cache"
+
+    async def serve(
+        self,
+        request: Request,
+        namespaces: Iterable[str],
+        build: Callable[[Response], Awaitable[object]],
+        model,
+        use_cache: bool = True,
+    ) -> Response:
+        """
+        Return the cached response for this URL, or run `build(response)`,
+        serialize its result as `model` and cache it under `namespaces`.
+        With use_cache=False the cache is neither read nor filled.
+        `build` must read from the primary (a get_db session).
+        """
+        namespaces = list(namespaces)
+        key = None
+        cached = None
+        if use_cache:
+            generations = await self.backend.generations(namespaces)
+            key = "resp:" + ",".join(f"{ns}@{g}" for ns, g in zip(namespaces, generations)) + ":" + str(request.url.path)
+            if request.url.query:
+                key += "?" + "&".join(sorted(request.url.query.split("&")))
+            cached = await self.backend.get(key)
+        else:
+            self.bypassed += 1
+
+        if cached is not None:
+            self.hits += 1
+            body, headers = _unpack(cached)
+            status = "HIT"
+        else:
+            if use_cache:
+                self.misses += 1
+            scratch = Response()
+            data = await build(scratch)
+            adapter = self._adapter(model)
+            with instrumentation.serializing():
+                body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+            headers = {name: scratch.headers[name] for name in self.KEPT_HEADERS if name in scratch.headers}
+            headers["etag"] = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            if key is not None:
+                await self.backend.set(key, _pack(body, headers), self.ttl)
+            status = "MISS" if use_cache else "BYPASS"
+
+        headers = {**headers, "cache-control": self._cache_control(), "x-cache": status}
+        if headers["etag"] in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            await self.backend.bump(namespace)
+        self.invalidations += len(namespaces)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "bypassed": self.bypassed,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def make_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if name == "redis":
+        return RedisCacheBackend.from_url(settings.RESPONSE_CACHE_REDIS_URL)
+    if name == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {name!r}")
+
+
+response_cache = ResponseCache(
+    make_backend(settings.RESPONSE_CACHE_BACKEND),
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+    settings.RESPONSE_CACHE_CLIENT_MAX_AGE,
+)
@@ -10,11 +10,70 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = f"sqlite:///{os.path.join(BASE_DIR, 'hotel.db')}"
+    # Comma-separated read replica URLs for get_read_db; empty sends reads to the primary
+    READ_REPLICA_URLS: str = ""
+    # After a write, the same client reads from the primary for this long (replica lag allowance)
+    READ_YOUR_WRITES_SECONDS: int = 10
+    
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers no longer wait for writers
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # safe with WAL; fsync at checkpoints, not every commit
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # negative: KiB of page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes; 0 disables memory-mapped reads
+    # Connection pool (server databases; SQLite keeps SQLAlchemy's default pool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds; stay under server-side idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    # Schema handling when the app starts: "verify" (fail unless migrated; run migrate.py),
+    # "upgrade" (apply pending migrations, for development) or "off"
+    SCHEMA_STARTUP_MODE: str = "verify"
     
     # Security
     SECRET_KEY: str = "your-super-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Authenticated-user cache (see app/core/auth_cache.py); max size 0 disables it
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Trust the signed uid/role claims on GET requests instead of looking the user up.
+    # Role changes and deactivation then take effect only when the token expires.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Password hashing (argon2). Changing these rehashes passwords on next login.
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING: int = 64  # running + queued before answering 503
+    
+    # Request instrumentation (app/core/instrumentation.py)
+    REQUEST_LOG: bool = True  # one JSON line per request on the "app.requests" logger
+    SLOW_QUERY_MS: float = 200.0  # log statements at least this slow; 0 disables
+    SLOW_QUERY_EXPLAIN: bool = True  # add EXPLAIN QUERY PLAN to slow-query lines (SQLite)
+    REQUEST_PROFILING: bool = True  # admins may send X-Profile to get a cProfile report
+    # Prometheus /metrics (app/core/metrics.py). Off by default: it exposes routes, latencies and pool
+    # state. Set METRICS_TOKEN when enabling it; scrapers then send it as a Bearer token
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: Optional[str] = None
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0  # /health answers 503 if the database takes longer
+    
+    # Pagination (keyset cursors, see app/core/pagination.py)
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+    
+    # Public catalog response cache (see app/core/cache.py): "memory", "redis" or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_CLIENT_MAX_AGE: int = 0  # 0: browsers revalidate every time via ETag
+    
+    # Hotel search backend: "auto" (FTS5 on SQLite, LIKE elsewhere), "fts5" or "like"
+    SEARCH_BACKEND: str = "auto"
     
     # Email Configuration (Gmail SMTP)
     SMTP_HOST: str = "smtp.gmail.com"
@@ -23,6 +82,31 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAILS_FROM_EMAIL: Optional[str] = None
     EMAILS_FROM_NAME: str = "Hotel Management System"
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_IDLE_SECONDS: float = 60.0  # pooled connections idle longer than this are reopened
+    
+    # Background mail dispatcher (app/services/mailer.py); 0 workers disables it
+    EMAIL_WORKERS: int = 1
+    EMAIL_BATCH_SIZE: int = 20
+    EMAIL_POLL_SECONDS: float = 2.0
+    EMAIL_MAX_ATTEMPTS: int = 6  # then the message is dead-lettered
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0  # doubled after each failed attempt
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_CLAIM_TIMEOUT_SECONDS: float = 300.0  # reclaim messages of a worker that died mid-send
+    
+    # Analytics reports (app/services/reporting.py); needs the duckdb package
+    REPORTS_PATH: str = os.path.join(BASE_DIR, "reports", "analytics.duckdb")
+    # Seconds between exports in this process; 0 (default) leaves exporting to export_reports.py
+    REPORTS_EXPORT_INTERVAL_SECONDS: float = 0.0
+    REPORTS_EXPORT_BATCH_SIZE: int = 50000
+    
+    # Bulk import (app/services/bulk_import.py): rows per validated, committed chunk
+    BULK_IMPORT_CHUNK_SIZE: int = 1000
+    BULK_IMPORT_MAX_ERRORS: int = 1000  # row errors listed in a report; the count is always exact
+    
+    # Streaming exports (app/services/exports.py): rows fetched and encoded per batch
+    EXPORT_BATCH_SIZE: int = 5000
     
     # Password Reset
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
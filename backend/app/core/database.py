@@ -1,23 +1,132 @@
-from sqlalchemy import create_engine
+import itertools
+import time
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# SQLite specific: check_same_thread=False is needed only for SQLite
-connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+# Async drivers used by the request path for each synchronous URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
 
-engine = create_engine(
-    settings.DATABASE_URL, connect_args=connect_args
-)
+def async_url(url: str) -> str:
+    """Map a synchronous DATABASE_URL to its async-driver equivalent."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def sqlite_pragmas() -> dict:
+    """Pragmas from settings, in the order they are applied."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+
+def configure_sqlite(engine, pragmas: dict) -> None:
+    """Run `PRAGMA name = value` for each pragma on every new DBAPI connection of `engine`."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+def engine_options(url: str) -> dict:
+    """create_engine keyword arguments for `url`."""
+    if is_sqlite(url):
+        # SQLite specific: check_same_thread=False is needed only for SQLite
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+# Synchronous engine: migrations, seed/maintenance scripts and background jobs
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: every request handler, so I/O waits never block the event loop
+async_engine = create_async_engine(
+    async_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL)
+)
+
+if is_sqlite(settings.DATABASE_URL):
+    configure_sqlite(engine, sqlite_pragmas())
+    configure_sqlite(async_engine.sync_engine, sqlite_pragmas())
+
+# expire_on_commit=False: attributes stay readable after commit without lazy I/O
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replicas: async engines only, they serve GET handlers through get_read_db
+replica_engines = []
+for replica_url in filter(None, (u.strip() for u in settings.READ_REPLICA_URLS.split(","))):
+    replica_engine = create_async_engine(async_url(replica_url), **engine_options(replica_url))
+    if is_sqlite(replica_url):
+        configure_sqlite(replica_engine.sync_engine, sqlite_pragmas())
+    replica_engines.append(replica_engine)
+
+ReplicaSessionLocals = [
+    async_sessionmaker(e, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    for e in replica_engines
+]
+_next_replica = itertools.cycle(ReplicaSessionLocals) if ReplicaSessionLocals else None
+
 Base = declarative_base()
 
-# Dependency
-def get_db():
-    db = SessionLocal()
+# Read-your-writes: set by handlers that write on behalf of a client, honoured by get_read_db
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+def mark_recent_write(response: Response) -> None:
+    """Route this client's reads to the primary until replicas have caught up with its write."""
+    until = int(time.time()) + settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        READ_PRIMARY_COOKIE, str(until), max_age=settings.READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax",
+    )
+
+def wants_primary(request: Request) -> bool:
+    if request.headers.get(READ_PRIMARY_HEADER):
+        return True
     try:
+        return int(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+# Dependency
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+def read_sessionmaker(request: Request):
+    """Session factory for a read-only request: next replica in round-robin order, or the primary."""
+    if _next_replica is not None and not wants_primary(request):
+        return next(_next_replica)
+    return AsyncSessionLocal
+
+# Dependency for read-only handlers
+async def get_read_db(request: Request):
+    async with read_sessionmaker(request)() as db:
+        yield db
+
+async def ping_database() -> None:
+    """Round trip to the primary through the async engine (readiness probe)."""
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
@@ -1,27 +1,24 @@
 import smtplib
+from html import escape
+from string import Template
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Optional, Tuple
 from app.core.config import settings
 
 
 def send_email(to_email: str, subject: str, html_content: str) -> bool:
     """
-    Send an email using Gmail SMTP.
-    Returns True if successful, False otherwise.
+    Send an email using Gmail SMTP, on a fresh connection, in the caller's thread.
+    Returns True if successful, False otherwise. Request handlers should
+    queue mail instead (app/services/mailer.py).
     """
-    if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
+    if not email_configured():
         print("Warning: Email not configured. Skipping email send.")
         return False
     
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL or settings.SMTP_USER}>"
-        msg["To"] = to_email
-        
-        html_part = MIMEText(html_content, "html")
-        msg.attach(html_part)
+        msg = build_message(to_email, subject, html_content)
         
         with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
             server.starttls()
@@ -35,23 +32,32 @@ def send_email(to_email: str, subject: str, html_content: str) -> bool:
         return False
 
 
-def send_welcome_email(to_email: str, full_name: str) -> bool:
-    """
-    Send a welcome email to a newly registered user.
-    """
-    subject = "Welcome to Hotel Management System!"
-    
-    html_content = f"""
+def email_configured() -> bool:
+    return bool(settings.SMTP_USER and settings.SMTP_PASSWORD)
+
+
+def build_message(to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL or settings.SMTP_USER}>"
+    msg["To"] = to_email
+    msg.attach(MIMEText(html_content, "html"))
+    return msg
+
+
+# Templates are parsed once at import; rendering is a single substitution pass
+WELCOME_SUBJECT = "Welcome to Hotel Management System!"
+WELCOME_TEMPLATE = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin-top: 20px; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #888; font-size: 12px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+            .button { display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin-top: 20px; }
+            .footer { text-align: center; margin-top: 20px; color: #888; font-size: 12px; }
         </style>
     </head>
     <body>
@@ -60,7 +66,7 @@ def send_welcome_email(to_email: str, full_name: str) -> bool:
                 <h1>🏨 Welcome to Our Hotel!</h1>
             </div>
             <div class="content">
-                <h2>Hello {full_name}!</h2>
+                <h2>Hello ${full_name}!</h2>
                 <p>Thank you for creating an account with Hotel Management System. We're excited to have you on board!</p>
                 <p>With your new account, you can:</p>
                 <ul>
@@ -69,7 +75,7 @@ def send_welcome_email(to_email: str, full_name: str) -> bool:
                     <li>Access exclusive member deals</li>
                 </ul>
                 <p>If you have any questions, feel free to reach out to our support team.</p>
-                <a href="{settings.FRONTEND_URL}" class="button">Explore Hotels</a>
+                <a href="${frontend_url}" class="button">Explore Hotels</a>
             </div>
             <div class="footer">
                 <p>© 2024 Hotel Management System. All rights reserved.</p>
@@ -77,30 +83,21 @@ def send_welcome_email(to_email: str, full_name: str) -> bool:
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(to_email, subject, html_content)
-
+    """)
 
-def send_password_reset_email(to_email: str, full_name: str, reset_token: str) -> bool:
-    """
-    Send a password reset email with a secure link.
-    """
-    subject = "Reset Your Password - Hotel Management System"
-    reset_link = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
-    
-    html_content = f"""
+PASSWORD_RESET_SUBJECT = "Reset Your Password - Hotel Management System"
+PASSWORD_RESET_TEMPLATE = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ display: inline-block; background: #e74c3c; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin-top: 20px; }}
-            .warning {{ background: #fff3cd; border: 1px solid #ffc107; padding: 15px; border-radius: 5px; margin-top: 20px; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #888; font-size: 12px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+            .button { display: inline-block; background: #e74c3c; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin-top: 20px; }
+            .warning { background: #fff3cd; border: 1px solid #ffc107; padding: 15px; border-radius: 5px; margin-top: 20px; }
+            .footer { text-align: center; margin-top: 20px; color: #888; font-size: 12px; }
         </style>
     </head>
     <body>
@@ -109,20 +106,20 @@ def send_password_reset_email(to_email: str, full_name: str, reset_token: str) -
                 <h1>🔐 Password Reset Request</h1>
             </div>
             <div class="content">
-                <h2>Hello {full_name}!</h2>
+                <h2>Hello ${full_name}!</h2>
                 <p>We received a request to reset your password. Click the button below to create a new password:</p>
-                <a href="{reset_link}" class="button">Reset Password</a>
+                <a href="${reset_link}" class="button">Reset Password</a>
                 <div class="warning">
                     <strong>⚠️ Important:</strong>
                     <ul>
-                        <li>This link will expire in {settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES} minutes</li>
+                        <li>This link will expire in ${expire_minutes} minutes</li>
                         <li>If you didn't request this, please ignore this email</li>
                         <li>Never share this link with anyone</li>
                     </ul>
                 </div>
                 <p style="margin-top: 20px; font-size: 12px; color: #666;">
                     If the button doesn't work, copy and paste this link into your browser:<br>
-                    <a href="{reset_link}">{reset_link}</a>
+                    <a href="${reset_link}">${reset_link}</a>
                 </p>
             </div>
             <div class="footer">
@@ -131,6 +128,34 @@ def send_password_reset_email(to_email: str, full_name: str, reset_token: str) -
         </div>
     </body>
     </html>
+    """)
+
+
+def render_welcome_email(full_name: str) -> Tuple[str, str]:
+    """Subject and HTML body of the welcome email."""
+    html_content = WELCOME_TEMPLATE.substitute(full_name=escape(full_name or ""), frontend_url=settings.FRONTEND_URL)
+    return WELCOME_SUBJECT, html_content
+
+
+def render_password_reset_email(full_name: str, reset_token: str) -> Tuple[str, str]:
+    """Subject and HTML body of the password reset email."""
+    html_content = PASSWORD_RESET_TEMPLATE.substitute(
+        full_name=escape(full_name or ""),
+        reset_link=f"{settings.FRONTEND_URL}/reset-password?token={reset_token}",
+        expire_minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES,
+    )
+    return PASSWORD_RESET_SUBJECT, html_content
+
+
+def send_welcome_email(to_email: str, full_name: str) -> bool:
     """
-    
-    return send_email(to_email, subject, html_content)
+    Send a welcome email to a newly registered user.
+    """
+    return send_email(to_email, *render_welcome_email(full_name))
+
+
+def send_password_reset_email(to_email: str, full_name: str, reset_token: str) -> bool:
+    """
+    Send a password reset email with a secure link.
+    """
+    return send_email(to_email, *render_password_reset_email(full_name, reset_token))
@@ -0,0 +1,295 @@
+"""
+Per-request performance instrumentation.
+
+RequestInstrumentation is an ASGI middleware that opens a RequestStats for
+each HTTP request in a context variable. SQLAlchemy cursor events on every
+instrumented engine add each statement's count and time to it, and
+response serialization adds its time. When the response starts, the stats
+go into a Server-Timing header, and one JSON line is written on the
+"app.requests" logger. That line holds the request id, the route template,
+the status, the total latency, the DB query count and DB time, the
+serialization time and the user.
+
+Serialization time is the time spent encoding response bodies: the
+application's JSONResponse.render, json_rows, cached bodies and export
+chunks all wrap their encoding in serializing(). FastAPI's own
+response_model validation has no public hook, so it is counted in the
+rest of the request rather than measured by patching FastAPI.
+
+Statements slower than settings.SLOW_QUERY_MS are logged on "app.slow_queries"
+with the request id and path. On SQLite the line includes the EXPLAIN QUERY
+PLAN output.
+
+Admins can profile one request by sending the X-Profile header. Its value is
+a pstats sort key, "cumulative" by default. The response is then the cProfile
+report instead of the usual body. The profiler only sees the event-loop thread:
+SQL runs in the driver's thread, so its cost shows as waiting, and the DB time
+is in the request log. Only one request is profiled at a time.
+"""
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+from jose import JWTError, jwt
+from sqlalchemy import event
+from app.core import metrics
+from app.core.config import settings
+
+request_logger = logging.getLogger("app.requests")
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+PROFILE_HEADER = "X-Profile"
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "calls", "ncalls", "time")
+PROFILE_LINES = 60
+
+
+@dataclass
+class RequestStats:
+    request_id: str
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    route: Optional[str] = None
+    status: Optional[int] = None
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    user_id: Optional[int] = None
+    user_role: Optional[str] = None
+
+    def as_log(self, duration: float) -> dict:
+        return {
+            "request_id": self.request_id, "method": self.method, "path": self.path, "route": self.route,
+            "status": self.status, "duration_ms": round(duration * 1000, 2), "db_queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 2), "serialize_ms": round(self.serialize_seconds * 1000, 2),
+            "user_id": self.user_id,
+        }
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def tag_user(principal) -> None:
+    """Record the authenticated user on the current request (see get_current_user)."""
+    stats = _current.get()
+    if stats is not None:
+        stats.user_id = principal.id
+        stats.user_role = principal.role
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as response serialization time."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - started
+
+
+# --- SQL ---
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def _explain(conn, statement, parameters) -> List[str]:
+    # Raw DBAPI cursor, so the EXPLAIN is neither counted nor timed itself
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+# The start time lives on the statement's execution context: a statement that
+# raises never reaches after_cursor_execute, and its context is simply dropped
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if settings.SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        entry = {
+            "request_id": stats.request_id if stats else None, "path": stats.path if stats else None,
+            # Statements only: parameter values can be personal data
+            "duration_ms": round(elapsed * 1000, 2), "statement": " ".join(statement.split()),
+        }
+        if settings.SLOW_QUERY_EXPLAIN and conn.dialect.name == "sqlite" and not executemany \
+                and statement.split(None, 1)[0].upper() in _EXPLAINABLE:
+            try:
+                entry["plan"] = _explain(conn, statement, parameters)
+            except Exception as exc:  # the plan is a nice-to-have; never fail the query over it
+                entry["plan_error"] = str(exc)
+        slow_query_logger.warning(json.dumps(entry, default=str))
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement on a synchronous engine (use async_engine.sync_engine for async ones)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Middleware ---
+
+_profiling = threading.Lock()
+
+
+def _claims_admin(scope) -> bool:
+    """Cheap pre-check before profiling: a validly signed admin token. The resolved user is checked afterwards."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            try:
+                claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            except JWTError:
+                return False
+            return claims.get("role") == "admin"
+    return False
+
+
+class RequestInstrumentation:
+    """ASGI middleware; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes = {}
+
+    def _route(self, scope) -> Optional[str]:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return None
+        route = self._routes.get(endpoint)
+        if route is None:
+            app = scope.get("app")
+            for candidate in getattr(app, "routes", ()):
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    route = self._routes[endpoint] = candidate.path
+                    break
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(REQUEST_ID_HEADER.lower().encode(), b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        stats = RequestStats(request_id=request_id, method=scope["method"], path=scope["path"])
+        token = _current.set(stats)
+
+        profile_sort = headers.get(PROFILE_HEADER.lower().encode())
+        if profile_sort is not None and settings.REQUEST_PROFILING and _claims_admin(scope) \
+                and _profiling.acquire(blocking=False):
+            try:
+                await self._profile(scope, receive, send, stats, profile_sort.decode("latin-1").strip())
+            finally:
+                _profiling.release()
+                _current.reset(token)
+            return
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                stats.status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"server-timing", self._server_timing(stats).encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception:
+            stats.status = stats.status or 500
+            raise
+        finally:
+            stats.route = self._route(scope)
+            self._finish(stats)
+            _current.reset(token)
+
+    @staticmethod
+    def _server_timing(stats: RequestStats) -> str:
+        total = (time.perf_counter() - stats.started) * 1000
+        return (f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries", '
+                f"serialize;dur={stats.serialize_seconds * 1000:.2f}, total;dur={total:.2f}")
+
+    def _finish(self, stats: RequestStats) -> None:
+        duration = time.perf_counter() - stats.started
+        if settings.METRICS_ENABLED:
+            metrics.observe_request(stats, duration)
+        if settings.REQUEST_LOG:
+            request_logger.info(json.dumps(stats.as_log(duration)))
+
+    async def _profile(self, scope, receive, send, stats, sort):
+        """Run the request under cProfile and answer with the report, if the user turns out to be an admin."""
+        messages = []
+
+        async def collect(message):
+            if message["type"] == "http.response.start":
+                stats.status = message["status"]
+            messages.append(message)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, collect)
+        finally:
+            profiler.disable()
+            stats.route = self._route(scope)
+            self._finish(stats)
+
+        if stats.user_role != "admin":
+            for message in messages:
+                await send(message)
+            return
+
+        report = io.StringIO()
+        summary = stats.as_log(time.perf_counter() - stats.started)
+        report.write(json.dumps(summary) + "\n\n")
+        sort = sort if sort in PROFILE_SORT_KEYS else "cumulative"
+        pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(PROFILE_LINES)
+        body = report.getvalue().encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode()),
+            (b"x-request-id", stats.request_id.encode("latin-1")),
+            (b"x-profiled-status", str(stats.status).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def install(app, engines) -> None:
+    """Instrument `engines` and add the middleware to `app`."""
+    for engine in engines:
+        instrument_engine(engine)
+    app.add_middleware(RequestInstrumentation)
+    for logger in (request_logger, slow_query_logger):
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
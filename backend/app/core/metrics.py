@@ -0,0 +1,244 @@
+"""
+Prometheus metrics in the text exposition format, served at /metrics.
+
+Recording is a lock-protected increment on plain Python numbers, and the
+request metrics are fed once per request by the instrumentation middleware.
+Everything that already keeps its own numbers (caches, the password-hash
+executor, connection pools) is only read when /metrics is scraped, so it
+costs nothing per request.
+
+Values are per process, like the memory response cache. With several
+workers, let Prometheus scrape each one, or aggregate them with sum().
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+# Seconds; request latency and DB pool checkout wait
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Route prefix -> router label; anything else is "other"
+ROUTERS = (("/api/auth", "auth"), ("/api/public", "public"), ("/api/admin", "admin"), ("/api/manager", "manager"))
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.label_names = name, help, labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Iterable[float], labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.label_names = name, help, labels
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in sorted(self._series.items())]
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Read from `read()` at scrape time; returns {label values: value}."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], Dict[Tuple[str, ...], float]],
+                 labels: Tuple[str, ...] = (), kind: str = "gauge"):
+        self.name, self.help, self.label_names, self.read, self.kind = name, help, labels, read, kind
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self.read().items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by router, method and status.", ("router", "method", "status")))
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by router.", LATENCY_BUCKETS, ("router",)))
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "SQL statements executed while serving requests, by router.", ("router",)))
+db_seconds_total = registry.register(Counter(
+    "db_query_seconds_total", "Time spent in SQL statements while serving requests, by router.", ("router",)))
+pool_checkout = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Wait for a database connection from the pool, by engine.", CHECKOUT_BUCKETS,
+    ("engine",)))
+booking_conflicts = registry.register(Counter(
+    "booking_conflicts_total", "Bookings refused because the room was already taken for those nights."))
+
+
+def router_of(path: Optional[str]) -> str:
+    for prefix, name in ROUTERS:
+        if path and path.startswith(prefix):
+            return name
+    return "other"
+
+
+def observe_request(stats, duration: float) -> None:
+    """Called by the instrumentation middleware once per finished request."""
+    router = router_of(stats.route) if stats.route else "unmatched"
+    requests_total.inc(router, stats.method, str(stats.status))
+    request_duration.observe(duration, router)
+    if stats.queries:
+        db_queries_total.inc(router, amount=stats.queries)
+        db_seconds_total.inc(router, amount=stats.db_seconds)
+
+
+def instrument_pool(engine, name: str) -> None:
+    """
+    Time connection checkouts on `engine`'s pool. SQLAlchemy has no event
+    before a checkout starts waiting, so the pool's connect() is wrapped;
+    a pool replaced by engine.dispose() is not instrumented again.
+    """
+    pool = engine.pool
+    if getattr(pool, "_checkout_timed", False):
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            pool_checkout.observe(time.perf_counter() - started, name)
+
+    pool.connect = timed_connect
+    pool._checkout_timed = True
+
+
+pools: Dict[str, object] = {}
+
+
+def register_pool(engine, name: str) -> None:
+    """Time checkouts, and report pool size and checked-out connections at scrape time where the pool tracks them."""
+    instrument_pool(engine, name)
+    pools[name] = engine
+
+
+def _pool_connections() -> Dict[Tuple[str, ...], float]:
+    values = {}
+    for name, engine in pools.items():
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            values[(name, "checked_out")] = pool.checkedout()
+            values[(name, "size")] = pool.size()
+            values[(name, "overflow")] = max(0, pool.overflow())
+    return values
+
+
+def _cache_lookups() -> Dict[Tuple[str, ...], float]:
+    from app.core.auth_cache import principal_cache
+    from app.core.cache import response_cache
+    return {
+        ("response", "hit"): response_cache.hits, ("response", "miss"): response_cache.misses,
+        ("response", "not_modified"): response_cache.not_modified, ("response", "bypass"): response_cache.bypassed,
+        ("principal", "hit"): principal_cache.hits, ("principal", "miss"): principal_cache.misses,
+    }
+
+
+def _cache_hit_ratio() -> Dict[Tuple[str, ...], float]:
+    lookups = _cache_lookups()
+    ratios = {}
+    for cache in ("response", "principal"):
+        hits, misses = lookups[(cache, "hit")], lookups[(cache, "miss")]
+        ratios[(cache,)] = hits / (hits + misses) if hits + misses else 0.0
+    return ratios
+
+
+def _hash_executor() -> Dict[Tuple[str, ...], float]:
+    from app.core.security import hash_executor
+    return {("queued",): hash_executor.queue_depth, ("pending",): hash_executor.pending}
+
+
+def _hash_rejected() -> Dict[Tuple[str, ...], float]:
+    from app.core.security import hash_executor
+    return {(): hash_executor.rejected}
+
+
+registry.register(Gauge(
+    "db_pool_connections", "Connections per pool: checked out, pool size and overflow in use.",
+    _pool_connections, ("engine", "state")))
+registry.register(Gauge(
+    "cache_lookups_total", "Cache lookups by cache and result.", _cache_lookups, ("cache", "result"), kind="counter"))
+registry.register(Gauge("cache_hit_ratio", "Hits over hits plus misses since start.", _cache_hit_ratio, ("cache",)))
+registry.register(Gauge(
+    "password_hash_executor_calls", "Password hash calls waiting for a worker (queued) or running plus queued (pending).",
+    _hash_executor, ("state",)))
+registry.register(Gauge(
+    "password_hash_rejected_total", "Password hash calls refused with 503 because the executor was full.",
+    _hash_rejected, kind="counter"))
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,291 @@
+"""
+Versioned schema migrations.
+
+Each migration is a function registered with @migration(version, description)
+that receives an open connection. Applied versions are recorded in the
+schema_version table, so `upgrade()` only runs what a database is missing.
+Migrations describe the schema as it was when they were written (frozen
+table snapshots below), never the live ORM models, and they are the only
+thing that creates tables: run `python migrate.py` before starting the app,
+which by default only calls verify() (see settings.SCHEMA_STARTUP_MODE).
+"""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Float, Boolean, Text, Date, DateTime,
+    ForeignKey, Index, exc, inspect, select, func,
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS = []
+
+_version_table = Table(
+    "schema_version", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime),
+)
+
+
+def migration(version: int, description: str):
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+def head() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(conn) -> int:
+    if not inspect(conn).has_table(_version_table.name):
+        return 0
+    return conn.execute(select(func.max(_version_table.c.version))).scalar() or 0
+
+
+class SchemaVersionError(RuntimeError):
+    """The database is not migrated to the version this code needs."""
+
+
+def verify(engine) -> int:
+    """
+    Check that the database is at head() without changing it; returns its version.
+    A migrated database costs one query and no reflection.
+    """
+    with engine.connect() as conn:
+        try:
+            current = conn.execute(select(func.max(_version_table.c.version))).scalar() or 0
+        except (exc.OperationalError, exc.ProgrammingError):
+            # No schema_version table: never migrated, or not reachable; let reflection tell which
+            conn.rollback()
+            current = current_version(conn)
+    if current < head():
+        raise SchemaVersionError(
+            f"Database schema is at version {current} but this code needs {head()}; run `python migrate.py`"
+        )
+    if current > head():
+        logger.warning("Database schema version %s is newer than this code's %s", current, head())
+    return current
+
+
+def upgrade(engine, target: int = None):
+    """Apply pending migrations up to `target` (default: latest). Returns applied versions."""
+    target = head() if target is None else target
+    with engine.begin() as conn:
+        _version_table.create(conn, checkfirst=True)
+        current = current_version(conn)
+
+    applied = []
+    for version, description, fn in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        # One transaction per migration so a failure leaves earlier ones recorded
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(_version_table.insert().values(
+                version=version, description=description, applied_at=datetime.utcnow()
+            ))
+        applied.append(version)
+    return applied
+
+
+# --- Migrations ---
+
+@migration(1, "Baseline schema: users, hotels, rooms, bookings")
+def _baseline(conn):
+    meta = MetaData()
+    Table(
+        "users", meta,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("email", String, unique=True, index=True),
+        Column("hashed_password", String),
+        Column("full_name", String),
+        Column("role", String),
+        Column("is_active", Boolean),
+        Column("reset_token", String, nullable=True),
+        Column("reset_token_expires", DateTime, nullable=True),
+    )
+    Table(
+        "hotels", meta,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String, index=True),
+        Column("location", String, index=True),
+        Column("description", Text),
+        Column("image_url", String, nullable=True),
+        Column("manager_id", Integer, ForeignKey("users.id")),
+    )
+    Table(
+        "rooms", meta,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("hotel_id", Integer, ForeignKey("hotels.id")),
+        Column("room_number", String),
+        Column("type", String),
+        Column("price", Float),
+        Column("capacity", Integer),
+        Column("is_available", Boolean),
+        Column("description", Text, nullable=True),
+        Column("max_bookings", Integer),
+    )
+    Table(
+        "bookings", meta,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("user_id", Integer, ForeignKey("users.id")),
+        Column("room_id", Integer, ForeignKey("rooms.id")),
+        Column("check_in", Date),
+        Column("check_out", Date),
+        Column("total_price", Float),
+        Column("status", String),
+    )
+    # checkfirst: databases created before migrations existed already have these
+    meta.create_all(conn, checkfirst=True)
+
+
+@migration(2, "Composite indexes for booking overlap, per-user and recent-booking lookups")
+def _bookings_indexes(conn):
+    bookings = Table("bookings", MetaData(), autoload_with=conn)
+    indexes = [
+        # Overlap checks: room_id = ? AND status = ? AND check_in < ? AND check_out > ?
+        Index("ix_bookings_room_status_dates",
+              bookings.c.room_id, bookings.c.status, bookings.c.check_in, bookings.c.check_out),
+        Index("ix_bookings_user_id", bookings.c.user_id),
+        # Dashboards: room_id IN (...) ORDER BY id DESC LIMIT n
+        Index("ix_bookings_room_recent", bookings.c.room_id, bookings.c.id.desc()),
+    ]
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migration(3, "Per-night room inventory ledger, backfilled from confirmed bookings")
+def _room_inventory(conn):
+    meta = MetaData()
+    meta.reflect(conn, only=["rooms", "bookings"])
+    bookings = meta.tables["bookings"]
+    ledger = Table(
+        "room_inventory", meta,
+        Column("room_id", Integer, ForeignKey("rooms.id"), primary_key=True),
+        Column("night", Date, primary_key=True),
+        Column("booked", Integer, nullable=False),
+    )
+    ledger.create(conn, checkfirst=True)
+
+    counts = {}
+    rows = conn.execute(
+        select(bookings.c.room_id, bookings.c.check_in, bookings.c.check_out)
+        .where(bookings.c.status == "confirmed")
+    )
+    for room_id, check_in, check_out in rows:
+        if not check_in or not check_out:
+            continue
+        for offset in range((check_out - check_in).days):
+            key = (room_id, check_in + timedelta(days=offset))
+            counts[key] = counts.get(key, 0) + 1
+    if counts:
+        conn.execute(ledger.delete())
+        conn.execute(ledger.insert(), [
+            {"room_id": room_id, "night": night, "booked": booked}
+            for (room_id, night), booked in counts.items()
+        ])
+
+
+@migration(4, "Index rooms by hotel for per-hotel listings and aggregates")
+def _rooms_hotel_index(conn):
+    rooms = Table("rooms", MetaData(), autoload_with=conn)
+    Index("ix_rooms_hotel_id", rooms.c.hotel_id).create(conn, checkfirst=True)
+
+
+@migration(5, "FTS5 search index over hotel name, location and description (SQLite only)")
+def _hotels_fts(conn):
+    if conn.dialect.name != "sqlite":
+        return
+    conn.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS hotels_fts USING fts5("
+        "name, location, description, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    conn.exec_driver_sql("DELETE FROM hotels_fts")
+    conn.exec_driver_sql(
+        "INSERT INTO hotels_fts (rowid, name, location, description) "
+        "SELECT id, coalesce(name, ''), coalesce(location, ''), coalesce(description, '') FROM hotels"
+    )
+
+
+@migration(6, "Outbound email queue for the background mail dispatcher")
+def _email_outbox(conn):
+    meta = MetaData()
+    outbox = Table(
+        "email_outbox", meta,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("to_email", String, nullable=False),
+        Column("subject", String, nullable=False),
+        Column("html", Text, nullable=False),
+        Column("status", String, nullable=False),
+        Column("attempts", Integer, nullable=False),
+        Column("next_attempt_at", DateTime, nullable=False),
+        Column("claimed_by", String),
+        Column("claimed_at", DateTime),
+        Column("last_error", Text),
+        Column("created_at", DateTime, nullable=False),
+        Column("sent_at", DateTime),
+    )
+    outbox.create(conn, checkfirst=True)
+    Index("ix_email_outbox_status_due", outbox.c.status, outbox.c.next_attempt_at).create(conn, checkfirst=True)
+
+
+@migration(7, "Per-hotel daily booking stats, backfilled from bookings")
+def _hotel_daily_stats(conn):
+    meta = MetaData()
+    meta.reflect(conn, only=["rooms", "bookings"])
+    rooms, bookings = meta.tables["rooms"], meta.tables["bookings"]
+    stats = Table(
+        "hotel_daily_stats", meta,
+        Column("hotel_id", Integer, primary_key=True),
+        Column("day", Date, primary_key=True),
+        Column("bookings", Integer, nullable=False),
+        Column("revenue", Float, nullable=False),
+        Column("cancellations", Integer, nullable=False),
+        Column("cancelled_revenue", Float, nullable=False),
+        Column("room_nights", Integer, nullable=False),
+    )
+    stats.create(conn, checkfirst=True)
+
+    counts = {}
+    rows = conn.execute(
+        select(rooms.c.hotel_id, bookings.c.check_in, bookings.c.check_out, bookings.c.total_price, bookings.c.status)
+        .join(rooms, rooms.c.id == bookings.c.room_id)
+    )
+    for hotel_id, check_in, check_out, total_price, status in rows:
+        if hotel_id is None or not check_in or not check_out:
+            continue
+        arrival = counts.setdefault((hotel_id, check_in), [0, 0.0, 0, 0.0, 0])
+        arrival[0] += 1
+        arrival[1] += total_price or 0.0
+        if status == "cancelled":
+            arrival[2] += 1
+            arrival[3] += total_price or 0.0
+            continue
+        for offset in range((check_out - check_in).days):
+            counts.setdefault((hotel_id, check_in + timedelta(days=offset)), [0, 0.0, 0, 0.0, 0])[4] += 1
+    if counts:
+        conn.execute(stats.delete())
+        conn.execute(stats.insert(), [
+            {"hotel_id": hotel_id, "day": day, "bookings": b, "revenue": r,
+             "cancellations": c, "cancelled_revenue": cr, "room_nights": n}
+            for (hotel_id, day), (b, r, c, cr, n) in counts.items()
+        ])
+
+
+@migration(8, "Hotel of each booking, kept when its room or hotel is deleted")
+def _bookings_hotel(conn):
+    if "hotel_id" not in {column["name"] for column in inspect(conn).get_columns("bookings")}:
+        conn.exec_driver_sql("ALTER TABLE bookings ADD COLUMN hotel_id INTEGER")
+    meta = MetaData()
+    meta.reflect(conn, only=["rooms", "bookings"])
+    rooms, bookings = meta.tables["rooms"], meta.tables["bookings"]
+    # Bookings whose room is already gone keep a null hotel_id
+    conn.execute(
+        bookings.update()
+        .where(bookings.c.hotel_id.is_(None))
+        .values(hotel_id=select(rooms.c.hotel_id).where(rooms.c.id == bookings.c.room_id).scalar_subquery())
+    )
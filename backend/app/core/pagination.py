@@ -0,0 +1,87 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by a unique, stable column (usually the primary key). The
+cursor is an opaque token holding the last key of the previous page, so
+fetching page N costs an index seek instead of scanning and discarding
+N * limit rows as OFFSET does. The token for the following page is returned
+in the X-Next-Cursor response header; it is absent on the last page.
+"""
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, Query, Response
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(value) -> str:
+    raw = json.dumps({"k": value}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: Optional[type] = None):
+    """The key in `cursor`: a scalar int or str, and of `key_type` when given (the key column's Python type)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode()))["k"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Anything else (lists, objects, null, bools) would reach SQL as a bind parameter
+    if isinstance(value, bool) or not isinstance(value, key_type or (int, str)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def _key_type(key) -> Optional[type]:
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        return None
+    return python_type if python_type in (int, str) else None
+
+
+class PageParams:
+    """Dependency collecting the `cursor` and `limit` query parameters."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+        limit: Optional[int] = Query(None, ge=1, description="Page size (capped by MAX_PAGE_SIZE)"),
+    ):
+        self.cursor = cursor
+        self.limit = min(limit or settings.DEFAULT_PAGE_SIZE, settings.MAX_PAGE_SIZE)
+
+
+def keyset(stmt, key, page: PageParams, descending: bool = False):
+    """Restrict a select to the rows after the page cursor, ordered by `key`, plus one look-ahead row."""
+    if page.cursor is not None:
+        last = decode_cursor(page.cursor, _key_type(key))
+        stmt = stmt.where(key < last if descending else key > last)
+    # One extra row tells us whether another page exists without a COUNT
+    return stmt.order_by(key.desc() if descending else key.asc()).limit(page.limit + 1)
+
+
+def finish_page(rows, key, page: PageParams, response: Response, key_of=None):
+    """Drop the look-ahead row and set X-Next-Cursor on `response` when more rows follow."""
+    rows = list(rows)
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last_row = rows[-1]
+        value = key_of(last_row) if key_of else getattr(last_row, key.key)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(value)
+    return rows
+
+
+async def paginate(db, stmt, key, page: PageParams, response: Response, descending: bool = False, key_of=None):
+    """
+    Execute `stmt` with keyset pagination on `key` and return one page.
+
+    Single-entity selects return ORM objects, others return rows. `key_of`
+    extracts the key value from a result (defaults to the attribute named
+    like the key column).
+    """
+    result = await db.execute(keyset(stmt, key, page, descending))
+    rows = result.scalars().all() if len(stmt.column_descriptions) == 1 else result.all()
+    return finish_page(rows, key, page, response, key_of)
@@ -1,3 +1,6 @@
 from .user import User
 from .hotel import Hotel, Room
 from .booking import Booking
+from .inventory import RoomInventory
+from .email import OutboundEmail
+from .stats import HotelDailyStats
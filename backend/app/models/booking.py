@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Serves the availability overlap check (see app/services/availability.py)
+        Index("ix_bookings_room_status_dates", "room_id", "status", "check_in", "check_out"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     room_id = Column(Integer, ForeignKey("rooms.id"))
+    # The room's hotel when booked; no foreign key, so daily stats keep it after the room or hotel is deleted
+    hotel_id = Column(Integer)
     check_in = Column(Date)
     check_out = Column(Date)
     total_price = Column(Float)
@@ -16,3 +22,6 @@ class Booking(Base):
     # Relationships
     user = relationship("User", backref="bookings")
     room = relationship("Room", backref="bookings")
+
+# Dashboards list the latest bookings for a set of rooms
+Index("ix_bookings_room_recent", Booking.room_id, Booking.id.desc())
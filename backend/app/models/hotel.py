@@ -20,7 +20,7 @@ class Room(Base):
     __tablename__ = "rooms"
 
     id = Column(Integer, primary_key=True, index=True)
-    hotel_id = Column(Integer, ForeignKey("hotels.id"))
+    hotel_id = Column(Integer, ForeignKey("hotels.id"), index=True)
     room_number = Column(String)
     type = Column(String) # Single, Double, Suite
     price = Column(Float)
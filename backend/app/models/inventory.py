@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from app.core.database import Base
+
+class RoomInventory(Base):
+    """Per-room, per-night ledger of confirmed bookings (kept in sync by app/services/inventory.py)."""
+    __tablename__ = "room_inventory"
+
+    room_id = Column(Integer, ForeignKey("rooms.id"), primary_key=True)
+    night = Column(Date, primary_key=True)
+    booked = Column(Integer, nullable=False, default=0)
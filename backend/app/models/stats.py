@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, Date
+from app.core.database import Base
+
+class HotelDailyStats(Base):
+    """
+    Per-hotel, per-day booking aggregates (kept in sync by app/services/stats.py).
+
+    bookings/revenue are attributed to the check-in day and count every booking
+    made, cancellations and cancelled_revenue are the part of those later
+    cancelled, and room_nights is the number of rooms occupied on that night by
+    bookings that are not cancelled. hotel_id is deliberately not a foreign key:
+    the history outlives a deleted hotel, as its bookings do.
+    """
+    __tablename__ = "hotel_daily_stats"
+
+    hotel_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    bookings = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    cancellations = Column(Integer, nullable=False, default=0)
+    cancelled_revenue = Column(Float, nullable=False, default=0.0)
+    room_nights = Column(Integer, nullable=False, default=0)
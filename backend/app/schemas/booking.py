@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from datetime import date
 from typing import Optional
 
@@ -18,3 +18,19 @@ class Booking(BookingBase):
 
     class Config:
         from_attributes = True
+
+BOOKING_STATUSES = ("confirmed", "pending", "cancelled", "completed")
+
+class BookingImport(BookingCreate):
+    """A booking loaded by the bulk importer (historical data, made on behalf of a guest)."""
+    user_id: int
+    total_price: Optional[float] = None  # default: room price x nights
+    status: str = "confirmed"
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.check_out <= self.check_in:
+            raise ValueError("check_out must be after check_in")
+        if self.status not in BOOKING_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(BOOKING_STATUSES)}")
+        return self
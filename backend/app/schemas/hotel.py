@@ -47,6 +47,35 @@ class HotelUpdate(BaseModel):
     image_url: Optional[str] = None
     manager_id: Optional[int] = None
 
+class HotelSummary(HotelBase):
+    """Listing view of a hotel: room aggregates instead of the full room list."""
+    id: int
+    manager_id: int
+    min_price: Optional[float] = None
+    room_count: int = 0
+    has_available_rooms: bool = False
+
+    class Config:
+        from_attributes = True
+
+class RoomTypeAvailability(BaseModel):
+    type: str
+    min_price: float
+    available_rooms: int
+    remaining_capacity: int
+
+class HotelAvailability(HotelBase):
+    """Search result: a hotel with what is still bookable for the requested stay."""
+    id: int
+    manager_id: int
+    min_price: float
+    available_rooms: int
+    remaining_capacity: int
+    room_types: List[RoomTypeAvailability] = []
+
+    class Config:
+        from_attributes = True
+
 class Hotel(HotelBase):
     id: int
     manager_id: int
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+class ReportRow(BaseModel):
+    hotel_id: int
+    hotel_name: str
+    available_room_nights: int
+    sold_room_nights: int
+    revenue: float
+    occupancy: float
+    adr: float
+    revpar: float
+
+class MonthlyOccupancy(ReportRow):
+    month: date
+
+class RoomTypePerformance(ReportRow):
+    room_type: Optional[str] = None
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import date
+
+class DailyStats(BaseModel):
+    day: date
+    bookings: int
+    cancellations: int
+    revenue: float
+    net_revenue: float
+    room_nights: int
+    occupancy: float
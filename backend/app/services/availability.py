@@ -0,0 +1,118 @@
+from datetime import date
+from typing import Iterable, Optional
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, Query
+from app.models.hotel import Hotel, Room
+from app.models.inventory import RoomInventory
+
+
+def available_rooms_query(db: Session, check_in: date, check_out: date) -> Query:
+    """
+    Rooms that still have a free slot on every night of [check_in, check_out).
+
+    Reads the per-night inventory ledger with one LEFT JOIN + GROUP BY, so the
+    cost depends on stay length rather than booking history, and callers can
+    narrow the result (by hotel, room id, flags) without one query per room.
+    """
+    busiest_night = func.coalesce(func.max(RoomInventory.booked), 0)
+    return (
+        db.query(Room)
+        .outerjoin(
+            RoomInventory,
+            and_(
+                RoomInventory.room_id == Room.id,
+                RoomInventory.night >= check_in,
+                RoomInventory.night < check_out,
+            ),
+        )
+        .group_by(Room.id)
+        .having(busiest_night < func.coalesce(Room.max_bookings, 1))
+    )
+
+
+def find_available_rooms(
+    db: Session,
+    check_in: date,
+    check_out: date,
+    hotel_id: Optional[int] = None,
+    room_ids: Optional[Iterable[int]] = None,
+    listed_only: bool = False,
+):
+    """Return the rooms (optionally limited to a hotel or id set) bookable for the dates."""
+    query = available_rooms_query(db, check_in, check_out)
+    if hotel_id is not None:
+        query = query.filter(Room.hotel_id == hotel_id)
+    if room_ids is not None:
+        query = query.filter(Room.id.in_(list(room_ids)))
+    if listed_only:
+        query = query.filter(Room.is_available == True)
+    return query.order_by(Room.id).all()
+
+
+def is_room_available(db: Session, room_id: int, check_in: date, check_out: date) -> bool:
+    """Check if a room is available for the given date range based on max_bookings limit."""
+    room = available_rooms_query(db, check_in, check_out).filter(Room.id == room_id).first()
+    return room is not None
+
+
+def available_room_slots(check_in: date, check_out: date, guests: int = 1, hotel_ids=None):
+    """
+    Subquery with one row per listed room that fits `guests` and has a free
+    slot on every night of the stay, including how many slots remain.
+    `hotel_ids` (a list or a select of ids) narrows the rooms considered.
+    """
+    free_slots = func.coalesce(Room.max_bookings, 1) - func.coalesce(func.max(RoomInventory.booked), 0)
+    query = (
+        select(
+            Room.id, Room.hotel_id, Room.type, Room.price, Room.capacity,
+            free_slots.label("free_slots"),
+        )
+        .outerjoin(
+            RoomInventory,
+            and_(
+                RoomInventory.room_id == Room.id,
+                RoomInventory.night >= check_in,
+                RoomInventory.night < check_out,
+            ),
+        )
+        .where(Room.is_available == True, Room.capacity >= guests)
+        .group_by(Room.id)
+        .having(free_slots > 0)
+    )
+    if hotel_ids is not None:
+        query = query.where(Room.hotel_id.in_(hotel_ids))
+    return query.subquery()
+
+
+def hotel_availability_select(slots):
+    """Hotels with at least one room in `slots`, aggregated per hotel (one row each)."""
+    return (
+        select(
+            Hotel.id,
+            Hotel.name,
+            Hotel.location,
+            Hotel.description,
+            Hotel.image_url,
+            Hotel.manager_id,
+            func.min(slots.c.price).label("min_price"),
+            func.count(slots.c.id).label("available_rooms"),
+            func.sum(slots.c.free_slots * slots.c.capacity).label("remaining_capacity"),
+        )
+        .join(slots, slots.c.hotel_id == Hotel.id)
+        .group_by(Hotel.id)
+    )
+
+
+def room_type_availability_select(slots):
+    """Per hotel and room type: cheapest price, free rooms and guest capacity left."""
+    return (
+        select(
+            slots.c.hotel_id,
+            slots.c.type,
+            func.min(slots.c.price).label("min_price"),
+            func.count(slots.c.id).label("available_rooms"),
+            func.sum(slots.c.free_slots * slots.c.capacity).label("remaining_capacity"),
+        )
+        .group_by(slots.c.hotel_id, slots.c.type)
+        .order_by(slots.c.hotel_id, func.min(slots.c.price))
+    )
@@ -0,0 +1,282 @@
+"""
+Bulk import of hotels, rooms and bookings from CSV or JSON Lines.
+
+Records are read one at a time from a text stream and handled in chunks:
+each chunk is validated with the same Pydantic schemas as the single-row
+endpoints, its foreign keys are checked with one query per referenced
+table, and the valid rows are written with one executemany INSERT and
+committed. A failing row never blocks the rest of its chunk; it is listed
+in the report with its 1-based record number and the reasons.
+
+Confirmed bookings take their nights in the inventory ledger as they are
+checked, like create_booking, so a row that would overbook a room is
+reported instead of imported, whether the conflict is with existing
+bookings or with earlier rows of the file.
+
+Chunks commit independently, so an import interrupted half-way keeps the
+chunks already written. Use dry_run to check a file without writing; each
+chunk is then rolled back, so conflicts between rows of different chunks
+are not detected.
+
+The daily stats of imported bookings are added chunk by chunk, for the
+hotels and days they touch. The search index is rebuilt once at the end of
+a hotel import.
+"""
+import csv
+import io
+import json
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.hotel import Hotel, Room
+from app.models.user import User
+from app.schemas.booking import BookingImport
+from app.schemas.hotel import HotelCreate, RoomCreate
+from app.services import inventory, stats
+from app.services.search import get_search_backend
+
+# kind -> (schema, model)
+KINDS = {
+    "hotels": (HotelCreate, Hotel),
+    "rooms": (RoomCreate, Room),
+    "bookings": (BookingImport, Booking),
+}
+FORMATS = ("csv", "jsonl")
+
+
+class ImportFormatError(ValueError):
+    """The input cannot be read as the declared format."""
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    dry_run: bool = False
+    total: int = 0
+    valid: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)  # first max_errors failures
+    hotel_ids: Set[int] = field(default_factory=set)  # hotels whose catalog changed
+
+    def add_error(self, row: int, messages: List[str], max_errors: int) -> None:
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append({"row": row, "errors": messages})
+
+    def as_dict(self) -> dict:
+        report = asdict(self)
+        del report["hotel_ids"]
+        report["errors"].sort(key=lambda error: error["row"])
+        report["errors_truncated"] = self.failed > len(self.errors)
+        return report
+
+
+def detect_format(filename: Optional[str], declared: Optional[str] = None) -> str:
+    fmt = (declared or (filename or "").rsplit(".", 1)[-1]).lower()
+    if fmt in ("ndjson", "json"):
+        fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise ImportFormatError(f"Unsupported format {fmt!r}; use one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (record number, record) pairs. CSV empty cells are dropped so that
+    schema defaults apply; a JSONL line that is not valid JSON is yielded
+    as an exception for the caller to report against that row.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames:
+            return
+        for number, row in enumerate(reader, start=1):
+            if None in row:
+                yield number, ValueError("more values than header columns")
+                continue
+            yield number, {k.strip(): v for k, v in row.items() if v is not None and v != ""}
+    else:
+        number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield number, ValueError(f"invalid JSON: {exc.msg}")
+
+
+def _messages(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in e['loc']) or 'record'}: {e['msg']}" for e in error.errors()]
+
+
+def _existing(db: Session, column, ids: Iterable[int], *criteria) -> Set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids), *criteria)))
+
+
+class BulkImporter:
+    """Imports one kind of record in validated, committed chunks and collects an ImportReport."""
+
+    def __init__(
+        self,
+        db: Session,
+        kind: str,
+        owner_id: Optional[int] = None,
+        chunk_size: int = settings.BULK_IMPORT_CHUNK_SIZE,
+        max_errors: int = settings.BULK_IMPORT_MAX_ERRORS,
+        dry_run: bool = False,
+    ):
+        """`owner_id` restricts room imports to hotels managed by that user."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown import kind {kind!r}; use one of: {', '.join(KINDS)}")
+        self.db = db
+        self.kind = kind
+        self.schema, self.model = KINDS[kind]
+        self.owner_id = owner_id
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.report = ImportReport(kind=kind, dry_run=dry_run)
+
+    def run(self, records: Iterable[Tuple[int, object]]) -> ImportReport:
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+        if self.report.inserted:
+            self._refresh_derived()
+        return self.report
+
+    def _import_chunk(self, chunk: List[Tuple[int, object]]) -> None:
+        report = self.report
+        report.total += len(chunk)
+        valid = []
+        for number, record in chunk:
+            if isinstance(record, Exception):
+                report.add_error(number, [str(record)], self.max_errors)
+                continue
+            try:
+                valid.append((number, self.schema.model_validate(record)))
+            except ValidationError as exc:
+                report.add_error(number, _messages(exc), self.max_errors)
+
+        rows = []
+        for number, item, problems in self._check_references(valid):
+            if problems:
+                report.add_error(number, problems, self.max_errors)
+            else:
+                rows.append(item)
+        report.valid += len(rows)
+        if report.dry_run:
+            self.db.rollback()  # undo the nights reserved while checking bookings
+        elif rows:
+            self.db.execute(insert(self.model), rows)
+            if self.kind == "bookings":
+                # Only the hotels and days these bookings touch, in the same transaction
+                stats.record_bookings(self.db, (
+                    (row["hotel_id"], row["check_in"], row["check_out"], row["total_price"], row["status"])
+                    for row in rows
+                ))
+            self.db.commit()
+            report.inserted += len(rows)
+
+    def _check_references(self, valid: List[Tuple[int, BaseModel]]):
+        """Yield (record number, row to insert, problems) with one lookup query per referenced table."""
+        if self.kind == "hotels":
+            managers = _existing(self.db, User.id, (item.manager_id for _, item in valid))
+            for number, item in valid:
+                problems = [] if item.manager_id in managers else [f"manager_id: user {item.manager_id} not found"]
+                yield number, item.model_dump(), problems
+
+        elif self.kind == "rooms":
+            criteria = [Hotel.manager_id == self.owner_id] if self.owner_id is not None else []
+            hotels = _existing(self.db, Hotel.id, (item.hotel_id for _, item in valid), *criteria)
+            for number, item in valid:
+                if item.hotel_id not in hotels:
+                    yield number, None, [f"hotel_id: hotel {item.hotel_id} not found or not authorized"]
+                    continue
+                self.report.hotel_ids.add(item.hotel_id)
+                yield number, item.model_dump(), []
+
+        else:
+            users = _existing(self.db, User.id, (item.user_id for _, item in valid))
+            room_ids = {item.room_id for _, item in valid}
+            rooms = {
+                room.id: room for room in
+                self.db.execute(
+                    select(Room.id, Room.hotel_id, Room.price, Room.max_bookings).where(Room.id.in_(room_ids))
+                )
+            } if room_ids else {}
+            checked = []
+            for number, item in valid:
+                problems = []
+                if item.user_id not in users:
+                    problems.append(f"user_id: user {item.user_id} not found")
+                if item.room_id not in rooms:
+                    problems.append(f"room_id: room {item.room_id} not found")
+                checked.append((number, item, problems))
+            # Confirmed stays hold nights in the inventory ledger, as create_booking's do
+            confirmed = [(n, item) for n, item, problems in checked if not problems and item.status == "confirmed"]
+            taken = inventory.reserve_stays(
+                self.db, [(rooms[item.room_id], item.check_in, item.check_out) for _, item in confirmed]
+            )
+            full = {n for (n, _), ok in zip(confirmed, taken) if not ok}
+            for number, item, problems in checked:
+                if number in full:
+                    problems = [f"room_id: room {item.room_id} is fully booked on a night of this stay"]
+                if problems:
+                    yield number, None, problems
+                    continue
+                room = rooms[item.room_id]
+                row = item.model_dump()
+                if row["total_price"] is None:
+                    row["total_price"] = room.price * (item.check_out - item.check_in).days
+                row["hotel_id"] = room.hotel_id
+                yield number, row, []
+
+    def _refresh_derived(self) -> None:
+        if self.kind == "hotels":
+            get_search_backend(self.db).rebuild(self.db)
+            self.db.commit()
+
+
+def import_stream(
+    db: Session, kind: str, stream: TextIO, fmt: str, owner_id: Optional[int] = None, dry_run: bool = False,
+) -> ImportReport:
+    """Import every record of `stream` (CSV with a header row, or JSON Lines)."""
+    importer = BulkImporter(db, kind, owner_id=owner_id, dry_run=dry_run)
+    try:
+        return importer.run(read_records(stream, fmt))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        db.rollback()
+        raise ImportFormatError(
+            f"Could not read the input after record {importer.report.total} "
+            f"({importer.report.inserted} rows already imported): {exc}"
+        )
+
+
+def import_upload(kind: str, upload: BinaryIO, fmt: str, owner_id: Optional[int] = None, dry_run: bool = False) -> dict:
+    """Import an uploaded file in its own session; blocking, run it in a worker thread."""
+    db = SessionLocal()
+    try:
+        stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        return import_stream(db, kind, stream, fmt, owner_id=owner_id, dry_run=dry_run)
+    finally:
+        db.close()
+
+
+def import_records(db: Session, kind: str, records: Iterable[dict], dry_run: bool = False) -> ImportReport:
+    """Import already-parsed records, e.g. from a script."""
+    return BulkImporter(db, kind, dry_run=dry_run).run(enumerate(records, start=1))
@@ -0,0 +1,26 @@
+from sqlalchemy import case, func, select
+from app.models.hotel import Hotel, Room
+
+
+def hotel_summaries_select():
+    """
+    Column-only select yielding one summary row per hotel (see schemas.hotel.HotelSummary).
+
+    Room aggregates are correlated subqueries answered from the rooms.hotel_id
+    index, so a page of hotels costs one statement proportional to the page
+    size and never loads Room objects.
+    """
+    def per_hotel(expr):
+        return select(expr).where(Room.hotel_id == Hotel.id).correlate(Hotel).scalar_subquery()
+
+    return select(
+        Hotel.id,
+        Hotel.name,
+        Hotel.location,
+        Hotel.description,
+        Hotel.image_url,
+        Hotel.manager_id,
+        per_hotel(func.min(Room.price)).label("min_price"),
+        per_hotel(func.count(Room.id)).label("room_count"),
+        func.coalesce(per_hotel(func.max(case((Room.is_available == True, 1), else_=0))), 0).label("has_available_rooms"),
+    )
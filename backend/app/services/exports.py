@@ -0,0 +1,134 @@
+"""
+Streaming exports of bookings and users as NDJSON or CSV.
+
+Rows come from a column select read through a server-side cursor in
+batches of settings.EXPORT_BATCH_SIZE (yield_per). Each batch is encoded and
+sent before the next one is fetched, so memory stays flat however large the
+table is, and no ORM objects are built.
+
+The response body is produced after the handler has returned, and FastAPI
+closes yield dependencies (get_db) before sending it, so the stream opens
+its own session. Permissions and filters are resolved by the handler first:
+a request that fails them never starts a stream.
+
+Dates filter by stay: a booking is exported when its nights overlap
+[start, end]. Users are exported when they have such a booking in the
+selected hotels; with no filter at all, every user is.
+
+A booking belongs to the hotel stored on it when it was made, or to its
+room's hotel for rows loaded without one: the attribution the daily stats
+use (app/services/stats.py), so a booking whose room was deleted is still
+exported with its hotel and under hotel filters.
+"""
+import csv
+import io
+from datetime import date
+from typing import AsyncIterator, Callable, List, Optional, Sequence
+import orjson
+from fastapi import HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from app.core import instrumentation
+from app.core.config import settings
+from app.models.booking import Booking
+from app.models.hotel import Room
+from app.models.user import User
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# The hotel a booking is attributed to (see the module docstring); needs an outer join to Room
+BOOKING_HOTEL = func.coalesce(Booking.hotel_id, Room.hotel_id)
+
+
+class ExportParams:
+    """Dependency collecting the export format, stay range and hotel filter."""
+
+    def __init__(
+        self,
+        format: str = Query("ndjson", description="ndjson or csv"),
+        start: Optional[date] = Query(None, description="Only stays with a night on or after this day"),
+        end: Optional[date] = Query(None, description="Only stays with a night on or before this day"),
+        hotel_id: Optional[int] = Query(None, description="Only this hotel"),
+    ):
+        if format not in FORMATS:
+            raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+        if start is not None and end is not None and start > end:
+            raise HTTPException(status_code=400, detail="Invalid date range")
+        self.format = format
+        self.start = start
+        self.end = end
+        self.hotel_id = hotel_id
+
+
+def _stay_conditions(params: ExportParams, hotel_ids) -> list:
+    conditions = []
+    if params.start is not None:
+        conditions.append(Booking.check_out > params.start)
+    if params.end is not None:
+        conditions.append(Booking.check_in <= params.end)
+    if hotel_ids is not None:
+        conditions.append(BOOKING_HOTEL.in_(hotel_ids))
+    return conditions
+
+
+def bookings_select(params: ExportParams, hotel_ids=None):
+    """Bookings with their hotel; `hotel_ids` (a list or a select of ids) limits the hotels, None for all."""
+    return (
+        select(Booking.id, Booking.user_id, Booking.room_id, BOOKING_HOTEL.label("hotel_id"), Booking.check_in,
+               Booking.check_out, Booking.total_price, Booking.status)
+        .outerjoin(Room, Room.id == Booking.room_id)
+        .where(*_stay_conditions(params, hotel_ids))
+        .order_by(Booking.id)
+    )
+
+
+def users_select(params: ExportParams, hotel_ids=None):
+    """Accounts, never the password hash; only guests of matching stays when filtered (see the module docstring)."""
+    stmt = select(User.id, User.email, User.full_name, User.role, User.is_active).order_by(User.id)
+    conditions = _stay_conditions(params, hotel_ids)
+    if conditions:
+        stays = select(Booking.id).where(Booking.user_id == User.id, *conditions)
+        if hotel_ids is not None:
+            stays = stays.outerjoin(Room, Room.id == Booking.room_id)
+        stmt = stmt.where(stays.exists())
+    return stmt
+
+
+# kind -> builds the select from the params and the hotel restriction
+KINDS = {
+    "bookings": bookings_select,
+    "users": users_select,
+}
+
+
+def _ndjson(fields: Sequence[str], rows) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(fields, row))) + b"\n" for row in rows)
+
+
+def _csv(fields: Sequence[str], rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_rows(stmt, fmt: str, session_factory: Callable, batch_size: int = None) -> AsyncIterator[bytes]:
+    """Encoded chunks of `stmt`'s rows, one per batch, preceded by the header row for CSV."""
+    fields: List[str] = [column.key for column in stmt.selected_columns]
+    encode = _csv if fmt == "csv" else _ndjson
+    if fmt == "csv":
+        yield _csv(fields, [fields])
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            with instrumentation.serializing():
+                chunk = encode(fields, partition)
+            yield chunk
+
+
+def export_response(kind: str, params: ExportParams, hotel_ids, session_factory: Callable) -> StreamingResponse:
+    stmt = KINDS[kind](params, hotel_ids)
+    filename = f"{kind}-{date.today():%Y%m%d}.{params.format}"
+    return StreamingResponse(
+        stream_rows(stmt, params.format, session_factory), media_type=FORMATS[params.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence
+from sqlalchemy import bindparam, select, tuple_
+from sqlalchemy.orm import Session
+from app.models.booking import Booking
+from app.models.inventory import RoomInventory
+
+# Ledger rows looked up per query by reserve_stays (two bound parameters each)
+_LOOKUP_BATCH = 5000
+
+
+def stay_nights(check_in: date, check_out: date):
+    """Nights occupied by a stay: check_in inclusive, check_out exclusive."""
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+def _insert_ignore(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(RoomInventory).on_conflict_do_nothing(index_elements=["room_id", "night"])
+
+
+def reserve_nights(db: Session, room, check_in: date, check_out: date) -> bool:
+    """
+    Take one slot on every night of the stay, or none at all.
+
+    Missing ledger rows are created first, then a single conditional UPDATE
+    increments the nights that still have room. If fewer rows than nights
+    were updated the room is full on at least one night and the caller must
+    roll back. The increment is done by the database, so two concurrent
+    requests cannot both take the last slot.
+    """
+    nights = stay_nights(check_in, check_out)
+    db.execute(_insert_ignore(db), [{"room_id": room.id, "night": n, "booked": 0} for n in nights])
+    return _take_nights(db, room, check_in, check_out) == len(nights)
+
+
+def _take_nights(db: Session, room, check_in: date, check_out: date) -> int:
+    return db.query(RoomInventory).filter(
+        RoomInventory.room_id == room.id,
+        RoomInventory.night >= check_in,
+        RoomInventory.night < check_out,
+        RoomInventory.booked < (room.max_bookings or 1),
+    ).update({RoomInventory.booked: RoomInventory.booked + 1}, synchronize_session=False)
+
+
+def reserve_stays(db: Session, stays: Sequence[tuple]) -> List[bool]:
+    """
+    Reserve many (room, check_in, check_out) stays at once, in order, for bulk
+    imports. A stay is taken only if every one of its nights still has room,
+    counting the stays taken before it; a full stay leaves the ledger
+    untouched, so the caller can carry on with its transaction instead of
+    rolling back. The ledger rows involved are locked and read, checked here,
+    and incremented with one executemany. Returns whether each stay was taken.
+    """
+    wanted = {(room.id, night) for room, check_in, check_out in stays for night in stay_nights(check_in, check_out)}
+    if not wanted:
+        return [False] * len(stays)
+    db.execute(_insert_ignore(db), [{"room_id": room_id, "night": night, "booked": 0} for room_id, night in wanted])
+    booked = {}
+    keys = list(wanted)
+    for i in range(0, len(keys), _LOOKUP_BATCH):
+        booked.update(((room_id, night), count) for room_id, night, count in db.execute(
+            select(RoomInventory.room_id, RoomInventory.night, RoomInventory.booked)
+            .where(tuple_(RoomInventory.room_id, RoomInventory.night).in_(keys[i:i + _LOOKUP_BATCH]))
+            .with_for_update()
+        ))
+
+    taken, added = [], {}
+    for room, check_in, check_out in stays:
+        nights = [(room.id, night) for night in stay_nights(check_in, check_out)]
+        free = bool(nights) and all(booked[key] < (room.max_bookings or 1) for key in nights)
+        if free:
+            for key in nights:
+                booked[key] += 1
+                added[key] = added.get(key, 0) + 1
+        taken.append(free)
+
+    if added:
+        table = RoomInventory.__table__
+        db.execute(
+            table.update()
+            .where(table.c.room_id == bindparam("key_room_id"), table.c.night == bindparam("key_night"))
+            .values(booked=table.c.booked + bindparam("add")),
+            [{"key_room_id": room_id, "key_night": night, "add": n} for (room_id, night), n in added.items()],
+        )
+    return taken
+
+
+def release_nights(db: Session, room_id: int, check_in: date, check_out: date) -> None:
+    """Give back the slots held by a cancelled booking."""
+    db.query(RoomInventory).filter(
+        RoomInventory.room_id == room_id,
+        RoomInventory.night >= check_in,
+        RoomInventory.night < check_out,
+        RoomInventory.booked > 0,
+    ).update({RoomInventory.booked: RoomInventory.booked - 1}, synchronize_session=False)
+
+
+def rebuild(db: Session, room_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the ledger from confirmed bookings (all rooms, or only `room_ids`).
+    Used after bulk loads that bypass reserve_nights. Returns the number of ledger rows.
+    """
+    ledger = db.query(RoomInventory)
+    bookings = db.query(Booking.room_id, Booking.check_in, Booking.check_out).filter(
+        Booking.status == "confirmed"
+    )
+    if room_ids is not None:
+        room_ids = list(room_ids)
+        ledger = ledger.filter(RoomInventory.room_id.in_(room_ids))
+        bookings = bookings.filter(Booking.room_id.in_(room_ids))
+    ledger.delete(synchronize_session=False)
+
+    counts = {}
+    for room_id, check_in, check_out in bookings.yield_per(5000):
+        if not check_in or not check_out:
+            continue
+        for night in stay_nights(check_in, check_out):
+            counts[(room_id, night)] = counts.get((room_id, night), 0) + 1
+
+    if counts:
+        db.execute(RoomInventory.__table__.insert(), [
+            {"room_id": room_id, "night": night, "booked": booked}
+            for (room_id, night), booked in counts.items()
+        ])
+    return len(counts)
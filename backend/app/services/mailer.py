@@ -0,0 +1,290 @@
+"""
+Outbound email: a transactional queue (the email_outbox table) and a
+background dispatcher that delivers it.
+
+Request handlers call queue_* with their own session, so the message is
+committed together with the change that triggered it and the request
+never waits on SMTP. Dispatcher workers claim due messages in batches,
+deliver each batch over one pooled, already-authenticated SMTP
+connection, and record the outcome. Failed messages are retried with
+exponential backoff. Permanent rejections, and messages that run out of
+attempts, are dead-lettered with status "dead".
+"""
+import logging
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy import and_, or_, select, update, func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.email import (
+    build_message, email_configured, render_welcome_email, render_password_reset_email,
+)
+from app.models.email import OutboundEmail, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(db: Session, to_email: str, subject: str, html_content: str) -> Optional[OutboundEmail]:
+    """Add a message to the outbox in the caller's transaction (no-op when SMTP is not configured)."""
+    if not email_configured():
+        return None
+    message = OutboundEmail(to_email=to_email, subject=subject, html=html_content, status=EmailStatus.PENDING)
+    db.add(message)
+    return message
+
+
+def queue_welcome_email(db: Session, to_email: str, full_name: str) -> Optional[OutboundEmail]:
+    return queue_email(db, to_email, *render_welcome_email(full_name))
+
+
+def queue_password_reset_email(db: Session, to_email: str, full_name: str, reset_token: str) -> Optional[OutboundEmail]:
+    return queue_email(db, to_email, *render_password_reset_email(full_name, reset_token))
+
+
+class SMTPConnection:
+    """One SMTP session, opened (STARTTLS + login) on first use and reused for later messages."""
+
+    def __init__(self, host: str, port: int, user: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = True, timeout: float = 30.0, idle_timeout: float = 60.0):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.starttls, self.timeout, self.idle_timeout = starttls, timeout, idle_timeout
+        self._smtp = None
+        self._last_used = 0.0
+        self.opened = 0
+
+    @classmethod
+    def from_settings(cls) -> "SMTPConnection":
+        return cls(
+            settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USER, settings.SMTP_PASSWORD,
+            starttls=settings.SMTP_STARTTLS, timeout=settings.SMTP_TIMEOUT_SECONDS,
+            idle_timeout=settings.SMTP_IDLE_SECONDS,
+        )
+
+    def _open(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.user:
+            smtp.login(self.user, self.password)
+        self.opened += 1
+        return smtp
+
+    def send(self, from_addr: str, to_addr: str, message: str) -> None:
+        # Servers drop idle sessions; reopen rather than fail the first message after a lull
+        if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+        if self._smtp is None:
+            self._smtp = self._open()
+        try:
+            self._smtp.sendmail(from_addr, [to_addr], message)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._smtp = self._open()
+            self._smtp.sendmail(from_addr, [to_addr], message)
+        self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """5xx replies about the message or recipient will not succeed on retry; everything else might."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False  # a configuration problem, not this message's fault
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class MailDispatcher:
+    """Worker threads that drain the outbox."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        connection_factory: Callable[[], SMTPConnection] = SMTPConnection.from_settings,
+        workers: int = settings.EMAIL_WORKERS,
+        batch_size: int = settings.EMAIL_BATCH_SIZE,
+        poll_interval: float = settings.EMAIL_POLL_SECONDS,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        retry_base: float = settings.EMAIL_RETRY_BASE_SECONDS,
+        retry_max: float = settings.EMAIL_RETRY_MAX_SECONDS,
+        claim_timeout: float = settings.EMAIL_CLAIM_TIMEOUT_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.connection_factory = connection_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.claim_timeout = claim_timeout
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+
+    # Lifecycle
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"mail-dispatcher-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self) -> None:
+        """Deliver newly committed messages now instead of at the next poll."""
+        self._wake.set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def _run(self) -> None:
+        connection = self.connection_factory()
+        try:
+            while not self._stop.is_set():
+                try:
+                    processed = self.run_once(connection)
+                except Exception:
+                    logger.exception("Mail dispatcher batch failed")
+                    processed = 0
+                if processed < self.batch_size:
+                    # Queue drained (or erroring): sleep until woken or the next poll
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+        finally:
+            connection.close()
+
+    # One batch
+
+    def run_once(self, connection: SMTPConnection) -> int:
+        """Claim up to batch_size due messages, send them over `connection` and record the results."""
+        db = self.session_factory()
+        try:
+            messages = self._claim(db)
+            if not messages:
+                return 0
+            sender = settings.EMAILS_FROM_EMAIL or settings.SMTP_USER or ""
+            now = datetime.utcnow()
+            for message in messages:
+                try:
+                    mime = build_message(message.to_email, message.subject, message.html)
+                    connection.send(sender, message.to_email, mime.as_string())
+                except Exception as error:
+                    # Caught per message, so the ones already sent are still recorded as sent when
+                    # a later one fails in any way. A rejected message leaves the session usable;
+                    # anything else may not
+                    if not isinstance(error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                        connection.close()
+                    if not isinstance(error, (smtplib.SMTPException, OSError)):
+                        logger.exception("Unexpected error sending email %s", message.id)
+                    self._failed(message, error, now)
+                else:
+                    message.status = EmailStatus.SENT
+                    message.sent_at = now
+                    message.last_error = None
+                    self._count("sent")
+                message.attempts += 1
+                message.claimed_by = None
+            db.commit()
+            return len(messages)
+        finally:
+            db.close()
+
+    def _claim(self, db: Session):
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        claimable = or_(
+            and_(OutboundEmail.status == EmailStatus.PENDING, OutboundEmail.next_attempt_at <= now),
+            # Messages of a worker that died mid-batch
+            and_(OutboundEmail.status == EmailStatus.SENDING,
+                 OutboundEmail.claimed_at < now - timedelta(seconds=self.claim_timeout)),
+        )
+        due = (
+            select(OutboundEmail.id).where(claimable)
+            .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+            .limit(self.batch_size)
+        )
+        # The conditional UPDATE is the claim: concurrent workers cannot both win a row
+        db.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.id.in_(due.scalar_subquery()), claimable)
+            .values(status=EmailStatus.SENDING, claimed_by=token, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return db.scalars(
+            select(OutboundEmail).where(OutboundEmail.claimed_by == token).order_by(OutboundEmail.id)
+        ).all()
+
+    def _failed(self, message: OutboundEmail, error: Exception, now: datetime) -> None:
+        message.last_error = f"{type(error).__name__}: {error}"[:1000]
+        if is_permanent_failure(error) or message.attempts + 1 >= self.max_attempts:
+            message.status = EmailStatus.DEAD
+            self._count("dead")
+            logger.warning("Dead-lettered email %s to %s: %s", message.id, message.to_email, message.last_error)
+        else:
+            delay = min(self.retry_max, self.retry_base * 2 ** message.attempts)
+            message.status = EmailStatus.PENDING
+            message.next_attempt_at = now + timedelta(seconds=delay)
+            self._count("retried")
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self, db: Session) -> dict:
+        by_status = dict(db.execute(
+            select(OutboundEmail.status, func.count(OutboundEmail.id)).group_by(OutboundEmail.status)
+        ).all())
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queued": {status: by_status.get(status, 0) for status in (
+                EmailStatus.PENDING, EmailStatus.SENDING, EmailStatus.SENT, EmailStatus.DEAD)},
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
+
+    @staticmethod
+    def requeue_dead(db: Session) -> int:
+        """Give dead-lettered messages a fresh set of attempts."""
+        result = db.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.status == EmailStatus.DEAD)
+            .values(status=EmailStatus.PENDING, attempts=0, next_attempt_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+mail_dispatcher = MailDispatcher()
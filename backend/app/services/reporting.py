@@ -0,0 +1,374 @@
+"""
+Analytics reports over a columnar snapshot of the booking data.
+
+A periodic export copies hotels, rooms and bookings from the live database
+into a DuckDB file (settings.REPORTS_PATH). Report queries run against that
+file with DuckDB's vectorized engine, so month-long scans over the whole
+booking history never compete with booking writes for the OLTP database.
+Reports are therefore as fresh as the last export; every response says
+when that was.
+
+The export is written to a uniquely named temporary file next to the
+snapshot and moved into place, so readers always see a complete snapshot
+and concurrent exports (several workers, or cron) never share a file.
+Guest data is not exported.
+
+The periodic export is off by default: run export_reports.py from cron,
+or set REPORTS_EXPORT_INTERVAL_SECONDS in a single process of a
+multi-worker deployment. Without any snapshot, the first report request
+exports one.
+
+DuckDB is listed in requirements.txt but imported lazily: without it the
+report endpoints answer 503 and the rest of the application still runs.
+"""
+import csv
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Sequence
+from fastapi import HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.database import engine as default_engine
+from app.models.booking import Booking
+from app.models.hotel import Hotel, Room
+
+logger = logging.getLogger(__name__)
+
+# Exported tables: name -> (source columns, DuckDB column types)
+EXPORTS = {
+    "hotels": (
+        (Hotel.id, Hotel.name, Hotel.location, Hotel.manager_id),
+        {"id": "INTEGER", "name": "VARCHAR", "location": "VARCHAR", "manager_id": "INTEGER"},
+    ),
+    "rooms": (
+        (Room.id, Room.hotel_id, Room.type, Room.price, Room.max_bookings),
+        {"id": "INTEGER", "hotel_id": "INTEGER", "type": "VARCHAR", "price": "DOUBLE", "max_bookings": "INTEGER"},
+    ),
+    "bookings": (
+        (Booking.id, Booking.room_id, Booking.check_in, Booking.check_out, Booking.total_price, Booking.status),
+        {"id": "INTEGER", "room_id": "INTEGER", "check_in": "DATE", "check_out": "DATE",
+         "total_price": "DOUBLE", "status": "VARCHAR"},
+    ),
+}
+
+
+class ReportingUnavailable(Exception):
+    """Reports cannot be served: duckdb is not installed, or there is no snapshot yet."""
+
+
+def _duckdb():
+    try:
+        import duckdb  # optional dependency, only needed for reports
+    except ImportError:
+        raise ReportingUnavailable("Reporting requires the duckdb package")
+    return duckdb
+
+
+def available() -> bool:
+    try:
+        _duckdb()
+    except ReportingUnavailable:
+        return False
+    return True
+
+
+# Export
+
+def export(source: Engine = default_engine, path: str = None, batch_size: int = None) -> dict:
+    """
+    Copy the reporting tables from `source` into a new DuckDB file at `path`.
+    Rows are streamed through a scratch CSV file that DuckDB bulk-loads.
+    Returns the row count per table.
+    """
+    duckdb = _duckdb()
+    path = path or settings.REPORTS_PATH
+    batch_size = batch_size or settings.REPORTS_EXPORT_BATCH_SIZE
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # A unique name in the snapshot's directory, so os.replace is atomic; DuckDB creates the file itself
+    fd, partial = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".partial", dir=directory)
+    os.close(fd)
+    os.remove(partial)
+
+    counts = {}
+    started = datetime.utcnow()
+    target = duckdb.connect(partial)
+    try:
+        with source.connect() as conn, tempfile.TemporaryDirectory(prefix="hms-export-") as scratch:
+            conn = conn.execution_options(yield_per=batch_size)
+            for table, (columns, types) in EXPORTS.items():
+                csv_path = os.path.join(scratch, f"{table}.csv")
+                rows = 0
+                with open(csv_path, "w", newline="") as f:
+                    writer = csv.writer(f)
+                    for partition in conn.execute(select(*columns)).partitions():
+                        writer.writerows(partition)
+                        rows += len(partition)
+                spec = ", ".join(f"'{name}': '{kind}'" for name, kind in types.items())
+                # Dialect spelled out: sniffing fails on an empty file
+                target.execute(
+                    f"CREATE TABLE {table} AS SELECT * FROM read_csv(?, header = false, auto_detect = false, "
+                    f"delim = ',', quote = '\"', escape = '\"', columns = {{{spec}}})",
+                    [csv_path],
+                )
+                counts[table] = rows
+        target.execute("CREATE TABLE export_info AS SELECT ?::TIMESTAMP AS exported_at", [started])
+    except BaseException:
+        target.close()
+        for leftover in (partial, partial + ".wal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    target.close()
+    os.replace(partial, path)
+    return counts
+
+
+# Queries
+
+class ReportStore:
+    """Read-only connection to the latest snapshot, reopened when a new export replaces the file."""
+
+    def __init__(self, path: str = None):
+        self.path = path or settings.REPORTS_PATH
+        self._conn = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise ReportingUnavailable("No report snapshot has been exported yet")
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if stamp != self._stamp:
+                if self._conn is not None:
+                    self._conn.close()
+                self._conn = _duckdb().connect(self.path, read_only=True)
+                self._stamp = stamp
+            # DuckDB connections are not shared between threads; each query gets its own cursor
+            return self._conn.cursor()
+
+    def query(self, sql: str, params: Sequence) -> List[dict]:
+        cursor = self._connection()
+        try:
+            result = cursor.execute(sql, list(params))
+            names = [d[0] for d in result.description]
+            return [dict(zip(names, row)) for row in result.fetchall()]
+        finally:
+            cursor.close()
+
+    def exported_at(self) -> Optional[datetime]:
+        try:
+            rows = self.query("SELECT exported_at FROM export_info", [])
+        except ReportingUnavailable:
+            return None
+        return rows[0]["exported_at"] if rows else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._stamp = None
+
+
+# Occupied nights of bookings that are not cancelled, each carrying its share of the price.
+# $1/$2: first and last night of the report, $3: hotel ids (NULL for all hotels)
+_NIGHTS = """
+    nights AS (
+        SELECT r.hotel_id, r.type AS room_type, s.night, s.rate
+        FROM (
+            SELECT room_id,
+                   CAST(unnest(generate_series(check_in, check_out - 1, INTERVAL 1 DAY)) AS DATE) AS night,
+                   total_price / date_diff('day', check_in, check_out) AS rate
+            FROM bookings
+            WHERE status <> 'cancelled' AND check_out > check_in AND check_out > $1 AND check_in <= $2
+        ) s
+        JOIN rooms r ON r.id = s.room_id
+        WHERE s.night BETWEEN $1 AND $2
+    ),
+    scoped_hotels AS (
+        SELECT id, name FROM hotels WHERE $3 IS NULL OR list_contains($3, id)
+    )
+"""
+
+OCCUPANCY_BY_MONTH = f"""
+    WITH {_NIGHTS},
+    months AS (
+        SELECT CAST(m AS DATE) AS month,
+               date_diff('day', greatest(CAST(m AS DATE), $1), least(CAST(last_day(m) AS DATE), $2)) + 1 AS days
+        FROM unnest(generate_series(date_trunc('month', $1), date_trunc('month', $2), INTERVAL 1 MONTH)) AS t(m)
+    ),
+    supply AS (
+        SELECT hotel_id, count(*) AS rooms FROM rooms GROUP BY hotel_id
+    ),
+    sold AS (
+        SELECT hotel_id, CAST(date_trunc('month', night) AS DATE) AS month, count(*) AS sold, sum(rate) AS revenue
+        FROM nights GROUP BY ALL
+    )
+    SELECT h.id AS hotel_id, h.name AS hotel_name, m.month,
+           s.rooms * m.days AS available_room_nights,
+           coalesce(d.sold, 0) AS sold_room_nights,
+           coalesce(d.revenue, 0) AS revenue
+    FROM scoped_hotels h
+    JOIN supply s ON s.hotel_id = h.id
+    CROSS JOIN months m
+    LEFT JOIN sold d ON d.hotel_id = h.id AND d.month = m.month
+    ORDER BY h.id, m.month
+"""
+
+ROOM_TYPE_PERFORMANCE = f"""
+    WITH {_NIGHTS},
+    supply AS (
+        SELECT hotel_id, type AS room_type, count(*) AS rooms FROM rooms GROUP BY ALL
+    ),
+    sold AS (
+        SELECT hotel_id, room_type, count(*) AS sold, sum(rate) AS revenue FROM nights GROUP BY ALL
+    )
+    SELECT h.id AS hotel_id, h.name AS hotel_name, s.room_type,
+           s.rooms * (date_diff('day', $1, $2) + 1) AS available_room_nights,
+           coalesce(d.sold, 0) AS sold_room_nights,
+           coalesce(d.revenue, 0) AS revenue
+    FROM scoped_hotels h
+    JOIN supply s ON s.hotel_id = h.id
+    LEFT JOIN sold d ON d.hotel_id = h.id AND d.room_type IS NOT DISTINCT FROM s.room_type
+    ORDER BY h.id, s.room_type
+"""
+
+
+def _with_ratios(rows: List[dict]) -> List[dict]:
+    """Occupancy = sold / available room-nights, ADR = revenue / sold, RevPAR = revenue / available."""
+    for row in rows:
+        available_nights, sold, revenue = row["available_room_nights"], row["sold_room_nights"], row["revenue"]
+        row["revenue"] = round(revenue, 2)
+        row["occupancy"] = round(sold / available_nights, 4) if available_nights else 0.0
+        row["adr"] = round(revenue / sold, 2) if sold else 0.0
+        row["revpar"] = round(revenue / available_nights, 2) if available_nights else 0.0
+    return rows
+
+
+def occupancy_by_month(start: date, end: date, hotel_ids: Optional[List[int]] = None, store=None) -> List[dict]:
+    """Per hotel and calendar month (clipped to [start, end]): room-nights, revenue, occupancy, ADR, RevPAR."""
+    return _with_ratios((store or report_store).query(OCCUPANCY_BY_MONTH, [start, end, hotel_ids]))
+
+
+def room_type_performance(start: date, end: date, hotel_ids: Optional[List[int]] = None, store=None) -> List[dict]:
+    """Per hotel and room type over [start, end]: room-nights, revenue, occupancy, ADR, RevPAR."""
+    return _with_ratios((store or report_store).query(ROOM_TYPE_PERFORMANCE, [start, end, hotel_ids]))
+
+
+# Request handling
+
+# Longest report range accepted by the endpoints
+MAX_REPORT_DAYS = 3660
+EXPORTED_AT_HEADER = "X-Report-Exported-At"
+
+
+class ReportParams:
+    """Dependency collecting the report range and hotel filter."""
+
+    def __init__(
+        self,
+        start: Optional[date] = Query(None, description="First day (default: 364 days before end)"),
+        end: Optional[date] = Query(None, description="Last day (default: today)"),
+        hotel_id: Optional[int] = Query(None, description="Only this hotel"),
+    ):
+        self.end = end or date.today()
+        self.start = start or self.end - timedelta(days=364)
+        self.hotel_id = hotel_id
+        if self.start > self.end or (self.end - self.start).days > MAX_REPORT_DAYS:
+            raise HTTPException(status_code=400, detail="Invalid date range")
+
+
+async def serve_report(report: Callable, params: ReportParams, hotel_ids: Optional[List[int]], response: Response):
+    """Run `report` off the event loop, exporting a first snapshot if needed; 503 when reporting is unavailable."""
+    if params.hotel_id is not None:
+        hotel_ids = [params.hotel_id] if hotel_ids is None or params.hotel_id in hotel_ids else []
+    try:
+        await run_in_threadpool(report_exporter.ensure_snapshot)
+        rows = await run_in_threadpool(report, params.start, params.end, hotel_ids)
+        exported_at = await run_in_threadpool(report_store.exported_at)
+    except ReportingUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    if exported_at is not None:
+        response.headers[EXPORTED_AT_HEADER] = exported_at.isoformat()
+    return rows
+
+
+# Periodic export
+
+class ReportExporter:
+    """Background thread that refreshes the snapshot every `interval` seconds."""
+
+    def __init__(self, interval: float = settings.REPORTS_EXPORT_INTERVAL_SECONDS):
+        self.interval = interval
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.last_counts = {}
+        self.last_duration = None
+        self.last_error = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="report-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def export_now(self) -> dict:
+        """Run an export (one at a time per process) and return the row counts."""
+        with self._lock:
+            started = time.perf_counter()
+            try:
+                self.last_counts = export()
+                self.last_error = None
+            except Exception as exc:
+                self.last_error = str(exc)
+                raise
+            finally:
+                self.last_duration = time.perf_counter() - started
+            return self.last_counts
+
+    def ensure_snapshot(self) -> None:
+        """Export once if no snapshot exists yet, so the first report request can be answered."""
+        _duckdb()
+        if not os.path.exists(report_store.path):
+            self.export_now()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.export_now()
+            except Exception:
+                logger.exception("Report export failed")
+            self._stop.wait(self.interval)
+
+    def status(self) -> dict:
+        return {
+            "available": available(),
+            "path": report_store.path,
+            "exported_at": report_store.exported_at() if available() else None,
+            "rows": self.last_counts,
+            "last_export_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "running": self._thread is not None,
+        }
+
+
+report_store = ReportStore()
+report_exporter = ReportExporter()
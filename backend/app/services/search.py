@@ -0,0 +1,109 @@
+"""
+Hotel search over name, location and description.
+
+Backends are pluggable (settings.SEARCH_BACKEND):
+  - "fts5": SQLite FTS5 index in the hotels_fts table (created by migration 5),
+    with prefix matching and bm25 relevance ranking
+  - "like": portable substring matching, used for other databases
+  - "auto": fts5 on SQLite, like elsewhere
+
+The index is not maintained by triggers; controllers that write hotels call
+index_hotel/remove_hotel, and bulk loaders call rebuild.
+"""
+import re
+from typing import Optional, Sequence
+from sqlalchemy import and_, or_, select, literal, literal_column, text, table, column
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.hotel import Hotel
+
+FTS_TABLE = "hotels_fts"
+SEARCH_COLUMNS = ("name", "location", "description")
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str):
+    return _TERM.findall(query.lower())
+
+
+class SearchBackend:
+    """Interface implemented by the search backends."""
+
+    def matches(self, query: str, columns: Optional[Sequence[str]] = None):
+        """Subquery of (hotel_id, rank) for hotels matching every term; lower rank is better."""
+        raise NotImplementedError
+
+    def index_hotel(self, db: Session, hotel: Hotel) -> None:
+        pass
+
+    def remove_hotel(self, db: Session, hotel_id: int) -> None:
+        pass
+
+    def rebuild(self, db: Session) -> None:
+        pass
+
+
+class FTS5SearchBackend(SearchBackend):
+    # bm25 column weights: a hit in the name outranks location, which outranks description
+    RANK = f"bm25({FTS_TABLE}, 10.0, 5.0, 1.0)"
+
+    def matches(self, query, columns=None):
+        terms = search_terms(query)
+        if not terms:
+            return None
+        # Every term is a prefix: "par lum" matches "Paris Lumiere"
+        expression = " ".join(f'"{term}"*' for term in terms)
+        if columns:
+            expression = "{%s} : (%s)" % (" ".join(columns), expression)
+        fts = table(FTS_TABLE, column("rowid"))
+        return (
+            select(fts.c.rowid.label("hotel_id"), literal_column(self.RANK).label("rank"))
+            .select_from(fts)
+            .where(text(f"{FTS_TABLE} MATCH :expression").bindparams(expression=expression))
+            .subquery()
+        )
+
+    def index_hotel(self, db, hotel):
+        self.remove_hotel(db, hotel.id)
+        db.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, name, location, description) "
+                 "VALUES (:id, :name, :location, :description)"),
+            {"id": hotel.id, "name": hotel.name or "", "location": hotel.location or "",
+             "description": hotel.description or ""},
+        )
+
+    def remove_hotel(self, db, hotel_id):
+        db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": hotel_id})
+
+    def rebuild(self, db):
+        db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        db.execute(text(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, location, description) "
+            "SELECT id, coalesce(name, ''), coalesce(location, ''), coalesce(description, '') FROM hotels"
+        ))
+
+
+class LikeSearchBackend(SearchBackend):
+    """Substring matching; needs no index maintenance and ranks all matches equally."""
+
+    def matches(self, query, columns=None):
+        terms = search_terms(query)
+        if not terms:
+            return None
+        fields = [getattr(Hotel, name) for name in (columns or SEARCH_COLUMNS)]
+        return (
+            select(Hotel.id.label("hotel_id"), literal(0).label("rank"))
+            .where(and_(*(or_(*(f.ilike(f"%{term}%") for f in fields)) for term in terms)))
+            .subquery()
+        )
+
+
+_BACKENDS = {"fts5": FTS5SearchBackend(), "like": LikeSearchBackend()}
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    name = settings.SEARCH_BACKEND
+    if name == "auto":
+        name = "fts5" if db.get_bind().dialect.name == "sqlite" else "like"
+    return _BACKENDS[name]
@@ -0,0 +1,217 @@
+"""
+Incrementally maintained per-hotel daily booking statistics.
+
+create_booking and cancel_booking adjust the hotel_daily_stats rows in the
+same transaction as the booking itself, and bulk imports add their rows
+with record_bookings, so dashboards and the stats endpoints aggregate a few
+rows per hotel and day instead of scanning the whole bookings table.
+`rebuild` recomputes everything from bookings, for data loaded outside the
+application and for verification (see rebuild_stats.py).
+
+Both paths count a booking under the hotel stored on it when it was made
+(Booking.hotel_id), not its room's current hotel, so deleting a room or a
+hotel neither changes the recomputation nor makes verify report a
+difference: the stats keep the history. Bookings loaded without a hotel_id
+fall back to their room's hotel, and are skipped once the room is gone.
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+from app.models.booking import Booking
+from app.models.hotel import Room
+from app.models.stats import HotelDailyStats
+from app.services.inventory import stay_nights
+
+# Counter columns, in the order compute() returns them
+FIELDS = ("bookings", "revenue", "cancellations", "cancelled_revenue", "room_nights")
+
+# Longest range the stats endpoints return in one response
+MAX_SERIES_DAYS = 731
+
+
+def _insert_ignore(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(HotelDailyStats).on_conflict_do_nothing(index_elements=["hotel_id", "day"])
+
+
+def _adjust(db: Session, hotel_id: int, check_in: date, check_out: date, sign: int, arrival: dict) -> None:
+    """
+    Create any missing rows for the stay, add `arrival` increments to the
+    check-in day and `sign` rooms to every night. Both are UPDATEs computed
+    by the database, so concurrent bookings never lose an increment.
+    """
+    nights = stay_nights(check_in, check_out)
+    db.execute(_insert_ignore(db), [
+        {"hotel_id": hotel_id, "day": d, "bookings": 0, "revenue": 0.0,
+         "cancellations": 0, "cancelled_revenue": 0.0, "room_nights": 0}
+        for d in nights or [check_in]
+    ])
+    db.query(HotelDailyStats).filter(
+        HotelDailyStats.hotel_id == hotel_id, HotelDailyStats.day == check_in,
+    ).update({getattr(HotelDailyStats, name): getattr(HotelDailyStats, name) + value
+              for name, value in arrival.items()}, synchronize_session=False)
+    if nights and sign:
+        db.query(HotelDailyStats).filter(
+            HotelDailyStats.hotel_id == hotel_id,
+            HotelDailyStats.day >= check_in,
+            HotelDailyStats.day < check_out,
+        ).update({HotelDailyStats.room_nights: HotelDailyStats.room_nights + sign}, synchronize_session=False)
+
+
+def record_booking(db: Session, hotel_id: int, check_in: date, check_out: date, total_price: Optional[float]) -> None:
+    """Count a new booking: an arrival with its price on check_in, an occupied room on each night."""
+    _adjust(db, hotel_id, check_in, check_out, 1, {"bookings": 1, "revenue": total_price or 0.0})
+
+
+def record_cancellation(db: Session, hotel_id: int, check_in: date, check_out: date, total_price: Optional[float]) -> None:
+    """Count a cancellation of a booking recorded earlier and free its nights."""
+    _adjust(db, hotel_id, check_in, check_out, -1, {"cancellations": 1, "cancelled_revenue": total_price or 0.0})
+
+
+def _accumulate(counts: dict, bookings: Iterable[tuple]) -> dict:
+    """Add (hotel_id, check_in, check_out, total_price, status) bookings to `counts`, keyed by (hotel_id, day)."""
+    for hotel_id, check_in, check_out, total_price, status in bookings:
+        if hotel_id is None or not check_in or not check_out:
+            continue
+        arrival = counts.setdefault((hotel_id, check_in), [0, 0.0, 0, 0.0, 0])
+        arrival[0] += 1
+        arrival[1] += total_price or 0.0
+        if status == "cancelled":
+            arrival[2] += 1
+            arrival[3] += total_price or 0.0
+            continue
+        for night in stay_nights(check_in, check_out):
+            counts.setdefault((hotel_id, night), [0, 0.0, 0, 0.0, 0])[4] += 1
+    return counts
+
+
+def record_bookings(db: Session, bookings: Iterable[tuple]) -> int:
+    """
+    Count bookings inserted in bulk, given as (hotel_id, check_in, check_out,
+    total_price, status): their figures are summed per hotel and day here and
+    added by the database, as record_booking does, so only those rows are
+    touched and concurrent updates are kept. Returns the number of rows.
+    """
+    counts = _accumulate({}, bookings)
+    if not counts:
+        return 0
+    db.execute(_insert_ignore(db), [
+        {"hotel_id": hotel_id, "day": day, **dict.fromkeys(FIELDS, 0)} for hotel_id, day in counts
+    ])
+    table = HotelDailyStats.__table__
+    db.execute(
+        table.update()
+        .where(table.c.hotel_id == bindparam("key_hotel_id"), table.c.day == bindparam("key_day"))
+        .values({name: table.c[name] + bindparam(f"add_{name}") for name in FIELDS}),
+        [
+            {"key_hotel_id": hotel_id, "key_day": day, **{f"add_{name}": v for name, v in zip(FIELDS, values)}}
+            for (hotel_id, day), values in counts.items()
+        ],
+    )
+    return len(counts)
+
+
+def compute(db: Session) -> Dict[Tuple[int, date], List[float]]:
+    """Stats recomputed from the bookings table, keyed by (hotel_id, day), values in FIELDS order."""
+    rows = db.execute(
+        select(func.coalesce(Booking.hotel_id, Room.hotel_id), Booking.check_in, Booking.check_out,
+               Booking.total_price, Booking.status)
+        .outerjoin(Room, Room.id == Booking.room_id)
+        .execution_options(yield_per=5000)
+    )
+    return _accumulate({}, rows)
+
+
+def rebuild(db: Session) -> int:
+    """Replace the stats table with a recomputation from bookings. Returns the number of rows."""
+    counts = compute(db)
+    db.query(HotelDailyStats).delete(synchronize_session=False)
+    if counts:
+        db.execute(HotelDailyStats.__table__.insert(), [
+            {"hotel_id": hotel_id, "day": day, **dict(zip(FIELDS, values))}
+            for (hotel_id, day), values in counts.items()
+        ])
+    return len(counts)
+
+
+def verify(db: Session, tolerance: float = 0.005) -> List[str]:
+    """Differences between the maintained table and a recomputation (empty when they agree)."""
+    expected = compute(db)
+    actual = {
+        (row.hotel_id, row.day): [getattr(row, name) for name in FIELDS]
+        for row in db.query(HotelDailyStats)
+    }
+    problems = []
+    for key in sorted(expected.keys() | actual.keys()):
+        want = expected.get(key, [0] * len(FIELDS))
+        have = actual.get(key, [0] * len(FIELDS))
+        for name, w, h in zip(FIELDS, want, have):
+            if abs((w or 0) - (h or 0)) > tolerance:
+                problems.append(f"hotel {key[0]} {key[1]} {name}: stored {h}, recomputed {w}")
+    return problems
+
+
+def totals_select(hotel_ids=None):
+    """Bookings made and their revenue, all time (optionally for a subquery of hotel ids)."""
+    stmt = select(
+        func.coalesce(func.sum(HotelDailyStats.bookings), 0).label("bookings"),
+        func.coalesce(func.sum(HotelDailyStats.revenue), 0).label("revenue"),
+    )
+    if hotel_ids is not None:
+        stmt = stmt.where(HotelDailyStats.hotel_id.in_(hotel_ids))
+    return stmt
+
+
+def occupied_rooms_select(day: date, hotel_ids=None):
+    """Rooms occupied on the night of `day`."""
+    stmt = select(func.coalesce(func.sum(HotelDailyStats.room_nights), 0)).where(HotelDailyStats.day == day)
+    if hotel_ids is not None:
+        stmt = stmt.where(HotelDailyStats.hotel_id.in_(hotel_ids))
+    return stmt
+
+
+def daily_series_select(start: date, end: date, hotel_ids=None):
+    """
+    One row per day in [start, end] that has activity: bookings, revenue and
+    cancellations by check-in day, and occupied room-nights, summed over hotels.
+    """
+    stmt = (
+        select(
+            HotelDailyStats.day,
+            func.sum(HotelDailyStats.bookings).label("bookings"),
+            func.sum(HotelDailyStats.revenue).label("revenue"),
+            func.sum(HotelDailyStats.cancellations).label("cancellations"),
+            func.sum(HotelDailyStats.cancelled_revenue).label("cancelled_revenue"),
+            func.sum(HotelDailyStats.room_nights).label("room_nights"),
+        )
+        .where(HotelDailyStats.day >= start, HotelDailyStats.day <= end)
+        .group_by(HotelDailyStats.day)
+        .order_by(HotelDailyStats.day)
+    )
+    if hotel_ids is not None:
+        stmt = stmt.where(HotelDailyStats.hotel_id.in_(hotel_ids))
+    return stmt
+
+
+def daily_series(db: Session, start: date, end: date, hotel_ids=None) -> List[dict]:
+    """daily_series_select with net figures and occupancy against the current room count."""
+    rooms = select(func.count(Room.id))
+    if hotel_ids is not None:
+        rooms = rooms.where(Room.hotel_id.in_(hotel_ids))
+    total_rooms = db.scalar(rooms) or 0
+    return [
+        {
+            "day": row.day,
+            "bookings": row.bookings,
+            "cancellations": row.cancellations,
+            "revenue": row.revenue,
+            "net_revenue": row.revenue - row.cancelled_revenue,
+            "room_nights": row.room_nights,
+            "occupancy": round(row.room_nights / total_rooms, 4) if total_rooms else 0.0,
+        }
+        for row in db.execute(daily_series_select(start, end, hotel_ids))
+    ]
@@ -0,0 +1,79 @@
+"""
+Cost of authenticating a request: user lookup on every call, the principal
+cache, and trusted token claims.
+
+Run from the backend directory:
+    python -m benchmarks.auth_cache_benchmark --requests 2000
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-auth-'), 'auth.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from app.controllers.auth import principal_claims  # noqa: E402
+from app.core.auth_cache import principal_cache  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, async_engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.common import QueryCounter, migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+USERS = 50
+
+
+def seed():
+    db = SessionLocal()
+    users = [User(email=f"user{i}@example.com", hashed_password="x", role="guest") for i in range(USERS)]
+    db.add_all(users)
+    db.commit()
+    tokens = [create_access_token(principal_claims(u)) for u in users]
+    db.close()
+    return tokens
+
+
+async def run(tokens, requests):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(requests):
+            response = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+            assert response.status_code == 200, response.text
+        return time.perf_counter() - start
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    tokens = seed()
+    rows = []
+    for label, max_size, trust_claims in (
+        ("lookup every request", 0, False),
+        ("principal cache", settings.AUTH_CACHE_MAX_SIZE, False),
+        ("trusted token claims", 0, True),
+    ):
+        principal_cache.max_size = max_size
+        principal_cache.clear()
+        principal_cache.hits = principal_cache.misses = 0
+        settings.AUTH_TRUST_TOKEN_CLAIMS = trust_claims
+        with QueryCounter(async_engine.sync_engine) as counter:
+            elapsed = asyncio.run(run(tokens, args.requests))
+        rows.append((
+            label, counter.count, f"{args.requests / elapsed:.0f}",
+            f"{principal_cache.stats()['hit_rate']:.2%}",
+        ))
+
+    report(f"GET /api/auth/me x {args.requests} ({USERS} users)", rows, ["mode", "queries", "req/s", "cache hit rate"])
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,109 @@
+"""
+Compare the ledger-backed availability query against the old per-room loop.
+
+Run from the backend directory:
+    python -m benchmarks.availability_benchmark --rooms 400 --bookings-per-room 50
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from app.models.user import User
+from app.models.hotel import Hotel, Room
+from app.models.booking import Booking
+from app.services.availability import find_available_rooms
+from app.services import inventory
+from benchmarks.common import make_engine, QueryCounter, report
+
+
+def seed(SessionLocal, rooms, bookings_per_room):
+    db = SessionLocal()
+    db.add(User(id=1, email="bench@example.com", hashed_password="x", full_name="Bench", role="guest"))
+    db.add(Hotel(id=1, name="Bench Hotel", location="Bench City", manager_id=1))
+    db.bulk_insert_mappings(Room, [
+        {"id": i, "hotel_id": 1, "room_number": str(i), "type": "Double", "price": 100.0,
+         "capacity": 2, "is_available": True, "max_bookings": 1}
+        for i in range(1, rooms + 1)
+    ])
+    start = date.today() - timedelta(days=365)
+    bookings = []
+    for room_id in range(1, rooms + 1):
+        for _ in range(bookings_per_room):
+            check_in = start + timedelta(days=random.randint(0, 500))
+            bookings.append({
+                "user_id": 1, "room_id": room_id, "check_in": check_in,
+                "check_out": check_in + timedelta(days=random.randint(1, 7)),
+                "total_price": 100.0, "status": random.choice(["confirmed", "confirmed", "cancelled"]),
+            })
+    db.bulk_insert_mappings(Booking, bookings)
+    inventory.rebuild(db)
+    db.commit()
+    db.close()
+
+
+def per_room_loop(db, hotel_id, check_in, check_out):
+    """The previous implementation: one Room lookup and one COUNT per room."""
+    result = []
+    for room in db.query(Room).filter(Room.hotel_id == hotel_id).all():
+        if not room.is_available:
+            continue
+        fresh = db.query(Room).filter(Room.id == room.id).first()
+        overlapping = db.query(Booking).filter(
+            Booking.room_id == room.id,
+            Booking.status == "confirmed",
+            Booking.check_in < check_out,
+            Booking.check_out > check_in,
+        ).count()
+        if overlapping < (fresh.max_bookings or 1):
+            result.append(room)
+    return result
+
+
+def measure(engine, SessionLocal, fn, repeat):
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        db = SessionLocal()
+        with QueryCounter(engine) as counter:
+            start = time.perf_counter()
+            rooms = fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = counter.count
+        db.close()
+    timings.sort()
+    return rooms, queries, timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=400)
+    parser.add_argument("--bookings-per-room", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(42)
+    engine, SessionLocal = make_engine()
+    seed(SessionLocal, args.rooms, args.bookings_per_room)
+
+    check_in = date.today() + timedelta(days=10)
+    check_out = check_in + timedelta(days=3)
+
+    loop_rooms, loop_queries, loop_ms = measure(
+        engine, SessionLocal, lambda db: per_room_loop(db, 1, check_in, check_out), args.repeat)
+    set_rooms, set_queries, set_ms = measure(
+        engine, SessionLocal,
+        lambda db: find_available_rooms(db, check_in, check_out, hotel_id=1, listed_only=True), args.repeat)
+
+    assert [r.id for r in loop_rooms] == [r.id for r in set_rooms], "engines disagree"
+    report(
+        f"Available rooms: {args.rooms} rooms, {args.rooms * args.bookings_per_room} bookings",
+        [
+            ("per-room loop", loop_queries, f"{loop_ms:.2f}", len(loop_rooms)),
+            ("inventory ledger", set_queries, f"{set_ms:.2f}", len(set_rooms)),
+        ],
+        ["strategy", "queries", "p50 ms", "rooms"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Measure booking lookups as the bookings table grows, with and without the
+composite indexes added by migration 2.
+
+Run from the backend directory:
+    python -m benchmarks.bookings_scaling_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from sqlalchemy import text
+from app.models.booking import Booking
+from benchmarks.common import make_engine, report
+
+INDEXES = ["ix_bookings_room_status_dates", "ix_bookings_user_id", "ix_bookings_room_recent"]
+ROOMS = 2000
+USERS = 5000
+
+QUERIES = {
+    "overlap count": (
+        "SELECT count(*) FROM bookings WHERE room_id = :room_id AND status = 'confirmed' "
+        "AND check_in < :check_out AND check_out > :check_in"
+    ),
+    "user bookings": "SELECT * FROM bookings WHERE user_id = :user_id",
+    "recent for rooms": (
+        "SELECT * FROM bookings WHERE room_id IN (:room_id, :room_id2, :room_id3) "
+        "ORDER BY id DESC LIMIT 5"
+    ),
+}
+
+
+def populate(engine, rows):
+    start = date.today() - timedelta(days=3 * 365)
+    batch = []
+    with engine.begin() as conn:
+        for _ in range(rows):
+            check_in = start + timedelta(days=random.randint(0, 3 * 365 + 180))
+            batch.append({
+                "user_id": random.randint(1, USERS),
+                "room_id": random.randint(1, ROOMS),
+                "check_in": check_in,
+                "check_out": check_in + timedelta(days=random.randint(1, 7)),
+                "total_price": 100.0,
+                "status": random.choice(["confirmed", "confirmed", "confirmed", "cancelled"]),
+            })
+            if len(batch) == 50000:
+                conn.execute(Booking.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Booking.__table__.insert(), batch)
+        conn.execute(text("ANALYZE"))
+
+
+def run_queries(engine, repeat):
+    timings = {}
+    check_in = date.today() + timedelta(days=30)
+    with engine.connect() as conn:
+        for label, sql in QUERIES.items():
+            samples = []
+            for _ in range(repeat):
+                params = {
+                    "room_id": random.randint(1, ROOMS), "room_id2": random.randint(1, ROOMS),
+                    "room_id3": random.randint(1, ROOMS), "user_id": random.randint(1, USERS),
+                    "check_in": check_in, "check_out": check_in + timedelta(days=3),
+                }
+                start = time.perf_counter()
+                conn.execute(text(sql), params).fetchall()
+                samples.append((time.perf_counter() - start) * 1000)
+            samples.sort()
+            timings[label] = samples[len(samples) // 2]
+    return timings
+
+
+def plan(engine, sql):
+    with engine.connect() as conn:
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), {
+            "room_id": 1, "room_id2": 2, "room_id3": 3, "user_id": 1,
+            "check_in": date.today(), "check_out": date.today(),
+        }).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(42)
+    rows = []
+    for size in args.sizes:
+        engine, _ = make_engine()
+        populate(engine, size)
+
+        indexed = run_queries(engine, args.repeat)
+        with engine.begin() as conn:
+            for name in INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        unindexed = run_queries(engine, args.repeat)
+
+        for label in QUERIES:
+            speedup = unindexed[label] / indexed[label] if indexed[label] else float("inf")
+            rows.append((size, label, f"{unindexed[label]:.3f}", f"{indexed[label]:.3f}", f"{speedup:.1f}x"))
+        engine.dispose()
+
+    report("Bookings table scaling (p50 per query)", rows,
+           ["rows", "query", "no index ms", "indexed ms", "speedup"])
+
+    engine, _ = make_engine()
+    print("\nIndexed query plans:")
+    for label, sql in QUERIES.items():
+        print(f"  {label}: {plan(engine, sql)}")
+
+
+if __name__ == "__main__":
+    main()
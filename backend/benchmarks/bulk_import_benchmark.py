@@ -0,0 +1,139 @@
+"""
+Loading rooms: one POST /api/manager/rooms per row (timed on a sample and
+extrapolated) versus the bulk importer, through POST /api/manager/import/rooms
+and called directly with a range of chunk sizes. The input has a share of
+invalid rows, which must all be reported and none inserted.
+
+Run from the backend directory:
+    python -m benchmarks.bulk_import_benchmark --rooms 100000 --sample 1000
+"""
+import os
+import tempfile
+
+_dir = tempfile.mkdtemp(prefix="hms-import-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_dir, 'import.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+os.environ.setdefault("REPORTS_EXPORT_INTERVAL_SECONDS", "0")
+
+import argparse  # noqa: E402
+import csv  # noqa: E402
+import random  # noqa: E402
+import resource  # noqa: E402
+import time  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+from app.controllers.auth import principal_claims  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.hotel import Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import bulk_import  # noqa: E402
+from benchmarks.common import migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+HOTELS = 1000
+INVALID_EVERY = 100  # every 100th row is broken in one of a few ways
+
+
+def seed():
+    db = SessionLocal()
+    manager = User(email="manager@example.com", hashed_password="x", role="manager")
+    db.add(manager)
+    db.commit()
+    records = ({"name": f"Hotel {h}", "location": f"City {h % 50}", "manager_id": manager.id} for h in range(HOTELS))
+    started = time.perf_counter()
+    result = bulk_import.import_records(db, "hotels", records)
+    hotel_seconds = time.perf_counter() - started
+    token = create_access_token(principal_claims(manager))
+    db.close()
+    return token, result.inserted, hotel_seconds
+
+
+def write_rooms(path, count):
+    """Rooms CSV; returns the number of rows that should be rejected."""
+    rng = random.Random(11)
+    invalid = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["hotel_id", "room_number", "type", "price", "capacity", "max_bookings"])
+        for i in range(count):
+            row = [rng.randint(1, HOTELS), str(100 + i % 400), rng.choice(["Single", "Double", "Suite"]),
+                   f"{rng.uniform(50, 400):.2f}", rng.randint(1, 4), 1]
+            if i % INVALID_EVERY == INVALID_EVERY - 1:
+                invalid += 1
+                column, value = rng.choice([(0, ""), (0, "n/a"), (0, HOTELS + 1), (3, "n/a")])
+                row[column] = value
+            writer.writerow(row)
+    return invalid
+
+
+def room_count():
+    db = SessionLocal()
+    try:
+        return db.query(Room).count()
+    finally:
+        db.close()
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--sample", type=int, default=1000, help="Rows sent through the per-row endpoint")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    token, hotels, hotel_seconds = seed()
+    auth = {"Authorization": f"Bearer {token}"}
+    path = os.path.join(_dir, "rooms.csv")
+    invalid = write_rooms(path, args.rooms)
+    client = TestClient(main.app)
+    rows, failures = [], []
+
+    rng = random.Random(5)
+    started = time.perf_counter()
+    for i in range(args.sample):
+        client.post("/api/manager/rooms", headers=auth, json={
+            "hotel_id": rng.randint(1, HOTELS), "room_number": str(i), "type": "Double", "price": 100.0,
+        })
+    per_row = (time.perf_counter() - started) / args.sample
+    rows.append(("POST /rooms per row", args.sample, f"{1 / per_row:.0f}", f"{per_row * args.rooms:.1f} (est.)", "-"))
+
+    def check(label, result, before):
+        added = room_count() - before
+        if result["failed"] != invalid or result["inserted"] != args.rooms - invalid or added != result["inserted"]:
+            failures.append(f"{label}: {result['inserted']} inserted, {result['failed']} failed, {added} added; "
+                            f"expected {args.rooms - invalid} and {invalid}")
+
+    before = room_count()
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        result = client.post("/api/manager/import/rooms", headers=auth, files={"file": ("rooms.csv", f)}).json()
+    elapsed = time.perf_counter() - started
+    check("bulk endpoint", result, before)
+    rows.append(("POST /import/rooms", args.rooms, f"{args.rooms / elapsed:.0f}", f"{elapsed:.1f}", result["failed"]))
+
+    for chunk_size in args.chunk_sizes:
+        before = room_count()
+        db = SessionLocal()
+        started = time.perf_counter()
+        with open(path, newline="") as f:
+            importer = bulk_import.BulkImporter(db, "rooms", chunk_size=chunk_size)
+            result = importer.run(bulk_import.read_records(f, "csv")).as_dict()
+        elapsed = time.perf_counter() - started
+        db.close()
+        check(f"chunk {chunk_size}", result, before)
+        rows.append((f"importer, chunk {chunk_size}", args.rooms, f"{args.rooms / elapsed:.0f}", f"{elapsed:.1f}",
+                     result["failed"]))
+
+    report(f"Loading {args.rooms} rooms ({invalid} invalid) into {hotels} hotels", rows,
+           ["method", "rows", "rows/s", "seconds", "rejected"])
+    print(f"\nHotels: {hotels} imported in {hotel_seconds:.2f}s (with search index rebuild)")
+    print(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_benchmark())
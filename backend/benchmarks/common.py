@@ -0,0 +1,63 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.core.database import configure_sqlite
+from app.core import migrations
+
+
+def make_engine(path=None, pragmas=None):
+    """
+    Create a throwaway SQLite database with the full schema, migrated to the latest version.
+    `pragmas` (see app.core.database.sqlite_pragmas) are applied to every connection.
+    """
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="hms-bench-"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if pragmas:
+        configure_sqlite(engine, pragmas)
+    migrations.upgrade(engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def migrate_app_database():
+    """Bring the application's own database (DATABASE_URL) to the latest schema, as migrate.py does."""
+    from app.core.database import engine
+    migrations.upgrade(engine)
+
+
+@contextmanager
+def timed(label, results):
+    start = time.perf_counter()
+    yield
+    results[label] = (time.perf_counter() - start) * 1000
+
+
+def report(title, rows, headers):
+    """Print a small fixed-width table."""
+    print(f"\n{title}")
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
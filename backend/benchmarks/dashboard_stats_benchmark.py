@@ -0,0 +1,151 @@
+"""
+Dashboard totals as booking history grows: aggregating the raw bookings
+table (the old dashboard queries) versus the hotel_daily_stats table.
+Also measures what maintaining the stats adds to a booking write, and
+checks that both sources report the same totals.
+
+Run from the backend directory:
+    python -m benchmarks.dashboard_stats_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from sqlalchemy import func, select
+from app.models.booking import Booking
+from app.models.hotel import Hotel, Room
+from app.services import inventory, stats
+from benchmarks.common import make_engine, report
+
+HOTELS = 200
+ROOMS_PER_HOTEL = 25
+MANAGERS = 20
+
+
+def populate(SessionLocal, size):
+    db = SessionLocal()
+    db.execute(Hotel.__table__.insert(), [
+        {"id": h, "name": f"Hotel {h}", "location": "Somewhere", "manager_id": h % MANAGERS + 1}
+        for h in range(1, HOTELS + 1)
+    ])
+    db.execute(Room.__table__.insert(), [
+        {"hotel_id": h, "room_number": str(r), "type": "Double", "price": 100.0, "capacity": 2,
+         "is_available": True, "max_bookings": 1}
+        for h in range(1, HOTELS + 1) for r in range(ROOMS_PER_HOTEL)
+    ])
+    start = date.today() - timedelta(days=2 * 365)
+    rng = random.Random(42)
+    batch = []
+    for _ in range(size):
+        check_in = start + timedelta(days=rng.randint(0, 2 * 365 + 90))
+        nights = rng.randint(1, 5)
+        batch.append({
+            "user_id": 1, "room_id": rng.randint(1, HOTELS * ROOMS_PER_HOTEL), "check_in": check_in,
+            "check_out": check_in + timedelta(days=nights), "total_price": 100.0 * nights,
+            "status": rng.choice(["confirmed", "confirmed", "confirmed", "cancelled"]),
+        })
+        if len(batch) == 50000:
+            db.execute(Booking.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(Booking.__table__.insert(), batch)
+    started = time.perf_counter()
+    rows = stats.rebuild(db)
+    rebuild_ms = (time.perf_counter() - started) * 1000
+    db.commit()
+    db.close()
+    return rows, rebuild_ms
+
+
+def raw_queries(manager_id):
+    hotel_ids = select(Hotel.id).where(Hotel.manager_id == manager_id)
+    room_ids = select(Room.id).where(Room.hotel_id.in_(hotel_ids))
+    today = date.today()
+    return {
+        "admin totals": select(func.count(Booking.id), func.coalesce(func.sum(Booking.total_price), 0)),
+        "manager totals": select(func.count(Booking.id), func.coalesce(func.sum(Booking.total_price), 0))
+        .where(Booking.room_id.in_(room_ids)),
+        "manager occupancy": select(func.count(Booking.id)).where(
+            Booking.room_id.in_(room_ids), Booking.status != "cancelled",
+            Booking.check_in <= today, Booking.check_out > today,
+        ),
+    }
+
+
+def stats_queries(manager_id):
+    hotel_ids = select(Hotel.id).where(Hotel.manager_id == manager_id)
+    return {
+        "admin totals": stats.totals_select(),
+        "manager totals": stats.totals_select(hotel_ids),
+        "manager occupancy": stats.occupied_rooms_select(date.today(), hotel_ids),
+    }
+
+
+def measure(SessionLocal, queries, repeat):
+    timings, results = {}, {}
+    db = SessionLocal()
+    for label, stmt in queries.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results[label] = tuple(db.execute(stmt).one())
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        timings[label] = samples[len(samples) // 2]
+    db.close()
+    return timings, results
+
+
+def booking_write_ms(SessionLocal, with_stats, count=300):
+    """Mean time of create_booking's transaction (ledger, booking row, optionally stats)."""
+    rng = random.Random(7 if with_stats else 8)  # different stays, so neither run hits full rooms
+    db = SessionLocal()
+    start = time.perf_counter()
+    for _ in range(count):
+        room = db.get(Room, rng.randint(1, HOTELS * ROOMS_PER_HOTEL))
+        check_in = date.today() + timedelta(days=rng.randint(400, 800))
+        check_out = check_in + timedelta(days=2)
+        if inventory.reserve_nights(db, room, check_in, check_out):
+            db.add(Booking(user_id=1, room_id=room.id, check_in=check_in, check_out=check_out,
+                           total_price=200.0, status="confirmed"))
+            if with_stats:
+                stats.record_booking(db, room.hotel_id, check_in, check_out, 200.0)
+            db.commit()
+        else:
+            db.rollback()
+    elapsed = (time.perf_counter() - start) * 1000 / count
+    db.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows, write_rows, mismatches = [], [], []
+    for size in args.sizes:
+        engine, SessionLocal = make_engine()
+        stat_rows, rebuild_ms = populate(SessionLocal, size)
+        raw, raw_results = measure(SessionLocal, raw_queries(1), args.repeat)
+        fast, fast_results = measure(SessionLocal, stats_queries(1), args.repeat)
+        for label in raw:
+            if any(abs(a - b) > 0.01 for a, b in zip(raw_results[label], fast_results[label])):
+                mismatches.append(f"{size} rows, {label}: bookings {raw_results[label]} vs stats {fast_results[label]}")
+            speedup = raw[label] / fast[label] if fast[label] else float("inf")
+            rows.append((size, label, f"{raw[label]:.2f}", f"{fast[label]:.3f}", f"{speedup:.0f}x"))
+        write_rows.append((size, stat_rows, f"{rebuild_ms:.0f}",
+                           f"{booking_write_ms(SessionLocal, False):.2f}", f"{booking_write_ms(SessionLocal, True):.2f}"))
+        engine.dispose()
+
+    report("Dashboard queries (p50)", rows, ["bookings", "query", "raw table ms", "stats table ms", "speedup"])
+    report("Maintenance cost", write_rows,
+           ["bookings", "stats rows", "rebuild ms", "booking write ms", "with stats ms"])
+    for mismatch in mismatches:
+        print(f"MISMATCH: {mismatch}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""
+Peak memory (RSS) and throughput of the booking export.
+
+A database with about --rows bookings is generated once. Every run then
+happens in a fresh interpreter, with a thread sampling its RSS while the
+export runs:
+    ndjson / csv   GET /api/admin/export/bookings, the streaming endpoint,
+                   over the whole table and over about a tenth of it
+    materialized   what an export had to do before: every booking loaded as
+                   an ORM object and dumped as one JSON array
+
+The request goes straight to the ASGI app, and the body chunks are counted
+and dropped as they arrive (httpx's ASGITransport would buffer the whole
+body in memory). RSS is the process's anonymous memory; "added" is its
+peak minus its value right before the request, and should stay flat with
+streaming as the row count grows. The last column also counts the pages of
+the database file that SQLite maps into memory (SQLITE_MMAP_SIZE), which
+the kernel can drop at any time.
+
+Run from the backend directory:
+    python -m benchmarks.export_benchmark --rows 1000000
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from sqlalchemy import select
+import generate_data
+from app.models.booking import Booking
+from benchmarks.common import report
+
+ROOMS_PER_HOTEL = 20
+BOOKINGS_PER_ROOM = 95  # per room and year of history at the default occupancy, future stays included
+
+# Runs in a fresh interpreter; prints one JSON line
+WORKER_SCRIPT = """
+import asyncio, json, sys, threading, time
+
+def rss_mib():
+    # (anonymous, total) resident MiB; the total includes SQLite's memory-mapped database file
+    with open("/proc/self/status") as f:
+        kib = {line.split(":")[0]: int(line.split()[1]) for line in f if line.startswith("Rss")}
+    return kib["RssAnon"] / 1024, sum(kib.values()) / 1024
+
+class Sampler(threading.Thread):
+    # Peak RSS while running; ru_maxrss would include start-up
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak_anon, self.peak_total = rss_mib()
+        self.done = threading.Event()
+    def run(self):
+        while not self.done.wait(0.005):
+            anon, total = rss_mib()
+            self.peak_anon, self.peak_total = max(self.peak_anon, anon), max(self.peak_total, total)
+
+mode, query = sys.argv[1], sys.argv[2]
+import orjson
+from sqlalchemy import select
+import main
+from app.core.database import AsyncSessionLocal
+from app.core.security import create_access_token
+from app.models.booking import Booking
+
+async def stream_export():
+    token = create_access_token({"sub": "admin@example.com", "uid": 1, "role": "admin"})
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/admin/export/bookings", "raw_path": b"/api/admin/export/bookings",
+        "query_string": query.encode(), "root_path": "", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+    }
+    requested, status, sent, rows = [], [], [0], [0]
+
+    async def receive():
+        if not requested:
+            requested.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            sent[0] += len(body)
+            rows[0] += body.count(b"\\n")
+
+    await main.app(scope, receive, send)
+    if status != [200]:
+        raise SystemExit(f"export answered {status}")
+    if query.startswith("format=csv"):
+        rows[0] -= 1  # header
+    return rows[0], sent[0]
+
+async def materialize():
+    async with AsyncSessionLocal() as db:
+        bookings = (await db.scalars(select(Booking).order_by(Booking.id))).all()
+        body = orjson.dumps([
+            {"id": b.id, "user_id": b.user_id, "room_id": b.room_id, "check_in": b.check_in,
+             "check_out": b.check_out, "total_price": b.total_price, "status": b.status}
+            for b in bookings
+        ])
+    return len(bookings), len(body)
+
+async def run():
+    await main.app.router.startup()
+    try:
+        before, _ = rss_mib()
+        sampler = Sampler()
+        sampler.start()
+        started = time.perf_counter()
+        rows, size = await (materialize() if mode == "materialized" else stream_export())
+        seconds = time.perf_counter() - started
+        sampler.done.set()
+        sampler.join()
+    finally:
+        await main.app.router.shutdown()
+    print(json.dumps({"rows": rows, "bytes": size, "seconds": seconds, "before_mib": before,
+                      "peak_mib": sampler.peak_anon, "peak_total_mib": sampler.peak_total}))
+
+asyncio.run(run())
+"""
+
+
+def run_worker(mode, query, database_url):
+    env = dict(os.environ, DATABASE_URL=database_url, REPORTS_EXPORT_INTERVAL_SECONDS="0", EMAIL_WORKERS="0",
+               REQUEST_LOG="false")
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.run([sys.executable, "-c", WORKER_SCRIPT, mode, query], cwd=cwd, env=env,
+                             capture_output=True, text=True)
+    if process.returncode:
+        raise RuntimeError(f"{mode} worker failed:\n{process.stderr}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Bookings to generate (approximately)")
+    parser.add_argument("--skip-materialized", action="store_true", help="Skip the load-everything baseline")
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-export-'), 'export.db')}"
+    target = generate_data.make_engine(url)
+    hotels = max(1, math.ceil(args.rows / (ROOMS_PER_HOTEL * BOOKINGS_PER_ROOM)))
+    summary = generate_data.generate(target, hotels=hotels, rooms_per_hotel=ROOMS_PER_HOTEL, users=10000, years=1)
+    # Stays up to this day are about a tenth of the table
+    with target.connect() as conn:
+        tenth = conn.scalar(select(Booking.check_in).order_by(Booking.check_in)
+                            .offset(summary["bookings"] // 10).limit(1))
+    target.dispose()
+    print(f"Generated {summary['bookings']} bookings in {summary['total_seconds']}s")
+
+    runs = [
+        ("ndjson, ~10%", "stream", f"format=ndjson&end={tenth}"),
+        ("ndjson, all", "stream", "format=ndjson"),
+        ("csv, all", "stream", "format=csv"),
+    ]
+    if not args.skip_materialized:
+        runs.append(("materialized, all", "materialized", ""))
+
+    rows = []
+    for label, mode, query in runs:
+        result = run_worker(mode, query, url)
+        rows.append((label, result["rows"], f"{result['bytes'] / 2**20:.0f}", f"{result['seconds']:.1f}",
+                     f"{result['rows'] / result['seconds']:,.0f}", f"{result['before_mib']:.0f}",
+                     f"{result['peak_mib']:.0f}", f"{result['peak_mib'] - result['before_mib']:.0f}",
+                     f"{result['peak_total_mib']:.0f}"))
+    report("Booking export, one fresh process per run (RSS: anonymous memory, sampled every 5 ms)", rows,
+           ["export", "rows", "MiB sent", "s", "rows/s", "RSS before MiB", "peak RSS MiB", "added MiB",
+            "peak incl. mmap MiB"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""
+Exports of bookings whose room was deleted.
+
+Deleting a room keeps its bookings (the ORM clears their room_id, the
+hotel stored on the booking stays), so the check books two rooms of one
+hotel, deletes one of them through the manager API, and then checks that
+every export still attributes the orphaned booking to its hotel, as the
+daily stats do:
+- the admin booking export lists both bookings, in NDJSON and CSV, the
+  orphaned one with a null room_id and its hotel_id
+- the admin user export, filtered by stay dates, lists the guest whose
+  only matching stay is the orphaned one
+- exports restricted to the hotel (the admin hotel_id filter, the
+  manager's exports) include the orphaned booking and its guest
+
+It exits with status 1 if any expectation fails.
+
+Run from the backend directory:
+    python -m benchmarks.export_check
+"""
+import os
+import sys
+import tempfile
+
+_dir = tempfile.mkdtemp(prefix="hms-export-check-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_dir, 'export.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+os.environ["REPORTS_EXPORT_INTERVAL_SECONDS"] = "0"
+
+import csv  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+from datetime import date, timedelta  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+from app.controllers.auth import principal_claims  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.booking import Booking  # noqa: E402
+from app.models.hotel import Hotel, Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.common import migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+CHECK_IN = date.today() + timedelta(days=10)
+
+
+def seed():
+    """Admin, manager, and two guests booking one room each of a hotel; returns tokens, hotel, rooms, second guest."""
+    db = SessionLocal()
+    admin = User(email="admin@example.com", hashed_password="x", role="admin")
+    manager = User(email="manager@example.com", hashed_password="x", role="manager")
+    guests = [User(email=f"guest{i}@example.com", hashed_password="x", role="guest") for i in (1, 2)]
+    db.add_all([admin, manager, *guests])
+    db.flush()
+    hotel = Hotel(name="Harbour Hotel", location="Lisbon", manager_id=manager.id)
+    hotel.rooms = [Room(room_number=str(100 + r), type="Double", price=100.0, capacity=2) for r in range(2)]
+    db.add(hotel)
+    db.flush()
+    for guest, room in zip(guests, hotel.rooms):
+        db.add(Booking(user_id=guest.id, room_id=room.id, hotel_id=hotel.id, check_in=CHECK_IN,
+                       check_out=CHECK_IN + timedelta(days=2), total_price=200.0, status="confirmed"))
+    db.commit()
+    tokens = {user.role: create_access_token(principal_claims(user)) for user in (admin, manager)}
+    seeded = tokens, hotel.id, [room.id for room in hotel.rooms], guests[1].id
+    db.close()
+    return seeded
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def main_check():
+    tokens, hotel_id, (kept_room, deleted_room), orphan_guest = seed()
+    admin = {"Authorization": f"Bearer {tokens['admin']}"}
+    manager = {"Authorization": f"Bearer {tokens['manager']}"}
+    client = TestClient(main.app)
+    failures = []
+
+    response = client.delete(f"/api/manager/rooms/{deleted_room}", headers=manager)
+    if response.status_code != 200:
+        print(f"FAIL: deleting the room answered {response.status_code}")
+        return 1
+
+    stays = f"start={CHECK_IN}&end={CHECK_IN}"
+    bookings = ndjson(client.get("/api/admin/export/bookings", headers=admin))
+    rows = list(csv.DictReader(io.StringIO(client.get("/api/admin/export/bookings?format=csv", headers=admin).text)))
+    users = ndjson(client.get(f"/api/admin/export/users?{stays}", headers=admin))
+    by_hotel = ndjson(client.get(f"/api/admin/export/bookings?hotel_id={hotel_id}", headers=admin))
+    managed = ndjson(client.get("/api/manager/export/bookings", headers=manager))
+    managed_users = ndjson(client.get(f"/api/manager/export/users?{stays}", headers=manager))
+
+    orphaned = [b for b in bookings if b["user_id"] == orphan_guest]
+    if len(bookings) != 2 or len(orphaned) != 1 or orphaned[0]["hotel_id"] != hotel_id:
+        failures.append("the admin NDJSON export lost the booking of the deleted room or its hotel")
+    if sorted((row["user_id"], row["hotel_id"]) for row in rows) != sorted(
+            (str(b["user_id"]), str(hotel_id)) for b in bookings):
+        failures.append("the admin CSV export lost the booking of the deleted room or its hotel")
+    if orphan_guest not in {user["id"] for user in users}:
+        failures.append("the admin user export lost the guest of the deleted room")
+    if sorted(b["room_id"] or 0 for b in by_hotel) != [0, kept_room] or by_hotel != managed:
+        failures.append("an export restricted to the hotel lost the booking of the deleted room")
+    if orphan_guest not in {user["id"] for user in managed_users}:
+        failures.append("the manager user export lost the guest of the deleted room")
+
+    report("Rows exported after deleting one of two booked rooms", [
+        ("admin bookings, ndjson", len(bookings)),
+        ("admin bookings, csv", len(rows)),
+        ("admin users, by stay", len(users)),
+        ("admin bookings, hotel_id", len(by_hotel)),
+        ("manager bookings", len(managed)),
+        ("manager users, by stay", len(managed_users)),
+    ], ["export", "rows"])
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
@@ -0,0 +1,223 @@
+"""
+Throughput and latency of a running server under concurrent mixed traffic.
+
+Each --app-dir is a backend checkout. It gets its own seeded database and
+its own uvicorn process, and then receives the same traffic mix: hotel
+listing, hotel detail, available rooms, /auth/me, booking history and new
+bookings. To compare the synchronous request path with the async one, check
+out an older revision next to this tree:
+
+    git worktree add /tmp/hms-sync <sync-revision>
+    python -m benchmarks.load_test --app-dir /tmp/hms-sync/backend . --concurrency 8 32 --duration 15
+
+Run from the backend directory. A 400 from a booking that clashes with
+another booking counts as a served request. Errors means 5xx responses
+and transport failures.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+import httpx
+from jose import jwt
+from app.core.config import settings
+from benchmarks.common import report
+
+# Runs inside the target checkout so it seeds whatever schema that revision defines
+SEED_SCRIPT = """
+import sys
+from datetime import date, timedelta
+import main  # older revisions create the schema on import
+from sqlalchemy import MetaData
+from app.core.database import SessionLocal, engine
+try:
+    from app.core import migrations
+    migrations.upgrade(engine)
+except ImportError:
+    pass
+
+hotels, rooms_per_hotel, users = (int(a) for a in sys.argv[1:4])
+db = SessionLocal()
+meta = MetaData()
+meta.reflect(db.get_bind(), only=["users", "hotels", "rooms", "bookings"])
+t = meta.tables
+db.execute(t["users"].insert(), [
+    {"id": i, "email": f"load{i}@loadtest.example.com", "hashed_password": "x", "role": "guest", "is_active": True}
+    for i in range(1, users + 1)
+])
+db.execute(t["hotels"].insert(), [
+    {"id": h, "name": f"Hotel {h}", "location": f"City {h % 50}", "description": "Load test", "manager_id": 1}
+    for h in range(1, hotels + 1)
+])
+extra = {"max_bookings": 2} if "max_bookings" in t["rooms"].c else {}
+db.execute(t["rooms"].insert(), [
+    {"hotel_id": h, "room_number": str(100 + r), "type": "Double", "price": 80.0 + r,
+     "capacity": 2, "is_available": True, **extra}
+    for h in range(1, hotels + 1) for r in range(rooms_per_hotel)
+])
+start = date.today()
+db.execute(t["bookings"].insert(), [
+    {"user_id": 1 + i % users, "room_id": 1 + i % (hotels * rooms_per_hotel),
+     "check_in": start + timedelta(days=i % 90), "check_out": start + timedelta(days=i % 90 + 2),
+     "total_price": 160.0, "status": "confirmed"}
+    for i in range(hotels * rooms_per_hotel * 3)
+])
+# Derived structures only exist on newer revisions
+try:
+    from app.services import inventory
+    inventory.rebuild(db)
+except ImportError:
+    pass
+try:
+    from app.services.search import get_search_backend
+    get_search_backend(db).rebuild(db)
+except ImportError:
+    pass
+db.commit()
+db.close()
+"""
+
+# (weight, name) of each request type in the traffic mix
+MIX = [
+    (30, "hotels"),
+    (20, "hotel detail"),
+    (20, "available rooms"),
+    (10, "me"),
+    (10, "my bookings"),
+    (10, "book"),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def token(user_id):
+    expire = datetime.utcnow() + timedelta(hours=1)
+    return jwt.encode({"sub": f"load{user_id}@loadtest.example.com", "exp": expire}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def start_server(app_dir, args):
+    """Seed a fresh database for `app_dir` and start uvicorn on it; returns (process, base_url)."""
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-load-'), 'load.db')}"
+    env.setdefault("REQUEST_LOG", "false")
+    subprocess.run(
+        [sys.executable, "-c", SEED_SCRIPT, str(args.hotels), str(args.rooms_per_hotel), str(args.users)],
+        cwd=app_dir, env=env, check=True,
+    )
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return server, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"server in {app_dir} did not start")
+
+
+def make_request(rng, args, tokens):
+    """Pick one request from the mix: (method, path, headers, json body)."""
+    name = rng.choices([n for _, n in MIX], weights=[w for w, _ in MIX])[0]
+    user_id = rng.randint(1, args.users)
+    auth = {"Authorization": f"Bearer {tokens[user_id]}"}
+    hotel_id = rng.randint(1, args.hotels)
+    check_in = date.today() + timedelta(days=rng.randint(1, 120))
+    check_out = check_in + timedelta(days=rng.randint(1, 4))
+    if name == "hotels":
+        return "GET", "/api/public/hotels?limit=20", {}, None
+    if name == "hotel detail":
+        return "GET", f"/api/public/hotels/{hotel_id}", {}, None
+    if name == "available rooms":
+        return "GET", f"/api/public/hotels/{hotel_id}/available-rooms?check_in={check_in}&check_out={check_out}", {}, None
+    if name == "me":
+        return "GET", "/api/auth/me", auth, None
+    if name == "my bookings":
+        return "GET", "/api/public/bookings?limit=20", auth, None
+    room_id = rng.randint(1, args.hotels * args.rooms_per_hotel)
+    body = {"room_id": room_id, "check_in": str(check_in), "check_out": str(check_out)}
+    return "POST", "/api/public/bookings", auth, body
+
+
+async def drive(base_url, args, concurrency, tokens):
+    """Keep `concurrency` requests in flight for args.duration seconds."""
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + args.duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(seed):
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                method, path, headers, body = make_request(rng, args, tokens)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, headers=headers, json=body)
+                    failed = response.status_code >= 500
+                except httpx.TransportError:
+                    failed = True
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += failed
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", nargs="+", default=["."], help="backend checkouts to compare")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument("--rooms-per-hotel", type=int, default=20)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = {i: token(i) for i in range(1, args.users + 1)}
+    rows = []
+    for app_dir in args.app_dir:
+        server, base_url = start_server(os.path.abspath(app_dir), args)
+        try:
+            for concurrency in args.concurrency:
+                rate, latencies, errors = asyncio.run(drive(base_url, args, concurrency, tokens))
+                rows.append((
+                    app_dir, concurrency, len(latencies), f"{rate:.1f}", f"{percentile(latencies, 50):.1f}",
+                    f"{percentile(latencies, 95):.1f}", f"{percentile(latencies, 99):.1f}", errors,
+                ))
+        finally:
+            server.terminate()
+            server.wait()
+
+    report(
+        f"Mixed traffic, {args.duration:.0f}s per level ({args.hotels} hotels x {args.rooms_per_hotel} rooms)",
+        rows,
+        ["app", "concurrency", "requests", "req/s", "p50 ms", "p95 ms", "p99 ms", "errors"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Login throughput at several concurrency levels, with the latency of an
+unrelated endpoint (/health) measured during the burst.
+
+Run from the backend directory:
+    python -m benchmarks.login_benchmark --logins 200 --concurrency 1 4 16 64
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-login-'), 'login.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.common import migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+USERS = 50
+
+
+def seed():
+    db = SessionLocal()
+    hashed = get_password_hash("password")
+    db.add_all(User(email=f"user{i}@bench.test", hashed_password=hashed, role="guest") for i in range(USERS))
+    db.commit()
+    db.close()
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+async def burst(client, logins, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    latencies, statuses, probe = [], [], []
+    done = asyncio.Event()
+
+    async def login(i):
+        async with gate:
+            start = time.perf_counter()
+            response = await client.post("/api/auth/login", data={
+                "username": f"user{i % USERS}@bench.test", "password": "password"})
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses.append(response.status_code)
+
+    async def health_probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            probe.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.005)
+
+    prober = asyncio.create_task(health_probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return elapsed, latencies, statuses, probe
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=main.app)
+    rows = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for concurrency in args.concurrency:
+            elapsed, latencies, statuses, probe = await burst(client, args.logins, concurrency)
+            ok = statuses.count(200)
+            rows.append((
+                concurrency, f"{ok / elapsed:.1f}", f"{percentile(latencies, 50):.1f}",
+                f"{percentile(latencies, 95):.1f}", statuses.count(503), f"{percentile(probe, 95):.1f}",
+            ))
+    return rows
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    seed()
+    rows = asyncio.run(run(args))
+    report(
+        f"Login burst ({args.logins} logins, {settings.PASSWORD_HASH_WORKERS} hash workers, "
+        f"argon2 t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST} p={settings.ARGON2_PARALLELISM})",
+        rows,
+        ["concurrency", "logins/s", "p50 ms", "p95 ms", "503s", "/health p95 ms"],
+    )
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,114 @@
+"""
+Outbound mail throughput against a local aiosmtpd server: one connection
+per message (the old send_email pattern) versus the queue dispatcher with
+pooled connections. --handshake-ms adds a delay to each EHLO, to stand in
+for the TLS and AUTH round-trips of a remote relay.
+
+Needs the aiosmtpd package (pip install aiosmtpd). Run from the backend directory:
+    python -m benchmarks.mail_benchmark --messages 500 --workers 1 4 --handshake-ms 50
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import func, select
+from app.core.email import build_message, render_welcome_email
+from app.models.email import OutboundEmail, EmailStatus
+from app.services.mailer import MailDispatcher, SMTPConnection
+from benchmarks.common import make_engine, report
+from benchmarks.load_test import free_port
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:  # optional, only needed here
+    Controller = None
+
+
+class CountingHandler:
+    def __init__(self, handshake_delay: float):
+        self.handshake_delay = handshake_delay
+        self.received = 0
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 Message accepted for delivery"
+
+
+def connect(port):
+    return SMTPConnection("127.0.0.1", port, starttls=False)
+
+
+def per_message(port, messages):
+    subject, html = render_welcome_email("Bench Guest")
+    start = time.perf_counter()
+    for i in range(messages):
+        connection = connect(port)
+        to_email = f"guest{i}@example.com"
+        connection.send("hotel@example.com", to_email, build_message(to_email, subject, html).as_string())
+        connection.close()
+    return time.perf_counter() - start
+
+
+def dispatched(port, messages, workers, batch_size):
+    engine, SessionLocal = make_engine()
+    subject, html = render_welcome_email("Bench Guest")
+    with engine.begin() as conn:
+        conn.execute(OutboundEmail.__table__.insert(), [
+            {"to_email": f"guest{i}@example.com", "subject": subject, "html": html,
+             "status": EmailStatus.PENDING, "attempts": 0}
+            for i in range(messages)
+        ])
+    dispatcher = MailDispatcher(
+        session_factory=SessionLocal, connection_factory=lambda: connect(port),
+        workers=workers, batch_size=batch_size, poll_interval=0.05,
+    )
+    start = time.perf_counter()
+    dispatcher.start()
+    while dispatcher.sent + dispatcher.dead < messages:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    dispatcher.stop()
+    with engine.connect() as conn:
+        sent = conn.execute(select(func.count()).where(OutboundEmail.status == EmailStatus.SENT)).scalar()
+    assert sent == messages, f"only {sent} of {messages} sent"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    if Controller is None:
+        raise SystemExit("aiosmtpd is not installed: pip install aiosmtpd")
+
+    handler = CountingHandler(args.handshake_ms / 1000)
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    rows = []
+    try:
+        for label, run in [("connection per message", lambda: per_message(port, args.messages))] + [
+            (f"dispatcher, {w} worker(s)", lambda w=w: dispatched(port, args.messages, w, args.batch_size))
+            for w in args.workers
+        ]:
+            sessions_before = handler.sessions
+            elapsed = run()
+            rows.append((label, f"{args.messages / elapsed:.1f}", handler.sessions - sessions_before))
+    finally:
+        controller.stop()
+
+    report(f"Mail delivery ({args.messages} messages, {args.handshake_ms:.0f} ms handshake)",
+           rows, ["strategy", "messages/s", "SMTP sessions"])
+
+
+if __name__ == "__main__":
+    main()
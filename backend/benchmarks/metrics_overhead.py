@@ -0,0 +1,162 @@
+"""
+Cost of request instrumentation and metrics per request.
+
+The same requests go through the application router with no middleware,
+with the instrumentation middleware only, with /metrics recording on top,
+and with the JSON request log written to /dev/null as well. Rounds alternate
+between the setups, and the table shows the median of the per-round means.
+Those end-to-end numbers include transport and routing noise, so the
+middleware is also timed around a no-op app, observe_request is timed
+alone, and /metrics is rendered once after the run.
+
+Run from the backend directory:
+    python -m benchmarks.metrics_overhead --requests 2000 --rounds 5
+"""
+import os
+import tempfile
+
+_dir = tempfile.mkdtemp(prefix="hms-metrics-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_dir, 'metrics.db')}"
+os.environ["REPORTS_EXPORT_INTERVAL_SECONDS"] = "0"
+os.environ["METRICS_ENABLED"] = "true"  # off by default; registers the pool gauges rendered below
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import logging  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+from datetime import date, timedelta  # noqa: E402
+import httpx  # noqa: E402
+import generate_data  # noqa: E402
+import main  # noqa: E402
+from app.core import instrumentation, metrics  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from benchmarks.common import report  # noqa: E402
+
+check_in = date.today() + timedelta(days=200)
+PATHS = {
+    "GET / (no DB)": "/",
+    "GET /public/hotels (cached)": "/api/public/hotels?limit=20",
+    "GET available-rooms (2 queries)": f"/api/public/hotels/1/available-rooms?check_in={check_in}"
+                                       f"&check_out={check_in + timedelta(days=2)}",
+}
+
+# setup -> (wrap in the middleware, METRICS_ENABLED, REQUEST_LOG)
+SETUPS = {
+    "bare router": (False, False, False),
+    "instrumentation": (True, False, False),
+    "+ metrics": (True, True, False),
+    "+ metrics + request log": (True, True, True),
+}
+
+
+def with_app(inner):
+    """What FastAPI.__call__ adds to the scope before its middleware stack."""
+    async def asgi(scope, receive, send):
+        scope["app"] = main.app
+        await inner(scope, receive, send)
+    return asgi
+
+
+async def mean_us(client, path, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(args):
+    apps = {
+        name: with_app(instrumentation.RequestInstrumentation(main.app.router) if wrapped else main.app.router)
+        for name, (wrapped, _, _) in SETUPS.items()
+    }
+    samples = {(path, setup): [] for path in PATHS for setup in SETUPS}
+    for _ in range(args.rounds):
+        for setup, (_, metrics_on, log_on) in SETUPS.items():
+            settings.METRICS_ENABLED, settings.REQUEST_LOG = metrics_on, log_on
+            transport = httpx.ASGITransport(app=apps[setup])
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for label, path in PATHS.items():
+                    await mean_us(client, path, args.warmup)
+                    samples[(label, setup)].append(await mean_us(client, path, args.requests))
+    return samples
+
+
+def micro(calls):
+    """ns per observe_request call, and us per request added by the middleware around a no-op app, per setup."""
+    stats = instrumentation.RequestStats(request_id="x", method="GET", path="/api/public/hotels",
+                                         route="/api/public/hotels", status=200, queries=2, db_seconds=0.001)
+    start = time.perf_counter()
+    for _ in range(calls):
+        metrics.observe_request(stats, 0.004)
+    observe_ns = (time.perf_counter() - start) / calls * 1e9
+
+    async def noop(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def ignore(message):
+        pass
+
+    async def per_request_us(app):
+        headers = [(b"host", b"bench"), (b"user-agent", b"bench"), (b"accept", b"*/*")]
+        start = time.perf_counter()
+        for _ in range(calls):
+            await app({"type": "http", "method": "GET", "path": "/", "headers": headers}, None, ignore)
+        return (time.perf_counter() - start) / calls * 1e6
+
+    middleware = instrumentation.RequestInstrumentation(noop)
+    bare = asyncio.run(per_request_us(noop))
+    added = {}
+    for setup, (wrapped, metrics_on, log_on) in SETUPS.items():
+        if wrapped:
+            settings.METRICS_ENABLED, settings.REQUEST_LOG = metrics_on, log_on
+            added[setup] = asyncio.run(per_request_us(middleware)) - bare
+    return observe_ns, added
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path, setup and round")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    target = generate_data.make_engine(os.environ["DATABASE_URL"])
+    generate_data.generate(target, **generate_data.PRESETS["tiny"])
+    target.dispose()
+    # The request log goes nowhere, so only building and emitting the line is measured
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    instrumentation.request_logger.handlers = [handler]
+
+    async def lifespan_run():
+        await main.app.router.startup()
+        try:
+            return await run(args)
+        finally:
+            await main.app.router.shutdown()
+
+    samples = asyncio.run(lifespan_run())
+    rows = []
+    for label in PATHS:
+        bare = statistics.median(samples[(label, "bare router")])
+        for setup in SETUPS:
+            value = statistics.median(samples[(label, setup)])
+            rows.append((label, setup, f"{value:.1f}", f"{value - bare:+.1f}", f"{(value - bare) / bare * 100:+.1f}%"))
+    report(f"Per-request cost, {args.requests} requests x {args.rounds} rounds (median of round means)", rows,
+           ["request", "setup", "us/request", "vs bare", ""])
+
+    start = time.perf_counter()
+    body = metrics.render()
+    render_ms = (time.perf_counter() - start) * 1000
+    observe_ns, added = micro(100000)
+    report("Added by the middleware around a no-op app (no network, no routing)",
+           [(setup, f"{us:.1f}") for setup, us in added.items()], ["setup", "us/request"])
+    print(f"\nmetrics.observe_request: {observe_ns:.0f} ns/call")
+    print(f"/metrics render: {render_ms:.2f} ms for {len(body.splitlines())} lines")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_benchmark())
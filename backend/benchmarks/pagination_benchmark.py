@@ -0,0 +1,69 @@
+"""
+Page latency at increasing depth: OFFSET/LIMIT versus keyset cursors.
+
+Walks the public hotel listing query (hotel summaries) and times single
+pages taken at several depths with both strategies.
+
+Run from the backend directory:
+    python -m benchmarks.pagination_benchmark --hotels 100000 --page-size 100
+"""
+import argparse
+import time
+from fastapi import Response
+from app.models.hotel import Hotel, Room
+from app.core.pagination import PageParams, keyset, finish_page, encode_cursor
+from app.services.catalog import hotel_summaries_select
+from benchmarks.common import make_engine, report
+
+
+def seed(engine, hotels):
+    with engine.begin() as conn:
+        conn.execute(Hotel.__table__.insert(), [
+            {"id": i, "name": f"Hotel {i}", "location": f"City {i % 500}", "description": "", "manager_id": 1}
+            for i in range(1, hotels + 1)
+        ])
+        conn.execute(Room.__table__.insert(), [
+            {"hotel_id": 1 + i % hotels, "room_number": str(i), "type": "Double", "price": 50.0 + i % 300,
+             "capacity": 2, "is_available": True, "max_bookings": 1}
+            for i in range(hotels * 2)
+        ])
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine, SessionLocal = make_engine()
+    seed(engine, args.hotels)
+    db = SessionLocal()
+
+    rows = []
+    for fraction in (0, 0.1, 0.25, 0.5, 0.75, 0.99):
+        offset = int(args.hotels * fraction)
+        offset_ms = best_of(lambda: db.execute(hotel_summaries_select().order_by(Hotel.id)
+                            .offset(offset).limit(args.page_size)).all(), args.repeat)
+        # The cursor for this depth is the last id of the previous page
+        page = PageParams(cursor=encode_cursor(offset) if offset else None, limit=args.page_size)
+        cursor_ms = best_of(lambda: finish_page(
+            db.execute(keyset(hotel_summaries_select(), Hotel.id, page)).all(), Hotel.id, page, Response()), args.repeat)
+        rows.append((offset, f"{offset_ms:.2f}", f"{cursor_ms:.2f}"))
+    db.close()
+
+    report(f"Hotel listing page latency ({args.hotels} hotels, page size {args.page_size})",
+           rows, ["depth (rows)", "offset ms", "cursor ms"])
+
+
+if __name__ == "__main__":
+    main()
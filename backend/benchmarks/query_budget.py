@@ -0,0 +1,101 @@
+"""
+Query-count regression check for endpoints that used to be N+1.
+
+Drives the real app in-process against a throwaway database and fails
+(exit status 1) if any endpoint issues more SQL statements than its budget.
+Budgets include the authenticated-user lookup.
+
+Run from the backend directory:
+    python -m benchmarks.query_budget
+"""
+import os
+import sys
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-budget-'), 'budget.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+
+from datetime import date, timedelta  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+from app.core.database import SessionLocal, async_engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.models.hotel import Hotel, Room  # noqa: E402
+from app.models.booking import Booking  # noqa: E402
+from app.services import inventory  # noqa: E402
+from benchmarks.common import QueryCounter, migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+HOTELS = 5
+ROOMS_PER_HOTEL = 40
+BOOKINGS = 400
+
+CHECK_IN = date.today() + timedelta(days=5)
+CHECK_OUT = CHECK_IN + timedelta(days=2)
+
+# (path, role) -> maximum number of SQL statements
+BUDGETS = {
+    ("/api/admin/dashboard", "admin"): 3,
+    ("/api/manager/dashboard", "manager"): 3,
+    ("/api/manager/rooms?limit=500", "manager"): 2,
+    ("/api/public/hotels?limit=100", None): 1,
+    (f"/api/public/hotels/1/available-rooms?check_in={CHECK_IN}&check_out={CHECK_OUT}", None): 2,
+}
+
+
+def seed():
+    db = SessionLocal()
+    admin = User(email="admin@budget.test", hashed_password="x", full_name="Admin", role=UserRole.ADMIN)
+    manager = User(email="manager@budget.test", hashed_password="x", full_name="Manager", role=UserRole.MANAGER)
+    guests = [User(email=f"guest{i}@budget.test", hashed_password="x", role=UserRole.GUEST) for i in range(20)]
+    db.add_all([admin, manager, *guests])
+    db.flush()
+    for h in range(HOTELS):
+        hotel = Hotel(name=f"Hotel {h}", location=f"City {h}", manager_id=manager.id)
+        hotel.rooms = [
+            Room(room_number=str(100 + r), type="Double", price=100.0 + r, capacity=2, max_bookings=1)
+            for r in range(ROOMS_PER_HOTEL)
+        ]
+        db.add(hotel)
+    db.flush()
+    start = date.today() - timedelta(days=30)
+    for i in range(BOOKINGS):
+        check_in = start + timedelta(days=i % 60)
+        db.add(Booking(
+            user_id=guests[i % len(guests)].id, room_id=1 + i % (HOTELS * ROOMS_PER_HOTEL),
+            check_in=check_in, check_out=check_in + timedelta(days=2), total_price=200.0,
+        ))
+    db.flush()
+    inventory.rebuild(db)
+    db.commit()
+    tokens = {
+        "admin": create_access_token({"sub": admin.email}),
+        "manager": create_access_token({"sub": manager.email}),
+    }
+    db.close()
+    return tokens
+
+
+def main_check():
+    tokens = seed()
+    client = TestClient(main.app)
+    rows = []
+    failed = False
+    for (path, role), budget in BUDGETS.items():
+        headers = {"Authorization": f"Bearer {tokens[role]}"} if role else {}
+        with QueryCounter(async_engine.sync_engine) as counter:
+            response = client.get(path, headers=headers)
+        if response.status_code != 200:
+            print(f"{path}: HTTP {response.status_code} {response.text}")
+            failed = True
+        over = counter.count > budget
+        failed = failed or over
+        rows.append((path.split("?")[0], counter.count, budget, "FAIL" if over else "ok"))
+    report("Query budgets", rows, ["endpoint", "queries", "budget", "result"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
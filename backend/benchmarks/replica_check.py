@@ -0,0 +1,157 @@
+"""
+Read/write routing against a primary SQLite file and two file-copy
+replicas.
+
+The script checks four things:
+- public GETs are spread round-robin over the replicas, except the fills
+  of the response cache, which read the primary
+- writes go to the primary
+- a client that has just booked keeps reading from the primary (the
+  read-your-writes cookie), while other clients see the replicas' older
+  snapshot until the copies are refreshed
+- after an admin edits a hotel, every client sees the edit in the cached
+  catalog even though the replicas are stale, and the admin gets the
+  read-your-writes cookie
+
+It exits with status 1 if any expectation fails.
+
+Run from the backend directory:
+    python -m benchmarks.replica_check --reads 300
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+
+_dir = tempfile.mkdtemp(prefix="hms-replica-")
+PRIMARY = os.path.join(_dir, "primary.db")
+REPLICAS = [os.path.join(_dir, f"replica{i}.db") for i in (1, 2)]
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY}"
+os.environ.setdefault("REQUEST_LOG", "false")
+os.environ["READ_REPLICA_URLS"] = ",".join(f"sqlite:///{path}" for path in REPLICAS)
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+from datetime import date, timedelta  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+import main  # noqa: E402
+from app.controllers.auth import principal_claims  # noqa: E402
+from app.core.database import READ_PRIMARY_COOKIE, SessionLocal, async_engine, replica_engines  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.hotel import Hotel, Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.search import get_search_backend  # noqa: E402
+from benchmarks.common import QueryCounter, migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+
+def seed(hotels):
+    db = SessionLocal()
+    guest = User(email="guest@example.com", hashed_password="x", role="guest")
+    admin = User(email="admin@example.com", hashed_password="x", role="admin")
+    db.add_all([guest, admin])
+    for h in range(hotels):
+        hotel = Hotel(name=f"Hotel {h}", location=f"City {h % 5}", manager_id=1)
+        hotel.rooms = [Room(room_number=str(100 + r), type="Double", price=90.0 + r, capacity=2) for r in range(10)]
+        db.add(hotel)
+    db.flush()
+    get_search_backend(db).rebuild(db)
+    db.commit()
+    tokens = [create_access_token(principal_claims(user)) for user in (guest, admin)]
+    db.close()
+    return tokens
+
+
+def copy_to_replicas():
+    """Refresh every replica with a consistent snapshot of the primary (SQLite online backup)."""
+    source = sqlite3.connect(PRIMARY)
+    for path in REPLICAS:
+        target = sqlite3.connect(path)
+        source.backup(target)
+        target.close()
+    source.close()
+
+
+def main_check():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=300)
+    parser.add_argument("--hotels", type=int, default=50)
+    args = parser.parse_args()
+
+    token, admin_token = seed(args.hotels)
+    copy_to_replicas()
+    auth = {"Authorization": f"Bearer {token}"}
+    admin_auth = {"Authorization": f"Bearer {admin_token}"}
+    engines = {"primary": async_engine.sync_engine}
+    engines.update({f"replica {i + 1}": e.sync_engine for i, e in enumerate(replica_engines)})
+    counters = {name: QueryCounter(engine) for name, engine in engines.items()}
+    failures = []
+
+    def routed(fn):
+        """Run fn and return how many statements each engine executed."""
+        for counter in counters.values():
+            counter.__enter__()
+        try:
+            result = fn()
+        finally:
+            for counter in counters.values():
+                counter.__exit__(None, None, None)
+        return result, {name: c.count for name, c in counters.items()}
+
+    check_in = date.today() + timedelta(days=30)
+    paths = [
+        "/api/public/hotels?limit=20",
+        "/api/public/hotels/1",
+        f"/api/public/hotels/2/available-rooms?check_in={check_in}&check_out={check_in + timedelta(days=2)}",
+    ]
+    client = TestClient(main.app)
+    _, fills = routed(lambda: [client.get(path) for path in paths[:2]])
+    rows = [("cache fills (2 cached GETs)", *fills.values())]
+    if any(v for k, v in fills.items() if k != "primary"):
+        failures.append("the response cache was filled from a replica")
+    start = time.perf_counter()
+    _, reads = routed(lambda: [client.get(paths[i % len(paths)]) for i in range(args.reads)])
+    elapsed = time.perf_counter() - start
+    rows.append((f"{args.reads} public GETs", *reads.values()))
+    if reads["primary"] or abs(reads["replica 1"] - reads["replica 2"]) > 2:
+        failures.append("public reads were not spread over the replicas")
+
+    booker = TestClient(main.app)
+    booking = {"room_id": 1, "check_in": str(check_in), "check_out": str(check_in + timedelta(days=2))}
+    response, writes = routed(lambda: booker.post("/api/public/bookings", json=booking, headers=auth))
+    rows.append(("POST /bookings", *writes.values()))
+    if response.status_code != 200 or any(v for k, v in writes.items() if k != "primary"):
+        failures.append(f"booking did not go to the primary ({response.status_code})")
+
+    own, own_counts = routed(lambda: booker.get("/api/public/bookings", headers=auth).json())
+    rows.append(("GET /bookings, same client", *own_counts.values()))
+    other, other_counts = routed(lambda: TestClient(main.app).get("/api/public/bookings", headers=auth).json())
+    rows.append(("GET /bookings, other client", *other_counts.values()))
+    if len(own) != 1:
+        failures.append("the booking client did not read its own write")
+    if other:
+        failures.append("a stale replica unexpectedly had the booking")
+
+    copy_to_replicas()
+    caught_up = TestClient(main.app).get("/api/public/bookings", headers=auth).json()
+    if len(caught_up) != 1:
+        failures.append("replica refresh did not expose the booking")
+
+    editor = TestClient(main.app)
+    response = editor.put("/api/admin/hotels/1", json={"name": "Renamed Hotel"}, headers=admin_auth)
+    if response.status_code != 200 or READ_PRIMARY_COOKIE not in response.cookies:
+        failures.append(f"the hotel edit did not set the read-your-writes cookie ({response.status_code})")
+    names = [TestClient(main.app).get(path).json() for path in paths[:2]]
+    if names[1]["name"] != "Renamed Hotel" or "Renamed Hotel" not in {h["name"] for h in names[0]}:
+        failures.append("the cached catalog was refilled from a stale replica")
+
+    report(f"Statements per engine ({args.reads / elapsed:.0f} reads/s in-process)", rows, ["step", *engines])
+    print(f"\nOther client before replica refresh: {len(other)} booking(s); after: {len(caught_up)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
@@ -0,0 +1,142 @@
+"""
+Occupancy-by-month and room-type reports: DuckDB over the exported
+snapshot versus the equivalent SQL on the live SQLite database (a recursive
+CTE expanding each stay into nights). Both must produce the same sold
+room-nights and revenue; the run fails otherwise.
+
+Run from the backend directory:
+    python -m benchmarks.reporting_benchmark --bookings 200000 --repeat 5
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+from sqlalchemy import text
+from app.models.booking import Booking
+from app.models.hotel import Hotel, Room
+from app.services import reporting
+from benchmarks.common import make_engine, report
+
+HOTELS = 100
+ROOMS_PER_HOTEL = 40
+ROOM_TYPES = ["Single", "Double", "Suite", "Family"]
+
+LIVE_NIGHTS = """
+    WITH RECURSIVE nights(room_id, night, check_out, rate) AS (
+        SELECT room_id, check_in, check_out, total_price / (julianday(check_out) - julianday(check_in))
+        FROM bookings
+        WHERE status <> 'cancelled' AND check_out > check_in AND check_out > :start AND check_in <= :end
+        UNION ALL
+        SELECT room_id, date(night, '+1 day'), check_out, rate FROM nights WHERE date(night, '+1 day') < check_out
+    )
+"""
+
+LIVE_SQL = {
+    "occupancy by month": LIVE_NIGHTS + """
+        SELECT r.hotel_id, substr(n.night, 1, 7) || '-01', count(*), sum(n.rate)
+        FROM nights n JOIN rooms r ON r.id = n.room_id
+        WHERE n.night BETWEEN :start AND :end
+        GROUP BY 1, 2
+    """,
+    "room types": LIVE_NIGHTS + """
+        SELECT r.hotel_id, r.type, count(*), sum(n.rate)
+        FROM nights n JOIN rooms r ON r.id = n.room_id
+        WHERE n.night BETWEEN :start AND :end
+        GROUP BY 1, 2
+    """,
+}
+
+DUCKDB_REPORTS = {
+    "occupancy by month": (reporting.occupancy_by_month, lambda row: (row["hotel_id"], row["month"].isoformat())),
+    "room types": (reporting.room_type_performance, lambda row: (row["hotel_id"], row["room_type"])),
+}
+
+
+def populate(SessionLocal, bookings):
+    db = SessionLocal()
+    db.execute(Hotel.__table__.insert(), [
+        {"id": h, "name": f"Hotel {h}", "location": "Somewhere", "manager_id": 1} for h in range(1, HOTELS + 1)
+    ])
+    db.execute(Room.__table__.insert(), [
+        {"hotel_id": h, "room_number": str(r), "type": ROOM_TYPES[r % len(ROOM_TYPES)], "price": 80.0 + 20 * (r % 4),
+         "capacity": 2, "is_available": True, "max_bookings": 1}
+        for h in range(1, HOTELS + 1) for r in range(ROOMS_PER_HOTEL)
+    ])
+    rng = random.Random(3)
+    start = date.today() - timedelta(days=2 * 365)
+    batch = []
+    for _ in range(bookings):
+        check_in = start + timedelta(days=rng.randint(0, 2 * 365))
+        nights = rng.randint(1, 7)
+        batch.append({
+            "user_id": 1, "room_id": rng.randint(1, HOTELS * ROOMS_PER_HOTEL), "check_in": check_in,
+            "check_out": check_in + timedelta(days=nights), "total_price": 100.0 * nights,
+            "status": rng.choice(["confirmed", "confirmed", "completed", "cancelled"]),
+        })
+        if len(batch) == 50000:
+            db.execute(Booking.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(Booking.__table__.insert(), batch)
+    db.commit()
+    db.close()
+
+
+def median_ms(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=365, help="Report range, ending today")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not reporting.available():
+        print("duckdb is not installed; nothing to compare.")
+        return 1
+
+    engine, SessionLocal = make_engine()
+    populate(SessionLocal, args.bookings)
+    snapshot = os.path.join(os.path.dirname(engine.url.database), "analytics.duckdb")
+    export_ms, counts = median_ms(lambda: reporting.export(engine, snapshot), 1)
+    store = reporting.ReportStore(snapshot)
+
+    end = date.today()
+    start = end - timedelta(days=args.days - 1)
+    rows, mismatches = [], []
+    with engine.connect() as conn:
+        for label, sql in LIVE_SQL.items():
+            live_ms, live = median_ms(
+                lambda: conn.execute(text(sql), {"start": start, "end": end}).fetchall(), args.repeat)
+            fn, key_of = DUCKDB_REPORTS[label]
+            duck_ms, duck = median_ms(lambda: fn(start, end, store=store), args.repeat)
+
+            expected = {(h, k): (sold, revenue) for h, k, sold, revenue in live}
+            actual = {key_of(row): (row["sold_room_nights"], row["revenue"]) for row in duck if row["sold_room_nights"]}
+            for key in expected.keys() | actual.keys():
+                want, have = expected.get(key, (0, 0.0)), actual.get(key, (0, 0.0))
+                if want[0] != have[0] or abs(want[1] - have[1]) > 0.01:
+                    mismatches.append(f"{label} {key}: live {want}, duckdb {have}")
+            rows.append((label, len(duck), f"{live_ms:.1f}", f"{duck_ms:.1f}", f"{live_ms / duck_ms:.1f}x"))
+    store.close()
+    engine.dispose()
+
+    report(f"Reports over {args.days} days, {args.bookings} bookings (p50)", rows,
+           ["report", "rows", "live SQLite ms", "DuckDB ms", "speedup"])
+    print(f"\nExport: {sum(counts.values())} rows in {export_ms:.0f} ms")
+    for mismatch in mismatches[:20]:
+        print(f"MISMATCH: {mismatch}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
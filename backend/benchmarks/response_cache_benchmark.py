@@ -0,0 +1,122 @@
+"""
+Public catalog reads through the response cache: no cache, in-process
+LRU, and the Redis backend (on fakeredis, when installed). A manager
+edits a room every --write-every requests. Each edit must show up in the
+next read of that hotel, and the run fails if a stale body is served.
+Every third read replays the last ETag with If-None-Match.
+
+Run from the backend directory:
+    python -m benchmarks.response_cache_benchmark --requests 3000 --write-every 50
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-rcache-'), 'rcache.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import random  # noqa: E402
+import time  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from app.controllers.auth import principal_claims  # noqa: E402
+from app.core.cache import MemoryCacheBackend, NullCacheBackend, RedisCacheBackend, response_cache  # noqa: E402
+from app.core.database import SessionLocal, async_engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.hotel import Hotel, Room  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.common import QueryCounter, migrate_app_database, report  # noqa: E402
+
+migrate_app_database()
+
+try:
+    import fakeredis
+except ImportError:  # optional, only for the Redis row
+    fakeredis = None
+
+HOTELS = 200
+ROOMS_PER_HOTEL = 10
+
+
+def seed():
+    db = SessionLocal()
+    manager = User(email="manager@example.com", hashed_password="x", role="manager")
+    db.add(manager)
+    db.flush()
+    for h in range(HOTELS):
+        hotel = Hotel(name=f"Hotel {h}", location=f"City {h % 10}", manager_id=manager.id)
+        hotel.rooms = [Room(room_number=str(100 + r), type="Double", price=100.0, capacity=2) for r in range(ROOMS_PER_HOTEL)]
+        db.add(hotel)
+    db.commit()
+    token = create_access_token(principal_claims(manager))
+    db.close()
+    return token
+
+
+async def run(token, args):
+    rng = random.Random(7)
+    auth = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=main.app)
+    etags, stale, not_modified = {}, 0, 0
+    expected_price = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(args.requests):
+            if i and i % args.write_every == 0:
+                room_id = rng.randint(1, HOTELS * ROOMS_PER_HOTEL)
+                price = float(rng.randint(50, 500))
+                response = await client.put(f"/api/manager/rooms/{room_id}", json={"price": price}, headers=auth)
+                expected_price[response.json()["hotel_id"], room_id] = price
+                continue
+            hotel_id = rng.randint(1, HOTELS // 10)  # a hot set, as catalogs usually have
+            path = rng.choice([
+                "/api/public/hotels?limit=20",
+                f"/api/public/hotels/{hotel_id}",
+                f"/api/public/hotels/{hotel_id}/rooms",
+            ])
+            headers = {"If-None-Match": etags[path]} if path in etags and i % 3 == 0 else {}
+            response = await client.get(path, headers=headers)
+            if response.status_code == 304:
+                not_modified += 1
+                continue
+            etags[path] = response.headers["etag"]
+            if "/rooms" in path:
+                for room in response.json():
+                    if expected_price.get((hotel_id, room["id"]), room["price"]) != room["price"]:
+                        stale += 1
+        elapsed = time.perf_counter() - start
+    return elapsed, stale, not_modified
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--write-every", type=int, default=50)
+    args = parser.parse_args()
+
+    token = seed()
+    backends = [("none", NullCacheBackend()), ("memory LRU", MemoryCacheBackend(5000))]
+    if fakeredis is not None:
+        backends.append(("redis (fakeredis)", RedisCacheBackend(fakeredis.FakeAsyncRedis())))
+
+    rows = []
+    failed = False
+    for label, backend in backends:
+        response_cache.backend = backend
+        response_cache.hits = response_cache.misses = response_cache.not_modified = 0
+        with QueryCounter(async_engine.sync_engine) as counter:
+            elapsed, stale, not_modified = asyncio.run(run(token, args))
+        stats = response_cache.stats()
+        failed = failed or stale > 0
+        rows.append((label, f"{args.requests / elapsed:.0f}", counter.count, f"{stats['hit_rate']:.1%}", not_modified, stale))
+
+    report(f"Catalog reads, {args.requests} requests, a room edit every {args.write_every}", rows,
+           ["backend", "req/s", "queries", "hit rate", "304s", "stale reads"])
+    if fakeredis is None:
+        print("\n(fakeredis not installed: Redis backend skipped)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_benchmark())
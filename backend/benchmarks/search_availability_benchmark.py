@@ -0,0 +1,136 @@
+"""
+"Hotels in a city with rooms free for my dates": the client-side fan-out
+(list hotels, then available-rooms per hotel) versus GET /api/public/search.
+
+Run from the backend directory:
+    python -m benchmarks.search_availability_benchmark --hotels 200 --rooms-per-hotel 100
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.controllers.public import search_available_hotels
+from app.core.database import async_url
+from app.core.pagination import PageParams
+from app.models.hotel import Hotel, Room
+from app.models.booking import Booking
+from app.services import inventory
+from app.services.availability import find_available_rooms
+from app.services.catalog import hotel_summaries_select
+from app.services.search import get_search_backend
+from benchmarks.availability_benchmark import per_room_loop
+from benchmarks.common import make_engine, QueryCounter, report
+
+CITIES = ["Paris", "London", "Tokyo", "Rome"]
+
+
+def seed(SessionLocal, hotels, rooms_per_hotel, bookings_per_room):
+    db = SessionLocal()
+    db.execute(Hotel.__table__.insert(), [
+        {"id": h, "name": f"Hotel {h}", "location": f"{CITIES[h % len(CITIES)]}, Somewhere", "manager_id": 1}
+        for h in range(1, hotels + 1)
+    ])
+    rooms = [
+        {"hotel_id": h, "room_number": str(r), "type": random.choice(["Single", "Double", "Suite"]),
+         "price": float(random.randint(60, 400)), "capacity": random.randint(1, 4),
+         "is_available": True, "max_bookings": 1}
+        for h in range(1, hotels + 1) for r in range(rooms_per_hotel)
+    ]
+    db.execute(Room.__table__.insert(), rooms)
+    start = date.today()
+    db.execute(Booking.__table__.insert(), [
+        {"user_id": 1, "room_id": room_id, "check_in": ci, "check_out": ci + timedelta(days=random.randint(1, 5)),
+         "total_price": 100.0, "status": "confirmed"}
+        for room_id in range(1, len(rooms) + 1) for _ in range(bookings_per_room)
+        for ci in [start + timedelta(days=random.randint(0, 60))]
+    ])
+    inventory.rebuild(db)
+    get_search_backend(db).rebuild(db)
+    db.commit()
+    db.close()
+
+
+def fan_out(db, location, check_in, check_out, guests, per_hotel):
+    matches = get_search_backend(db).matches(location, ["location"])
+    hotels = db.execute(hotel_summaries_select().join(matches, matches.c.hotel_id == Hotel.id).limit(100)).all()
+    results = []
+    for hotel in hotels:
+        rooms = [r for r in per_hotel(db, hotel.id, check_in, check_out) if r.capacity >= guests]
+        if rooms:
+            results.append((hotel.id, min(r.price for r in rooms)))
+    return results
+
+
+def measure(engine, SessionLocal, fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        with QueryCounter(engine) as counter:
+            start = time.perf_counter()
+            result = fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+        db.close()
+    timings.sort()
+    return result, counter.count, timings[len(timings) // 2]
+
+
+def measure_async(engine, fn, repeat):
+    """Like measure, for coroutines that take an AsyncSession (the request path)."""
+    async_engine = create_async_engine(async_url(str(engine.url)))
+
+    async def once():
+        async with AsyncSession(async_engine) as db:
+            start = time.perf_counter()
+            result = await fn(db)
+            return result, (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(repeat):
+        with QueryCounter(async_engine.sync_engine) as counter:
+            result, ms = asyncio.run(once())
+        timings.append(ms)
+    asyncio.run(async_engine.dispose())
+    timings.sort()
+    return result, counter.count, timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument("--rooms-per-hotel", type=int, default=100)
+    parser.add_argument("--bookings-per-room", type=int, default=5)
+    parser.add_argument("--guests", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(42)
+    engine, SessionLocal = make_engine()
+    seed(SessionLocal, args.hotels, args.rooms_per_hotel, args.bookings_per_room)
+    check_in = date.today() + timedelta(days=20)
+    check_out = check_in + timedelta(days=3)
+
+    legacy, legacy_q, legacy_ms = measure(engine, SessionLocal, lambda db: fan_out(
+        db, "paris", check_in, check_out, args.guests, per_room_loop), args.repeat)
+    grouped, grouped_q, grouped_ms = measure(engine, SessionLocal, lambda db: fan_out(
+        db, "paris", check_in, check_out, args.guests,
+        lambda db, hid, ci, co: find_available_rooms(db, ci, co, hotel_id=hid, listed_only=True)), args.repeat)
+    combined, combined_q, combined_ms = measure_async(engine, lambda db: search_available_hotels(
+        Response(), check_in, check_out, args.guests, "paris", None, PageParams(None, 100), db), args.repeat)
+
+    assert legacy == grouped == [(h.id, h.min_price) for h in combined], "strategies disagree"
+    report(
+        f"Availability search: {args.hotels} hotels x {args.rooms_per_hotel} rooms, {len(combined)} Paris hits",
+        [
+            ("fan-out, per-room loop", legacy_q, f"{legacy_ms:.1f}"),
+            ("fan-out, grouped per hotel", grouped_q, f"{grouped_ms:.1f}"),
+            ("GET /api/public/search", combined_q, f"{combined_ms:.1f}"),
+        ],
+        ["strategy", "queries", "p50 ms"],
+    )
+
+
+if __name__ == "__main__":
+    main()
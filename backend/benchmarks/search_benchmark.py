@@ -0,0 +1,85 @@
+"""
+Hotel search latency: LIKE scans versus the FTS5 index.
+
+Run from the backend directory:
+    python -m benchmarks.search_benchmark --hotels 100000
+"""
+import argparse
+import random
+import time
+from app.models.hotel import Hotel
+from app.services.catalog import hotel_summaries_select
+from app.services.search import FTS5SearchBackend, LikeSearchBackend
+from benchmarks.common import make_engine, report
+
+CITIES = ["Paris", "London", "Tokyo", "New York", "Rome", "Madrid", "Dubai", "Sydney", "Berlin", "Lisbon",
+          "Vienna", "Prague", "Kyoto", "Venice", "Nice", "Bangkok", "Edinburgh", "Barcelona", "Miami", "Aspen"]
+COUNTRIES = ["France", "UK", "Japan", "USA", "Italy", "Spain", "UAE", "Australia", "Germany", "Portugal"]
+WORDS = ["grand", "royal", "palace", "boutique", "harbour", "garden", "plaza", "lodge", "suites", "resort",
+         "view", "inn", "spa", "castle", "marina", "beach", "mountain", "urban", "classic", "modern"]
+
+QUERIES = {
+    "location prefix": ("par", ["location"]),
+    "location word": ("tokyo", ["location"]),
+    "two-word text": ("grand palace", None),
+    "rare prefix": ("edinb cast", None),
+}
+
+
+def seed(engine, hotels):
+    rows = []
+    for i in range(1, hotels + 1):
+        name = " ".join(random.sample(WORDS, 2)).title()
+        rows.append({
+            "id": i, "name": f"{name} {i}",
+            "location": f"{random.choice(CITIES)}, {random.choice(COUNTRIES)}",
+            "description": " ".join(random.choices(WORDS, k=12)), "manager_id": 1,
+        })
+    with engine.begin() as conn:
+        conn.execute(Hotel.__table__.insert(), rows)
+
+
+def p50(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    random.seed(42)
+    engine, SessionLocal = make_engine()
+    seed(engine, args.hotels)
+    db = SessionLocal()
+    fts, like = FTS5SearchBackend(), LikeSearchBackend()
+    fts.rebuild(db)
+    db.commit()
+
+    def run(backend, query, columns):
+        matches = backend.matches(query, columns)
+        return db.execute(hotel_summaries_select().join(matches, matches.c.hotel_id == Hotel.id)
+                          .order_by(matches.c.rank, Hotel.id).limit(args.limit)).all()
+
+    rows = []
+    for label, (query, columns) in QUERIES.items():
+        like_ms, like_rows = p50(lambda: run(like, query, columns), args.repeat)
+        fts_ms, fts_rows = p50(lambda: run(fts, query, columns), args.repeat)
+        rows.append((label, repr(query), f"{like_ms:.2f}", f"{fts_ms:.2f}", len(like_rows), len(fts_rows)))
+    db.close()
+
+    report(f"Hotel search, top {args.limit} ({args.hotels} hotels, p50)", rows,
+           ["query", "text", "LIKE ms", "FTS5 ms", "LIKE hits", "FTS5 hits"])
+    print("\nLIKE matches substrings anywhere and ranks nothing; FTS5 matches word prefixes ranked by bm25.")
+
+
+if __name__ == "__main__":
+    main()
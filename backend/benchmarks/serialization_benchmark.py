@@ -0,0 +1,179 @@
+"""
+Rows per second and peak memory of large list responses, old path vs new.
+
+Each list is produced three ways from the same database:
+    orm + json     ORM entities, validated and encoded through the route's
+                   response_model as FastAPI does, dumped with json.dumps
+                   (what the endpoints did before)
+    orm + orjson   the same, dumped with orjson (the new default response
+                   class, which every endpoint with a response_model gets)
+    columns        the endpoint as it is now: a column select written
+                   straight to JSON by app.core.responses.json_rows
+
+Timings include the query. Peak memory is traced in a separate pass with
+tracemalloc, so tracing does not slow the timed runs. The three bodies are
+parsed and compared, and the run fails if any differ.
+
+Run from the backend directory:
+    python -m benchmarks.serialization_benchmark --rows 20000 --repeat 5
+"""
+import os
+import tempfile
+
+_dir = tempfile.mkdtemp(prefix="hms-serialization-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_dir, 'serialization.db')}"
+os.environ["REPORTS_EXPORT_INTERVAL_SECONDS"] = "0"
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import gc  # noqa: E402
+import json  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from typing import List  # noqa: E402
+from fastapi import Response  # noqa: E402
+from fastapi.responses import JSONResponse as StdJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import select, update  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+import generate_data  # noqa: E402
+from app.controllers import admin, public  # noqa: E402
+from app.core.auth_cache import Principal  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.core.pagination import PageParams  # noqa: E402
+from app.core.responses import JSONResponse  # noqa: E402
+from app.models.booking import Booking  # noqa: E402
+from app.models.hotel import Hotel  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.booking import Booking as BookingSchema  # noqa: E402
+from app.schemas.hotel import Hotel as HotelSchema  # noqa: E402
+from app.schemas.user import User as UserSchema  # noqa: E402
+from benchmarks.common import report  # noqa: E402
+
+ADMIN = Principal(id=1, email="admin@example.com", role="admin")
+
+
+def response_field(schema):
+    return create_response_field(name=f"Response_{schema.__name__}", type_=List[schema], mode="serialization")
+
+
+async def orm_body(db, stmt, schema, response_class) -> bytes:
+    """The previous endpoints: ORM entities through the response_model, then the response class."""
+    items = (await db.execute(stmt)).scalars().all()
+    content = await serialize_response(field=response_field(schema), response_content=items)
+    return response_class(content).body
+
+
+def endpoints(guest_id):
+    """list -> (ORM select as the endpoint used to run it, schema, current endpoint call)"""
+    return {
+        "GET /admin/users": (
+            select(User).order_by(User.id), UserSchema,
+            lambda db, page: admin.get_all_users(Response(), page, db, ADMIN),
+        ),
+        "GET /admin/hotels (with rooms)": (
+            select(Hotel).options(selectinload(Hotel.rooms)).order_by(Hotel.id), HotelSchema,
+            lambda db, page: admin.get_all_hotels(Response(), page, db, ADMIN),
+        ),
+        "GET /public/bookings": (
+            select(Booking).where(Booking.user_id == guest_id).order_by(Booking.id), BookingSchema,
+            lambda db, page: public.get_user_bookings(
+                Response(), page, db, Principal(id=guest_id, email="guest@example.com", role="guest")),
+        ),
+    }
+
+
+def paths(stmt, schema, call, page):
+    async def legacy(db):
+        return await orm_body(db, stmt, schema, StdJSONResponse)
+
+    async def orjson_only(db):
+        return await orm_body(db, stmt, schema, JSONResponse)
+
+    async def columns(db):
+        return (await call(db, page)).body
+
+    return {"orm + json": legacy, "orm + orjson": orjson_only, "columns": columns}
+
+
+async def run_once(produce) -> bytes:
+    # A fresh session per run, as per request, so no run reuses another's identity map
+    async with AsyncSessionLocal() as db:
+        return await produce(db)
+
+
+async def measure(produce, repeat):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        await run_once(produce)
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    body = await run_once(produce)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak, body
+
+
+async def run(args, guest_id):
+    settings.MAX_PAGE_SIZE = args.rows * 10  # one page holds the whole list
+    page = PageParams(cursor=None, limit=settings.MAX_PAGE_SIZE)
+    rows, failures = [], []
+    for label, (stmt, schema, call) in endpoints(guest_id).items():
+        bodies = {}
+        for path, produce in paths(stmt, schema, call, page).items():
+            await run_once(produce)  # warm caches and compiled statements
+            seconds, peak, body = await measure(produce, args.repeat)
+            bodies[path] = json.loads(body)
+            count = len(bodies[path])
+            rows.append((label, path, count, f"{seconds * 1000:.1f}", f"{count / seconds:,.0f}",
+                         f"{peak / 2**20:.1f}", f"{len(body) / 2**20:.1f}"))
+        if any(parsed != bodies["orm + json"] for parsed in bodies.values()):
+            failures.append(label)
+    return rows, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Users, and bookings of the guest listed")
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument("--rooms-per-hotel", type=int, default=10)
+    parser.add_argument("--years", type=float, default=0.5, help="Booking history; needs about --rows bookings")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    target = generate_data.make_engine(os.environ["DATABASE_URL"])
+    summary = generate_data.generate(target, hotels=args.hotels, rooms_per_hotel=args.rooms_per_hotel,
+                                     users=args.rows, years=args.years)
+    # Hand the first --rows bookings to one guest, so their booking list is as long as the others
+    with target.begin() as conn:
+        guest_id = conn.scalar(select(User.id).where(User.role == "guest").order_by(User.id))
+        ids = select(Booking.id).order_by(Booking.id).limit(args.rows).scalar_subquery()
+        conn.execute(update(Booking).where(Booking.id.in_(ids)).values(user_id=guest_id))
+    target.dispose()
+    print(f"{summary['users']} users, {summary['hotels']} hotels, {summary['rooms']} rooms, "
+          f"{summary['bookings']} bookings")
+
+    async def run_and_dispose():
+        try:
+            return await run(args, guest_id)
+        finally:
+            await async_engine.dispose()
+
+    rows, failures = asyncio.run(run_and_dispose())
+    report(f"List responses, median of {args.repeat} runs (query included)", rows,
+           ["list", "path", "items", "ms", "items/s", "peak MiB", "body MiB"])
+    if failures:
+        print(f"\nFAIL: the paths returned different JSON for {', '.join(failures)}")
+        return 1
+    print("\nAll paths returned the same JSON.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
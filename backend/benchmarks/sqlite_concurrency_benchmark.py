@@ -0,0 +1,139 @@
+"""
+Mixed read/write load on one SQLite file: SQLite's defaults (rollback
+journal, synchronous=FULL) versus the pragmas from settings (WAL,
+synchronous=NORMAL, cache and mmap sizing).
+
+Reader threads run the available-rooms query for a random hotel. Writer
+threads book random stays the way create_booking does (ledger reservation
+plus booking row, one transaction each).
+
+Run from the backend directory:
+    python -m benchmarks.sqlite_concurrency_benchmark --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+from sqlalchemy.exc import OperationalError
+from app.core.database import sqlite_pragmas
+from app.models.booking import Booking
+from app.models.hotel import Hotel, Room
+from app.services import inventory
+from app.services.availability import find_available_rooms
+from benchmarks.common import make_engine, report
+
+BUSY_TIMEOUT_MS = 5000
+
+CONFIGS = {
+    "SQLite defaults": {"journal_mode": "DELETE", "synchronous": "FULL", "busy_timeout": BUSY_TIMEOUT_MS},
+    "tuned (settings)": sqlite_pragmas(),
+}
+
+
+def seed(SessionLocal, hotels, rooms_per_hotel, bookings):
+    db = SessionLocal()
+    db.execute(Hotel.__table__.insert(), [
+        {"id": h, "name": f"Hotel {h}", "location": "Somewhere", "manager_id": 1} for h in range(1, hotels + 1)
+    ])
+    db.execute(Room.__table__.insert(), [
+        {"hotel_id": h, "room_number": str(r), "type": "Double", "price": 100.0, "capacity": 2,
+         "is_available": True, "max_bookings": 3}
+        for h in range(1, hotels + 1) for r in range(rooms_per_hotel)
+    ])
+    start = date.today()
+    rng = random.Random(1)
+    db.execute(Booking.__table__.insert(), [
+        {"user_id": 1, "room_id": rng.randint(1, hotels * rooms_per_hotel), "check_in": ci,
+         "check_out": ci + timedelta(days=2), "total_price": 200.0, "status": "confirmed"}
+        for _ in range(bookings) for ci in [start + timedelta(days=rng.randint(0, 180))]
+    ])
+    inventory.rebuild(db)
+    db.commit()
+    db.close()
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def run(SessionLocal, args):
+    deadline = time.perf_counter() + args.duration
+    reads, writes, errors = [], [], []
+    rooms = args.hotels * args.rooms_per_hotel
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            check_in = date.today() + timedelta(days=rng.randint(0, 180))
+            start = time.perf_counter()
+            db = SessionLocal()
+            try:
+                find_available_rooms(db, check_in, check_in + timedelta(days=3), hotel_id=rng.randint(1, args.hotels))
+                reads.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                errors.append("read")
+            finally:
+                db.close()
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            check_in = date.today() + timedelta(days=rng.randint(0, 180))
+            check_out = check_in + timedelta(days=rng.randint(1, 4))
+            start = time.perf_counter()
+            db = SessionLocal()
+            try:
+                room = db.get(Room, rng.randint(1, rooms))
+                if inventory.reserve_nights(db, room, check_in, check_out):
+                    db.add(Booking(user_id=1, room_id=room.id, check_in=check_in, check_out=check_out,
+                                   total_price=100.0, status="confirmed"))
+                    db.commit()
+                else:
+                    db.rollback()
+                writes.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                db.rollback()
+                errors.append("write")
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return reads, writes, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--hotels", type=int, default=100)
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=20000)
+    args = parser.parse_args()
+
+    rows = []
+    for label, pragmas in CONFIGS.items():
+        engine, SessionLocal = make_engine(pragmas=pragmas)
+        seed(SessionLocal, args.hotels, args.rooms_per_hotel, args.bookings)
+        reads, writes, errors = run(SessionLocal, args)
+        engine.dispose()
+        rows.append((
+            label, f"{len(reads) / args.duration:.0f}", f"{percentile(reads, 95):.1f}",
+            f"{len(writes) / args.duration:.0f}", f"{percentile(writes, 95):.1f}", len(errors),
+        ))
+
+    report(
+        f"Mixed load: {args.readers} readers, {args.writers} writers, {args.duration:.0f}s",
+        rows, ["config", "reads/s", "read p95 ms", "writes/s", "write p95 ms", "lock errors"],
+    )
+
+
+if __name__ == "__main__":
+    main()
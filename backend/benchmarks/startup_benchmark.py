@@ -0,0 +1,131 @@
+"""
+Worker start-up cost: cold `import main`, the startup events, and the first
+and second request, each measured in a fresh interpreter. --workers
+processes start at once against the same database, as uvicorn or gunicorn
+workers do, and every one is reported.
+
+Modes:
+    verify      SCHEMA_STARTUP_MODE=verify (the default): one version query
+    upgrade     SCHEMA_STARTUP_MODE=upgrade: reflect and apply pending migrations
+    create_all  what main.py used to do on import: create_all, then upgrade
+
+Run from the backend directory:
+    python -m benchmarks.startup_benchmark --workers 4 --repeat 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import generate_data
+from benchmarks.common import report
+
+# Runs in a fresh interpreter; prints one JSON line of timings
+WORKER_SCRIPT = """
+import json, os, sys, time
+started = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+statements = [0]
+event.listen(Engine, "before_cursor_execute", lambda *args: statements.__setitem__(0, statements[0] + 1))
+
+mode = sys.argv[1]
+if mode == "create_all":
+    from app.core.database import Base, engine
+    from app.core import migrations
+    import app.models
+    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+import main
+imported = time.perf_counter()
+
+import asyncio
+import httpx
+
+async def serve():
+    await main.app.router.startup()
+    ready = time.perf_counter()
+    at_startup = statements[0]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://worker") as client:
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            response = await client.get("/api/public/hotels/1/rooms")
+            response.raise_for_status()
+            timings.append(time.perf_counter() - start)
+    answered_at = time.time()
+    await main.app.router.shutdown()
+    return ready, at_startup, timings, answered_at
+
+ready, at_startup, (first, second), answered_at = asyncio.run(serve())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000, "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": first * 1000, "second_request_ms": second * 1000, "statements": at_startup,
+    "answered_at": answered_at,
+}))
+"""
+
+MODES = {
+    "verify": {"SCHEMA_STARTUP_MODE": "verify"},
+    "upgrade": {"SCHEMA_STARTUP_MODE": "upgrade"},
+    "create_all": {"SCHEMA_STARTUP_MODE": "off"},
+}
+
+
+def start_workers(mode, count, database_url):
+    """Start `count` workers at once; returns one timing dict per worker, with wall time to first response."""
+    env = dict(os.environ, DATABASE_URL=database_url, REPORTS_EXPORT_INTERVAL_SECONDS="0", EMAIL_WORKERS="0",
+               **MODES[mode])
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spawned_at = time.time()
+    processes = [
+        subprocess.Popen([sys.executable, "-c", WORKER_SCRIPT, mode], cwd=cwd, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(count)
+    ]
+    results = []
+    for process in processes:
+        out, err = process.communicate()
+        if process.returncode:
+            raise RuntimeError(f"{mode} worker failed:\n{err}")
+        result = json.loads(out.strip().splitlines()[-1])
+        result["wall_ms"] = (result.pop("answered_at") - spawned_at) * 1000  # includes interpreter start
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Workers started at the same time")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--preset", choices=generate_data.PRESETS, default="tiny")
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-startup-'), 'startup.db')}"
+    target = generate_data.make_engine(url)
+    generate_data.generate(target, **generate_data.PRESETS[args.preset])
+    target.dispose()
+    start_workers("verify", 1, url)  # warm the OS file cache and bytecode so every mode starts equal
+
+    rows = []
+    for mode in args.modes:
+        samples = [r for _ in range(args.repeat) for r in start_workers(mode, args.workers, url)]
+
+        def median(key):
+            return f"{statistics.median(r[key] for r in samples):.1f}"
+
+        rows.append((mode, len(samples), median("import_ms"), median("startup_ms"), median("first_request_ms"),
+                     median("second_request_ms"), max(r["statements"] for r in samples), median("wall_ms")))
+
+    report(f"Worker start-up, {args.workers} at once, {args.repeat} rounds (median per worker)", rows,
+           ["mode", "workers", "import ms", "startup ms", "1st request ms", "2nd request ms",
+            "SQL at startup", "spawn to 1st response ms"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,295 @@
+"""
+Per-endpoint latency and query counts of the real application, in process.
+
+A fresh database is filled by generate_data at the chosen scale, then each
+scenario sends --requests requests (after --warmup unmeasured ones) through
+httpx's ASGI transport, one at a time, so the query count of every request
+is exact. Results are written as JSON, by default to
+benchmarks/results/<timestamp>-<commit>.json, to compare across commits:
+
+    python -m benchmarks.suite --preset small
+    git checkout <other-revision>
+    python -m benchmarks.suite --preset small --compare benchmarks/results/<earlier>.json
+
+Run from the backend directory. Use the same preset, --requests and --seed
+on both sides. Fails on any 5xx response, or with --max-regression when a
+scenario's p95 grew by more than that percentage against --compare.
+"""
+import os
+import tempfile
+
+_dir = tempfile.mkdtemp(prefix="hms-suite-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_dir, 'suite.db')}"
+os.environ.setdefault("REQUEST_LOG", "false")
+os.environ["REPORTS_PATH"] = os.path.join(_dir, "analytics.duckdb")
+os.environ["REPORTS_EXPORT_INTERVAL_SECONDS"] = "0"
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import random  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import time  # noqa: E402
+from datetime import date, datetime, timedelta  # noqa: E402
+import generate_data  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def scenarios(scale, tokens, manager_hotels, rng):
+    """name -> function returning (method, path, headers, json body) for one request."""
+    hotels = scale["hotels"]
+    rooms = hotels * scale["rooms_per_hotel"]
+
+    def guest():
+        return {"Authorization": f"Bearer {rng.choice(tokens['guests'])}"}
+
+    def admin():
+        return {"Authorization": f"Bearer {tokens['admin']}"}
+
+    def manager():
+        return {"Authorization": f"Bearer {tokens['manager']}"}
+
+    def stay(horizon=240):
+        check_in = date.today() + timedelta(days=rng.randint(1, horizon))
+        return check_in, check_in + timedelta(days=rng.randint(1, 5))
+
+    def available_rooms():
+        check_in, check_out = stay()
+        path = f"/api/public/hotels/{rng.randint(1, hotels)}/available-rooms?check_in={check_in}&check_out={check_out}"
+        return "GET", path, {}, None
+
+    def search():
+        check_in, check_out = stay()
+        city = rng.choice(generate_data.CITIES).split(",")[0]
+        return "GET", f"/api/public/search?check_in={check_in}&check_out={check_out}&location={city}&limit=20", {}, None
+
+    def book():
+        check_in, check_out = stay(365)
+        body = {"room_id": rng.randint(1, rooms), "check_in": str(check_in), "check_out": str(check_out)}
+        return "POST", "/api/public/bookings", guest(), body
+
+    last_month = f"start={date.today() - timedelta(days=30)}&end={date.today()}"
+    return {
+        "GET /public/hotels": lambda: ("GET", "/api/public/hotels?limit=20", {}, None),
+        "GET /public/hotels/{id}": lambda: ("GET", f"/api/public/hotels/{rng.randint(1, hotels)}", {}, None),
+        "GET /public/hotels/{id}/rooms": lambda: ("GET", f"/api/public/hotels/{rng.randint(1, hotels)}/rooms", {}, None),
+        "GET /public/hotels/{id}/available-rooms": available_rooms,
+        "GET /public/hotels/search": lambda: (
+            "GET", f"/api/public/hotels/search?q={rng.choice(generate_data.HOTEL_WORDS)}", {}, None),
+        "GET /public/search": search,
+        "GET /auth/me": lambda: ("GET", "/api/auth/me", guest(), None),
+        "GET /public/bookings": lambda: ("GET", "/api/public/bookings?limit=20", guest(), None),
+        "POST /public/bookings": book,
+        "GET /admin/dashboard": lambda: ("GET", "/api/admin/dashboard", admin(), None),
+        "GET /admin/stats/daily": lambda: ("GET", f"/api/admin/stats/daily?{last_month}", admin(), None),
+        "GET /manager/dashboard": lambda: ("GET", "/api/manager/dashboard", manager(), None),
+        "GET /manager/rooms": lambda: (
+            "GET", f"/api/manager/rooms?hotel_id={rng.choice(manager_hotels)}&limit=20", manager(), None),
+        "GET /manager/stats/daily": lambda: ("GET", f"/api/manager/stats/daily?{last_month}", manager(), None),
+    }
+
+
+def sign_in(SessionLocal, guests, rng):
+    """Tokens for the admin, the first manager and a sample of active guests, plus that manager's hotel ids."""
+    from sqlalchemy import select
+    from app.controllers.auth import principal_claims
+    from app.core.security import create_access_token
+    from app.models.hotel import Hotel
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        admin = db.scalar(select(User).where(User.email == "admin@example.com"))
+        manager = db.scalar(select(User).where(User.email == "manager1@example.com"))
+        sample = db.scalars(select(User).where(User.role == "guest", User.is_active.is_(True)).limit(guests)).all()
+        manager_hotels = list(db.scalars(select(Hotel.id).where(Hotel.manager_id == manager.id)))
+        tokens = {
+            "admin": create_access_token(principal_claims(admin)),
+            "manager": create_access_token(principal_claims(manager)),
+            "guests": [create_access_token(principal_claims(user)) for user in sample],
+        }
+    finally:
+        db.close()
+    rng.shuffle(tokens["guests"])
+    return tokens, manager_hotels
+
+
+def server_timing(response):
+    """{metric: ms} from the Server-Timing header set by the request instrumentation."""
+    timings = {}
+    for part in response.headers.get("server-timing", "").split(","):
+        name, _, rest = part.strip().partition(";")
+        for param in rest.split(";"):
+            if param.startswith("dur="):
+                timings[name] = float(param[4:])
+    return timings
+
+
+def summarize(latencies, queries, statuses, timings):
+    from benchmarks.load_test import percentile
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+        "max_queries": max(queries),
+        "db_ms": round(statistics.fmean(t.get("db", 0.0) for t in timings), 3),
+        "serialize_ms": round(statistics.fmean(t.get("serialize", 0.0) for t in timings), 3),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def run(app, engine, plan, requests, warmup):
+    import httpx
+    from benchmarks.common import QueryCounter
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://suite") as client:
+        for name, make in plan.items():
+            latencies, queries, statuses, timings = [], [], {}, []
+            for i in range(warmup + requests):
+                method, path, headers, body = make()
+                with QueryCounter(engine) as counter:
+                    start = time.perf_counter()
+                    response = await client.request(method, path, headers=headers, json=body)
+                    elapsed = (time.perf_counter() - start) * 1000
+                if i < warmup:
+                    continue
+                latencies.append(elapsed)
+                queries.append(counter.count)
+                timings.append(server_timing(response))
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            results[name] = summarize(latencies, queries, statuses, timings)
+    return results
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return commit.stdout.strip(), bool(dirty.stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def compare(results, params, baseline_path, max_regression):
+    """Print the change against an earlier results file; returns the scenarios over max_regression."""
+    from benchmarks.common import report
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old_results = baseline["results"]
+    rows, regressions = [], []
+
+    def change(old, new):
+        return f"{(new - old) / old * 100:+.0f}%" if old else "-"
+
+    for name, new in results.items():
+        old = old_results.get(name)
+        if old is None:
+            rows.append((name, "-", new["p50_ms"], "-", new["p95_ms"], "-", f"- -> {new['queries_per_request']}"))
+            continue
+        rows.append((
+            name, old["p50_ms"], new["p50_ms"], change(old["p50_ms"], new["p50_ms"]),
+            f"{old['p95_ms']} -> {new['p95_ms']}", change(old["p95_ms"], new["p95_ms"]),
+            f"{old['queries_per_request']} -> {new['queries_per_request']}",
+        ))
+        if max_regression is not None and old["p95_ms"] and \
+                (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 > max_regression:
+            regressions.append(name)
+    meta = baseline["meta"]
+    report(f"Compared with {meta['commit']}{' (dirty)' if meta.get('dirty') else ''} from {meta['timestamp']}", rows,
+           ["scenario", "old p50", "new p50", "p50", "p95 ms", "p95", "queries"])
+    if meta["params"] != params:
+        print("Note: the two runs used different parameters; see meta.params in both files.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=generate_data.PRESETS, default="tiny")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--guests", type=int, default=200, help="Distinct signed-in guests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO", help="Run only scenarios containing these strings")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", metavar="RESULTS", help="Earlier results file to compare with")
+    parser.add_argument("--max-regression", type=float, help="Fail if a p95 grew by more than this percentage")
+    args = parser.parse_args()
+    if args.no_cache:
+        # Settings are already loaded; the cache backend is only built when main is imported below
+        generate_data.settings.RESPONSE_CACHE_BACKEND = "none"
+
+    scale = generate_data.PRESETS[args.preset]
+    started = time.perf_counter()
+    target = generate_data.make_engine(os.environ["DATABASE_URL"])
+    counts = generate_data.generate(target, seed=args.seed, **scale)
+    target.dispose()
+    print(f"Generated {counts['bookings']} bookings over {counts['rooms']} rooms in {time.perf_counter() - started:.1f}s")
+
+    import main as application
+    from app.core.database import SessionLocal, async_engine
+
+    rng = random.Random(args.seed)
+    tokens, manager_hotels = sign_in(SessionLocal, args.guests, rng)
+    plan = scenarios(scale, tokens, manager_hotels, rng)
+    if args.only:
+        plan = {name: make for name, make in plan.items() if any(part in name for part in args.only)}
+
+    async def lifespan_run():
+        await application.app.router.startup()
+        try:
+            return await run(application.app, async_engine.sync_engine, plan, args.requests, args.warmup)
+        finally:
+            await application.app.router.shutdown()
+
+    results = asyncio.run(lifespan_run())
+
+    from benchmarks.common import report
+    report(f"{args.preset} preset, {args.requests} requests per scenario", [
+        (name, r["p50_ms"], r["p95_ms"], r["p99_ms"], r["queries_per_request"], r["db_ms"], r["serialize_ms"],
+         " ".join(f"{code}x{n}" for code, n in r["statuses"].items()))
+        for name, r in results.items()
+    ], ["scenario", "p50 ms", "p95 ms", "p99 ms", "queries", "db ms", "serialize ms", "statuses"])
+
+    import fastapi
+    import sqlalchemy
+    commit, dirty = git_revision()
+    params = {"preset": args.preset, "scale": scale, "requests": args.requests, "warmup": args.warmup,
+              "guests": args.guests, "seed": args.seed, "no_cache": args.no_cache, "only": args.only}
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    document = {
+        "meta": {
+            "commit": commit, "dirty": dirty, "timestamp": timestamp,
+            "python": platform.python_version(), "fastapi": fastapi.__version__, "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "params": params,
+            "data": counts,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{timestamp}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    failures = [f"{name}: server errors {r['statuses']}" for name, r in results.items()
+                if any(code.startswith("5") for code in r["statuses"])]
+    if args.compare:
+        failures += [f"{name}: p95 regressed more than {args.max_regression}%"
+                     for name in compare(results, params, args.compare, args.max_regression)]
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,23 @@
+"""
+Export the reporting snapshot (see app/services/reporting.py).
+
+    python export_reports.py      # write settings.REPORTS_PATH from the live database
+"""
+import sys
+import time
+from app.services import reporting
+
+
+def main():
+    if not reporting.available():
+        print("Reporting requires the duckdb package (pip install duckdb).")
+        return 1
+    started = time.perf_counter()
+    counts = reporting.export()
+    rows = ", ".join(f"{table}: {count}" for table, count in counts.items())
+    print(f"Exported {rows} to {reporting.report_store.path} in {time.perf_counter() - started:.1f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Generate a large synthetic dataset for load and benchmark runs.
+
+    python generate_data.py --hotels 1000 --rooms-per-hotel 40 --users 100000 --years 3
+    python generate_data.py --preset small      # see PRESETS
+
+Writes to DATABASE_URL (or --database-url), which must not contain users
+yet; the schema is migrated first. Everything is inserted with executemany
+batches, and the password is hashed once and shared by every account, so
+the run time is dominated by SQLite itself.
+
+Accounts: admin@example.com, manager{i}@example.com and user{i}@example.com,
+all with --password. Each room gets a non-overlapping history of stays from
+--years back to 180 days ahead, filled to roughly --occupancy. Past stays
+are completed, upcoming ones confirmed, and a share of both is cancelled.
+The same --seed always produces the same data.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.database import configure_sqlite, engine_options, is_sqlite, sqlite_pragmas
+from app.core import migrations
+from app.core.security import get_password_hash
+from app.models.booking import Booking
+from app.models.hotel import Hotel, Room
+from app.models.user import User, UserRole
+from app.services import inventory, stats
+from app.services.search import get_search_backend
+
+PRESETS = {
+    "tiny": {"hotels": 20, "rooms_per_hotel": 10, "users": 500, "years": 1},
+    "small": {"hotels": 200, "rooms_per_hotel": 20, "users": 20000, "years": 2},
+    "medium": {"hotels": 1000, "rooms_per_hotel": 40, "users": 100000, "years": 3},
+    "large": {"hotels": 5000, "rooms_per_hotel": 50, "users": 500000, "years": 5},
+}
+
+CITIES = [
+    "New York, USA", "Los Angeles, USA", "Paris, France", "Nice, France", "London, UK", "Edinburgh, UK",
+    "Tokyo, Japan", "Kyoto, Japan", "Dubai, UAE", "Rome, Italy", "Venice, Italy", "Barcelona, Spain",
+    "Madrid, Spain", "Sydney, Australia", "Bangkok, Thailand", "Berlin, Germany", "Lisbon, Portugal",
+]
+HOTEL_WORDS = ["Grand", "Royal", "Harbour", "Garden", "Palace", "Plaza", "Resort", "Suites", "Inn", "Lodge"]
+# (type, base price, capacity)
+ROOM_TYPES = [("Single", 80.0, 1), ("Double", 120.0, 2), ("Suite", 260.0, 3), ("Family", 180.0, 4)]
+
+BATCH_SIZE = 50000
+FUTURE_DAYS = 180
+CANCEL_RATE = 0.08
+
+
+def _insert(conn, model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(model.__table__.insert(), rows[start:start + BATCH_SIZE])
+
+
+def _stays(rng, first_day, last_day, occupancy):
+    """Non-overlapping (check_in, nights) pairs covering about `occupancy` of the days."""
+    mean_stay = 3.0
+    mean_gap = mean_stay * (1 - occupancy) / occupancy if occupancy > 0 else float("inf")
+    day = first_day + timedelta(days=int(rng.expovariate(1 / mean_gap)) if mean_gap else 0)
+    while day < last_day:
+        nights = min(7, max(1, int(rng.expovariate(1 / mean_stay)) + 1))
+        yield day, nights
+        gap = int(rng.expovariate(1 / mean_gap)) if mean_gap != float("inf") else 10 ** 6
+        day += timedelta(days=nights + gap)
+
+
+def generate(
+    engine,
+    hotels: int,
+    rooms_per_hotel: int,
+    users: int,
+    years: float,
+    occupancy: float = 0.5,
+    password: str = "password123",
+    seed: int = 42,
+) -> dict:
+    """Fill an empty, migrated database; returns row counts and timings."""
+    rng = random.Random(seed)
+    timings = {}
+    started = time.perf_counter()
+    hashed = get_password_hash(password)
+    managers = max(1, hotels // 20)
+    guests = max(1, users - managers - 1)
+
+    with engine.begin() as conn:
+        if conn.scalar(select(func.count()).select_from(User.__table__)):
+            raise SystemExit("The database already has users; generate into an empty database.")
+        user_rows = [{"id": 1, "email": "admin@example.com", "hashed_password": hashed, "full_name": "System Admin",
+                      "role": UserRole.ADMIN.value, "is_active": True}]
+        user_rows += [
+            {"id": 1 + i, "email": f"manager{i}@example.com", "hashed_password": hashed,
+             "full_name": f"Manager {i}", "role": UserRole.MANAGER.value, "is_active": True}
+            for i in range(1, managers + 1)
+        ]
+        first_guest = managers + 2
+        user_rows += [
+            {"id": first_guest + i, "email": f"user{i}@example.com", "hashed_password": hashed,
+             "full_name": f"Guest {i}", "role": UserRole.GUEST.value, "is_active": rng.random() > 0.02}
+            for i in range(guests)
+        ]
+        _insert(conn, User, user_rows)
+        timings["users"] = time.perf_counter() - started
+
+        hotel_rows, room_rows = [], []
+        for h in range(1, hotels + 1):
+            city = CITIES[h % len(CITIES)]
+            name = f"{city.split(',')[0]} {rng.choice(HOTEL_WORDS)} {h}"
+            hotel_rows.append({
+                "id": h, "name": name, "location": city, "manager_id": 2 + (h - 1) % managers,
+                "description": f"{rng.choice(HOTEL_WORDS)} hotel in {city.split(',')[0]} with {rooms_per_hotel} rooms.",
+            })
+            price_factor = rng.uniform(0.7, 1.8)
+            for r in range(rooms_per_hotel):
+                room_type, price, capacity = ROOM_TYPES[r % len(ROOM_TYPES)]
+                room_rows.append({
+                    "id": (h - 1) * rooms_per_hotel + r + 1, "hotel_id": h,
+                    "room_number": f"{100 * (1 + r // 20) + r % 20}", "type": room_type,
+                    "price": round(price * price_factor, 2), "capacity": capacity,
+                    "is_available": rng.random() > 0.03, "max_bookings": 1,
+                })
+        _insert(conn, Hotel, hotel_rows)
+        _insert(conn, Room, room_rows)
+        timings["hotels and rooms"] = time.perf_counter() - started - sum(timings.values())
+
+        today = date.today()
+        first_day = today - timedelta(days=int(365 * years))
+        last_day = today + timedelta(days=FUTURE_DAYS)
+        batch, booking_count = [], 0
+        for room in room_rows:
+            for check_in, nights in _stays(rng, first_day, last_day, occupancy):
+                if rng.random() < CANCEL_RATE:
+                    status = "cancelled"
+                else:
+                    status = "completed" if check_in + timedelta(days=nights) <= today else "confirmed"
+                batch.append({
+                    "user_id": first_guest + rng.randrange(guests), "room_id": room["id"], "hotel_id": room["hotel_id"],
+                    "check_in": check_in, "check_out": check_in + timedelta(days=nights),
+                    "total_price": room["price"] * nights, "status": status,
+                })
+                if len(batch) == BATCH_SIZE:
+                    _insert(conn, Booking, batch)
+                    booking_count += len(batch)
+                    batch = []
+        _insert(conn, Booking, batch)
+        booking_count += len(batch)
+        timings["bookings"] = time.perf_counter() - started - sum(timings.values())
+
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    try:
+        inventory.rebuild(db)
+        stats.rebuild(db)
+        get_search_backend(db).rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    timings["derived tables"] = time.perf_counter() - started - sum(timings.values())
+
+    return {
+        "users": len(user_rows), "hotels": hotels, "rooms": len(room_rows), "bookings": booking_count,
+        "seconds": {k: round(v, 2) for k, v in timings.items()},
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def make_engine(url: str):
+    """Engine for `url`, configured like the application's and migrated to the latest schema."""
+    target = create_engine(url, **engine_options(url))
+    if is_sqlite(url):
+        configure_sqlite(target, sqlite_pragmas())
+    migrations.upgrade(target)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, help="Scale preset; explicit options override it")
+    parser.add_argument("--hotels", type=int)
+    parser.add_argument("--rooms-per-hotel", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--years", type=float, help="Years of booking history")
+    parser.add_argument("--occupancy", type=float, default=0.5)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    scale = dict(PRESETS[args.preset or "small"])
+    for key in scale:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    target = make_engine(args.database_url)
+    summary = generate(target, occupancy=args.occupancy, password=args.password, seed=args.seed, **scale)
+    print(f"Generated {summary['users']} users, {summary['hotels']} hotels, {summary['rooms']} rooms and "
+          f"{summary['bookings']} bookings in {summary['total_seconds']}s")
+    for step, seconds in summary["seconds"].items():
+        print(f"  {step}: {seconds}s")
+
+
+if __name__ == "__main__":
+    main()
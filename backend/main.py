@@ -1,13 +1,22 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import secrets
+import time
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import async_engine, engine, ping_database, replica_engines
+from app.core import instrumentation, metrics, migrations, responses
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.email import email_configured
+from app.services.mailer import mail_dispatcher
+from app.services import reporting
 from app.controllers import auth, public, admin, manager
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title=settings.PROJECT_NAME)
+# orjson for every response body; see app/core/responses.py
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=responses.JSONResponse)
 
 # Set up CORS
 origins = [
@@ -25,17 +34,78 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        NEXT_CURSOR_HEADER, reporting.EXPORTED_AT_HEADER, instrumentation.REQUEST_ID_HEADER, "Server-Timing",
+    ],
 )
 
+# Query counts and timings per request; see app/core/instrumentation.py
+instrumentation.install(app, [engine, async_engine.sync_engine, *(e.sync_engine for e in replica_engines)])
+if settings.METRICS_ENABLED:
+    if not settings.METRICS_TOKEN:
+        logging.getLogger(__name__).warning(
+            "METRICS_ENABLED without METRICS_TOKEN: /metrics is open to anyone who can reach the API"
+        )
+    metrics.register_pool(engine, "sync")
+    metrics.register_pool(async_engine.sync_engine, "primary")
+    for number, replica in enumerate(replica_engines, start=1):
+        metrics.register_pool(replica.sync_engine, f"replica{number}")
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(public.router, prefix="/api/public", tags=["public"])
 app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(manager.router, prefix="/api/manager", tags=["manager"])
 
+@app.on_event("startup")
+def check_schema():
+    # Registered first so nothing else starts against an unmigrated database
+    if settings.SCHEMA_STARTUP_MODE == "upgrade":
+        migrations.upgrade(engine)
+    elif settings.SCHEMA_STARTUP_MODE == "verify":
+        migrations.verify(engine)
+    elif settings.SCHEMA_STARTUP_MODE != "off":
+        raise ValueError(f"Unknown SCHEMA_STARTUP_MODE {settings.SCHEMA_STARTUP_MODE!r}")
+
+@app.on_event("startup")
+def start_mail_dispatcher():
+    if settings.EMAIL_WORKERS > 0 and email_configured():
+        mail_dispatcher.start()
+
+@app.on_event("shutdown")
+def stop_mail_dispatcher():
+    mail_dispatcher.stop()
+
+@app.on_event("startup")
+def start_report_exporter():
+    if settings.REPORTS_EXPORT_INTERVAL_SECONDS > 0 and reporting.available():
+        reporting.report_exporter.start()
+
+@app.on_event("shutdown")
+def stop_report_exporter():
+    reporting.report_exporter.stop()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Hotel Management System API"}
 
 @app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+async def health_check():
+    """Liveness and database readiness: 503 unless SELECT 1 answers within HEALTH_DB_TIMEOUT_SECONDS."""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(ping_database(), settings.HEALTH_DB_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return JSONResponse(status_code=503, content={"status": "unhealthy", "database": "timeout"})
+    except (SQLAlchemyError, OSError) as exc:
+        return JSONResponse(status_code=503, content={"status": "unhealthy", "database": type(exc).__name__})
+    return {"status": "healthy", "database": "ok", "database_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics(request: Request):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
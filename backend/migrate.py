@@ -0,0 +1,35 @@
+"""
+Apply or inspect schema migrations.
+
+    python migrate.py            # upgrade to the latest version
+    python migrate.py --status   # show current and latest version
+"""
+import argparse
+from app.core.database import engine
+from app.core import migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotel Management System schema migrations")
+    parser.add_argument("--status", action="store_true", help="Show the schema version without migrating")
+    parser.add_argument("--target", type=int, default=None, help="Upgrade up to this version")
+    args = parser.parse_args()
+
+    if args.status:
+        with engine.connect() as conn:
+            current = migrations.current_version(conn)
+        print(f"Schema version: {current} (latest: {migrations.head()})")
+        for version, description, _ in migrations.MIGRATIONS:
+            marker = "x" if version <= current else " "
+            print(f"  [{marker}] {version:>3}  {description}")
+        return
+
+    applied = migrations.upgrade(engine, target=args.target)
+    if applied:
+        print(f"Applied migrations: {', '.join(map(str, applied))}")
+    else:
+        print("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
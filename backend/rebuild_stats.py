@@ -0,0 +1,37 @@
+"""
+Recompute or check the per-hotel daily booking stats.
+
+    python rebuild_stats.py            # recompute the table from bookings
+    python rebuild_stats.py --verify   # compare the maintained table with a recomputation
+"""
+import argparse
+import sys
+from app.core.database import SessionLocal
+from app.services import stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotel Management System booking stats")
+    parser.add_argument("--verify", action="store_true", help="Report differences without changing anything")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.verify:
+            problems = stats.verify(db)
+            for problem in problems[:50]:
+                print(problem)
+            if len(problems) > 50:
+                print(f"... and {len(problems) - 50} more")
+            print(f"{len(problems)} difference(s)." if problems else "Stats match the bookings table.")
+            return 1 if problems else 0
+        rows = stats.rebuild(db)
+        db.commit()
+        print(f"Rebuilt {rows} daily stats rows.")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,16 @@
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal, engine
 from app.models.user import User, UserRole
 from app.models.hotel import Hotel, Room
 from app.models.booking import Booking
 from app.core.security import get_password_hash
+from app.core import migrations
+from app.services import inventory, stats
+from app.services.search import get_search_backend
 from datetime import date, timedelta
 import random
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Create or upgrade the schema, as `python migrate.py` does
+migrations.upgrade(engine)
 
 db = SessionLocal()
 
@@ -146,6 +149,8 @@ def seed_data():
             db.commit()
             db.refresh(hotel)
         hotels.append(hotel)
+    get_search_backend(db).rebuild(db)
+    db.commit()
 
     # --- 3. Rooms ---
     print("Creating Rooms...")
@@ -205,6 +210,7 @@ def seed_data():
             booking = Booking(
                 user_id=guest.id,
                 room_id=room.id,
+                hotel_id=room.hotel_id,
                 check_in=start_date,
                 check_out=end_date,
                 total_price=total_price,
@@ -212,6 +218,9 @@ def seed_data():
             )
             db.add(booking)
         
+        db.flush()
+        inventory.rebuild(db)
+        stats.rebuild(db)
         db.commit()
 
     print("✅ Seed data generation complete!")
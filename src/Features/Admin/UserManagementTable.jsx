@@ -3,8 +3,10 @@ import React, { useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { toast } from 'react-toastify';
 import { Plus, Edit, Trash2, User, Mail, Shield, X, Save, Ban, CheckCircle, Loader, ChevronLeft, ChevronRight } from 'lucide-react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { getAllUsers, updateUser, deleteUser } from '../../api/admin';
+import { useMutation, useQueryClient } from '@tanstack/react-query';
+import { getUsersPage, updateUser, deleteUser } from '../../api/admin';
+import { useCursorList } from '../../utils/useCursorList';
+import LoadMoreButton from '../../components/common/LoadMoreButton';
 import { fadeIn, staggerContainer, staggerItem, scaleIn, modalBackdrop } from '../../utils/animations';
 
 const UserManagementTable = () => {
@@ -20,11 +22,8 @@ const UserManagementTable = () => {
     const [currentPage, setCurrentPage] = useState(1);
     const usersPerPage = 8;
 
-    // Fetch Users
-    const { data: users = [], isLoading, error } = useQuery({
-        queryKey: ['adminUsers'],
-        queryFn: getAllUsers,
-    });
+    // Fetch Users, a page at a time
+    const { items: users, isLoading, error, hasMore, loadMore, isLoadingMore } = useCursorList(['adminUsers'], getUsersPage);
 
     // Mutations
     const updateMutation = useMutation({
@@ -155,7 +154,7 @@ const UserManagementTable = () => {
             >
                 <motion.div className="bg-white rounded-lg shadow-sm p-4" variants={staggerItem}>
                     <p className="text-sm text-gray-600">Total Users</p>
-                    <p className="text-2xl font-bold text-gray-800">{users.length}</p>
+                    <p className="text-2xl font-bold text-gray-800">{users.length}{hasMore && '+'}</p>
                 </motion.div>
                 <motion.div className="bg-green-50 rounded-lg shadow-sm p-4" variants={staggerItem}>
                     <p className="text-sm text-green-600">Active</p>
@@ -255,7 +254,7 @@ const UserManagementTable = () => {
                 {totalPages > 1 && (
                     <div className="flex items-center justify-between p-4 border-t border-gray-100">
                         <div className="text-sm text-gray-500">
-                            Showing {startIndex + 1} to {Math.min(endIndex, users.length)} of {users.length} users
+                            Showing {startIndex + 1} to {Math.min(endIndex, users.length)} of {users.length}{hasMore && '+'} users
                         </div>
                         <div className="flex items-center space-x-2">
                             <button
@@ -287,6 +286,7 @@ const UserManagementTable = () => {
                         </div>
                     </div>
                 )}
+                <LoadMoreButton hasMore={hasMore} loadMore={loadMore} isLoadingMore={isLoadingMore} label="Load more users" />
             </div>
 
             {/* Edit User Modal */}
@@ -3,8 +3,10 @@ import React, { useState } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { toast } from 'react-toastify';
 import { Plus, Edit, Trash2, MapPin, Star, X, Save, Hotel, Loader, Image as ImageIcon, ChevronLeft, ChevronRight } from 'lucide-react';
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { getAllHotels, createHotel, updateHotel, deleteHotel } from '../../../api/admin';
+import { useMutation, useQueryClient } from '@tanstack/react-query';
+import { getHotelsPage, createHotel, updateHotel, deleteHotel } from '../../../api/admin';
+import { useCursorList } from '../../../utils/useCursorList';
+import LoadMoreButton from '../../../components/common/LoadMoreButton';
 import { fadeIn, staggerContainer, staggerItem, scaleIn, modalBackdrop } from '../../../utils/animations';
 import { getHotelImage } from '../../../assets/hotelImages';
 
@@ -22,11 +24,8 @@ const AllHotelsPage = () => {
     const [currentPage, setCurrentPage] = useState(1);
     const hotelsPerPage = 6;
 
-    // Fetch Hotels
-    const { data: hotels = [], isLoading, error } = useQuery({
-        queryKey: ['adminHotels'],
-        queryFn: getAllHotels,
-    });
+    // Fetch Hotels, a page at a time
+    const { items: hotels, isLoading, error, hasMore, loadMore, isLoadingMore } = useCursorList(['adminHotels'], getHotelsPage);
 
     // Mutations
     const createMutation = useMutation({
@@ -213,7 +212,7 @@ const AllHotelsPage = () => {
             {totalPages > 1 && (
                 <div className="flex items-center justify-between mt-6">
                     <div className="text-sm text-gray-500">
-                        Showing {startIndex + 1} to {Math.min(endIndex, hotels.length)} of {hotels.length} hotels
+                        Showing {startIndex + 1} to {Math.min(endIndex, hotels.length)} of {hotels.length}{hasMore && '+'} hotels
                     </div>
                     <div className="flex items-center space-x-2">
                         <button
@@ -245,6 +244,7 @@ const AllHotelsPage = () => {
                     </div>
                 </div>
             )}
+            <LoadMoreButton hasMore={hasMore} loadMore={loadMore} isLoadingMore={isLoadingMore} label="Load more hotels" />
 
             {/* Add/Edit Hotel Modal */}
             <AnimatePresence>
@@ -4,7 +4,9 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { toast } from 'react-toastify';
 import { Plus, Edit, Trash2, Bed, Wifi, Tv, Coffee, Wind, Users, DollarSign, Loader, X, Save, ChevronLeft, ChevronRight } from 'lucide-react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { getManagerRooms, createRoom, updateRoom, deleteRoom, getManagerHotels } from '../../../api/manager';
+import { getManagerRoomsPage, createRoom, updateRoom, deleteRoom, getManagerHotels } from '../../../api/manager';
+import { useCursorList } from '../../../utils/useCursorList';
+import LoadMoreButton from '../../../components/common/LoadMoreButton';
 import { fadeIn, staggerContainer, staggerItem, scaleIn, modalBackdrop } from '../../../utils/animations';
 
 const roomTypes = [
@@ -45,11 +47,10 @@ const ManageRoomsPage = () => {
   const [currentPage, setCurrentPage] = useState(1);
   const roomsPerPage = 5;
 
-  // Fetch Rooms
-  const { data: rooms = [], isLoading: isLoadingRooms, error: roomsError } = useQuery({
-    queryKey: ['managerRooms'],
-    queryFn: getManagerRooms,
-  });
+  // Fetch Rooms, a page at a time
+  const {
+    items: rooms, isLoading: isLoadingRooms, error: roomsError, hasMore, loadMore, isLoadingMore,
+  } = useCursorList(['managerRooms'], getManagerRoomsPage);
 
   // Fetch Hotels (for dropdown) - Only fetch hotels managed by this user
   const { data: hotels = [], isLoading: isLoadingHotels } = useQuery({
@@ -362,7 +363,7 @@ const ManageRoomsPage = () => {
         {totalPages > 1 && (
           <div className="flex items-center justify-between mt-6 px-4">
             <div className="text-sm text-gray-500">
-              Showing {startIndex + 1} to {Math.min(endIndex, filteredRooms.length)} of {filteredRooms.length} rooms
+              Showing {startIndex + 1} to {Math.min(endIndex, filteredRooms.length)} of {filteredRooms.length}{hasMore && '+'} rooms
             </div>
             <div className="flex items-center space-x-2">
               <button
@@ -394,6 +395,7 @@ const ManageRoomsPage = () => {
             </div>
           </div>
         )}
+        <LoadMoreButton hasMore={hasMore} loadMore={loadMore} isLoadingMore={isLoadingMore} label="Load more rooms" />
       </div>
 
       {/* Add/Edit Room Modal */}
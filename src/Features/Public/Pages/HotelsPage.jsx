@@ -2,8 +2,9 @@ import React, { useState, useMemo } from 'react';
 import { motion } from 'framer-motion';
 import { Star, MapPin, Search, SlidersHorizontal, Loader, Globe } from 'lucide-react';
 import { Link } from 'react-router-dom';
-import { useQuery } from '@tanstack/react-query';
-import { getHotels } from '../../../api/public';
+import { getHotelsPage } from '../../../api/public';
+import { useCursorList } from '../../../utils/useCursorList';
+import LoadMoreButton from '../../../components/common/LoadMoreButton';
 import { fadeIn, staggerContainer, staggerItem } from '../../../utils/animations';
 
 // Local hotel images for fast loading
@@ -20,10 +21,9 @@ function HotelsPage() {
   // Set minimum date to today
   const today = new Date().toISOString().split('T')[0];
 
-  // Fetch ALL hotels once with caching (5 min stale, 10 min garbage collection)
-  const { data: hotels = [], isLoading, error, isFetching } = useQuery({
-    queryKey: ['hotels'],
-    queryFn: () => getHotels({}),
+  // Fetch hotels a page at a time with caching (5 min stale, 10 min garbage collection);
+  // search and country filter the pages loaded so far
+  const { items: hotels, isLoading, error, hasMore, loadMore, isLoadingMore } = useCursorList(['hotels'], (cursor) => getHotelsPage({}, cursor), {
     staleTime: 5 * 60 * 1000, // Data fresh for 5 minutes
     gcTime: 10 * 60 * 1000,   // Keep in cache for 10 minutes
     refetchOnWindowFocus: false, // Don't refetch when window regains focus
@@ -181,7 +181,7 @@ function HotelsPage() {
           <div className="flex flex-wrap justify-between items-center mb-8 gap-4">
             <div>
               <h2 className="text-3xl font-bold text-gray-900 dark:text-white">Available Hotels</h2>
-              <p className="text-gray-600 mt-1 dark:text-gray-400">{filteredHotels.length} properties found</p>
+              <p className="text-gray-600 mt-1 dark:text-gray-400">{filteredHotels.length}{hasMore && '+'} properties found</p>
             </div>
             <div className="flex items-center gap-4">
               {/* Country Filter Dropdown */}
@@ -255,7 +255,7 @@ function HotelsPage() {
                   <div className="flex items-center justify-between pt-4 border-t border-gray-100 dark:border-gray-700">
                     <div>
                       <span className="text-3xl font-bold bg-linear-to-r from-blue-600 to-purple-600 bg-clip-text text-transparent dark:from-blue-400 dark:to-purple-400">
-                        ${hotel.rooms && hotel.rooms.length > 0 ? Math.min(...hotel.rooms.map(r => r.price)) : 'N/A'}
+                        ${hotel.min_price != null ? hotel.min_price : 'N/A'}
                       </span>
                       <span className="text-gray-500 text-sm ml-1 dark:text-gray-400">/night</span>
                     </div>
@@ -270,6 +270,7 @@ function HotelsPage() {
               </motion.div>
             ))}
           </motion.div>
+          <LoadMoreButton hasMore={hasMore} loadMore={loadMore} isLoadingMore={isLoadingMore} label="Load more hotels" />
         </div>
       </section>
     </motion.div>
@@ -1,15 +1,13 @@
 import React from 'react';
-import { useQuery } from '@tanstack/react-query';
-import { getBookings } from '../../../api/public';
+import { getBookingsPage } from '../../../api/public';
+import { useCursorList } from '../../../utils/useCursorList';
+import LoadMoreButton from '../../../components/common/LoadMoreButton';
 import { Calendar, CreditCard, Clock, Loader } from 'lucide-react';
 import { fadeIn } from '../../../utils/animations';
 import { motion } from 'framer-motion';
 
 function MyBookingsPage() {
-    const { data: bookings = [], isLoading, error } = useQuery({
-        queryKey: ['myBookings'],
-        queryFn: getBookings,
-    });
+    const { items: bookings, isLoading, error, hasMore, loadMore, isLoadingMore } = useCursorList(['myBookings'], getBookingsPage);
 
     if (isLoading) {
         return (
@@ -60,6 +58,7 @@ function MyBookingsPage() {
                             </div>
                         </div>
                     ))}
+                    <LoadMoreButton hasMore={hasMore} loadMore={loadMore} isLoadingMore={isLoadingMore} label="Load more bookings" />
                 </div>
             )}
         </motion.div>
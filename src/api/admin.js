@@ -1,4 +1,5 @@
 import axiosClient from './axiosClient';
+import { getPage } from './pagination';
 
 // Get admin dashboard data
 export const getAdminDashboard = async () => {
@@ -6,16 +7,14 @@ export const getAdminDashboard = async () => {
   return response.data;
 };
 
-// Get all hotels (admin)
-export const getAllHotels = async () => {
-  const response = await axiosClient.get('/admin/hotels');
-  return response.data;
+// Get a page of hotels (admin)
+export const getHotelsPage = async (cursor) => {
+  return getPage('/admin/hotels', {}, cursor);
 };
 
-// Get all users (admin)
-export const getAllUsers = async () => {
-  const response = await axiosClient.get('/admin/users');
-  return response.data;
+// Get a page of users (admin)
+export const getUsersPage = async (cursor) => {
+  return getPage('/admin/users', {}, cursor);
 };
 
 // Create hotel (admin)
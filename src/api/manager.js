@@ -1,4 +1,5 @@
 import axiosClient from './axiosClient';
+import { getAllPages, getPage } from './pagination';
 
 // Get manager dashboard data
 export const getManagerDashboard = async () => {
@@ -6,10 +7,9 @@ export const getManagerDashboard = async () => {
   return response.data;
 };
 
-// Get manager rooms
-export const getManagerRooms = async () => {
-  const response = await axiosClient.get('/manager/rooms');
-  return response.data;
+// Get a page of manager rooms
+export const getManagerRoomsPage = async (cursor) => {
+  return getPage('/manager/rooms', {}, cursor);
 };
 
 // Create room
@@ -29,8 +29,7 @@ export const deleteRoom = async (roomId) => {
   const response = await axiosClient.delete(`/manager/rooms/${roomId}`);
   return response.data;
 };
-// Get manager hotels
+// Get all manager hotels (for the hotel select of the room form)
 export const getManagerHotels = async () => {
-  const response = await axiosClient.get('/manager/hotels');
-  return response.data;
+  return getAllPages('/manager/hotels');
 };
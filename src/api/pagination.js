@@ -0,0 +1,29 @@
+import axiosClient from './axiosClient';
+
+// Largest page the API serves (MAX_PAGE_SIZE); larger limits are capped
+const PAGE_LIMIT = 500;
+
+// Get one page of a paginated list (the API's default page size) and the cursor of the next page,
+// undefined on the last page. Pass that cursor back to get the page after it.
+export const getPage = async (url, params = {}, cursor) => {
+  const response = await axiosClient.get(url, {
+    params: { ...params, ...(cursor ? { cursor } : {}) },
+  });
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || undefined };
+};
+
+// Get every item of a paginated list, following the X-Next-Cursor header page by page.
+// Only for screens that need the whole list at once (e.g. a select of the manager's hotels);
+// list screens page with getPage and load more on demand.
+export const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await axiosClient.get(url, {
+      params: { limit: PAGE_LIMIT, ...params, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+};
@@ -1,9 +1,9 @@
 import axiosClient from './axiosClient';
+import { getPage } from './pagination';
 
-// Get all hotels
-export const getHotels = async (params) => {
-  const response = await axiosClient.get('/public/hotels', { params });
-  return response.data;
+// Get a page of hotels
+export const getHotelsPage = async (params, cursor) => {
+  return getPage('/public/hotels', params, cursor);
 };
 
 // Get hotel by ID
@@ -24,8 +24,13 @@ export const createBooking = async (bookingData) => {
   return response.data;
 };
 
-// Get user bookings
-export const getBookings = async () => {
-  const response = await axiosClient.get('/public/bookings');
+// Get a page of user bookings
+export const getBookingsPage = async (cursor) => {
+  return getPage('/public/bookings', {}, cursor);
+};
+
+// Cancel booking
+export const cancelBooking = async (bookingId) => {
+  const response = await axiosClient.post(`/public/bookings/${bookingId}/cancel`);
   return response.data;
 };
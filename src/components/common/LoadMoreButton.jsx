@@ -0,0 +1,22 @@
+import React from 'react';
+import { Loader } from 'lucide-react';
+
+// "Load more" for lists paged with useCursorList; renders nothing once the last page is loaded
+const LoadMoreButton = ({ hasMore, loadMore, isLoadingMore, label = 'Load more' }) => {
+  if (!hasMore) return null;
+
+  return (
+    <div className="flex justify-center py-6">
+      <button
+        onClick={() => loadMore()}
+        disabled={isLoadingMore}
+        className="flex items-center gap-2 px-6 py-2 rounded-lg border border-gray-300 bg-white text-gray-700 font-medium hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed transition-colors dark:bg-gray-800 dark:border-gray-600 dark:text-gray-200 dark:hover:bg-gray-700"
+      >
+        {isLoadingMore && <Loader className="w-4 h-4 animate-spin" />}
+        {isLoadingMore ? 'Loading...' : label}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
@@ -0,0 +1,28 @@
+import { useMemo } from 'react';
+import { useInfiniteQuery } from '@tanstack/react-query';
+
+// A cursor-paginated list (see api/pagination.js getPage): fetchPage(cursor) returns { items, nextCursor }.
+// Starts with the first page; loadMore fetches the next one. items holds every page loaded so far.
+export const useCursorList = (queryKey, fetchPage, options = {}) => {
+  const query = useInfiniteQuery({
+    queryKey,
+    queryFn: ({ pageParam }) => fetchPage(pageParam),
+    initialPageParam: undefined,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    ...options,
+  });
+
+  const items = useMemo(
+    () => query.data?.pages.flatMap((page) => page.items) ?? [],
+    [query.data]
+  );
+
+  return {
+    items,
+    isLoading: query.isLoading,
+    error: query.error,
+    hasMore: query.hasNextPage,
+    loadMore: query.fetchNextPage,
+    isLoadingMore: query.isFetchingNextPage,
+  };
+};